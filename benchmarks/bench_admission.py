@@ -0,0 +1,102 @@
+"""
+Benchmark: RuntimeGateway admission control under overload.
+
+A backend that serves requests one at a time (FIFO lock, fixed service time)
+is hit by more concurrent clients than it can handle. Compares paid /
+latency-priority tail latency with a wide-open gateway (no effective cap or
+priority) against the default priority-aware admission controller.
+
+Usage
+    python benchmarks/bench_admission.py
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import threading
+import time
+from typing import Dict, List
+
+from latch.types import RequestContext
+from runtime.admission import AdmissionController
+from runtime.gateway import RuntimeGateway
+
+SERVICE_S = 0.004
+
+
+class SerialBackend:
+    """One request at a time; waiting for the lock is the backend's queue."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def execute(self, request: Dict[str, str]) -> Dict[str, str]:
+        with self._lock:
+            time.sleep(SERVICE_S)
+        return {"status": "ok", "latency_ms": f"{SERVICE_S * 1000:.1f}", "queue_depth": "0", "cost": "0.0"}
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def _run(gateway: RuntimeGateway, clients: int = 24, per_client: int = 20) -> Dict[str, List[float]]:
+    results: Dict[str, List[float]] = {"paid": [], "background": [], "rejected": []}
+    lock = threading.Lock()
+
+    def client(idx: int) -> None:
+        background = idx % 3 != 0
+        request = {
+            "action": "allow" if background else "route_fast",
+            "priority": "1" if background else "8",
+            "max_queue_depth": "16" if background else "256",
+        }
+        ctx = RequestContext(
+            user_id=f"u{idx}",
+            trace_id=str(idx),
+            prompt_tokens=256,
+            tier="free" if background else "pro",
+            is_background=background,
+        )
+        for _ in range(per_client):
+            start = time.perf_counter()
+            response = gateway.dispatch(request, ctx)
+            elapsed = (time.perf_counter() - start) * 1000.0
+            with lock:
+                if response.get("status") == "rejected":
+                    results["rejected"].append(elapsed)
+                else:
+                    results["background" if background else "paid"].append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def run() -> None:
+    configs = {
+        "open": AdmissionController(concurrency_cap=10_000, max_queue_depth=10_000),
+        "admission": AdmissionController(concurrency_cap=1, max_queue_depth=32),
+    }
+    for name, admission in configs.items():
+        gateway = RuntimeGateway(admission=admission, backend=SerialBackend())
+        res = _run(gateway)
+        print(
+            f"{name:>9}: paid p50 {_pct(res['paid'], 0.5):7.1f} ms  p95 {_pct(res['paid'], 0.95):7.1f} ms | "
+            f"background p95 {_pct(res['background'], 0.95):7.1f} ms | rejected {len(res['rejected'])}"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,62 @@
+"""
+Benchmark: AsyncLatchClient with many in-flight requests against a fake async model.
+
+Runs N concurrent requests (default 10k) through `acall_model` and through the
+bare model coroutine, and reports wall time and per-request SDK overhead.
+
+Usage
+    python benchmarks/bench_async_sdk.py [n_requests]
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncio
+import sys
+import time
+
+from latch import AsyncLatchClient, Intent
+
+MODEL_DELAY_S = 0.05
+
+
+async def fake_model(prompt: str, *, model: str, max_tokens: int) -> dict:
+    await asyncio.sleep(MODEL_DELAY_S)
+    return {"text": "ok", "tokens_out": min(max_tokens, 32)}
+
+
+async def _direct(n: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(fake_model("hello " * 40, model="small", max_tokens=256) for _ in range(n)))
+    return time.perf_counter() - start
+
+
+async def _through_sdk(client: AsyncLatchClient, n: int) -> float:
+    async def one(i: int) -> None:
+        async with client.request(tier="pro", metadata={"user_id": f"u{i % 97}"}) as r:
+            await r.call_model("hello " * 40, model_fn=fake_model, model_id="small")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    return time.perf_counter() - start
+
+
+def run(n: int = 10_000) -> None:
+    client = AsyncLatchClient(intent=Intent(name="chat", max_latency_ms=2000))
+    direct = asyncio.run(_direct(n))
+    sdk = asyncio.run(_through_sdk(client, n))
+    overhead_us = max(0.0, sdk - direct) / n * 1e6
+    print(f"in-flight requests:       {n}")
+    print(f"direct gather:            {direct:7.3f} s")
+    print(f"through AsyncLatchClient: {sdk:7.3f} s  (~{overhead_us:.1f} us/request SDK overhead)")
+    print(f"recorded events:          {client.metrics.store.total_appended}")
+    print(f"p95 (sdk-observed):       {client.metrics.snapshot()['p95_latency_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,229 @@
+"""
+Benchmark: deadline propagation and early shedding.
+
+Scenarios (simulated models, real sleeps)
+- shed: a model that takes 40 ms serving an intent with a 25 ms budget.
+  Without deadlines every call runs and misses; with them, calls are shed
+  once signals show the miss (probes excepted).
+- healthy: a 5 ms model under the same budget; nothing may be shed.
+- downgrade: latency grows with max_tokens (0.25 ms/token); calls
+  predicted to miss get a smaller max_tokens instead of being shed.
+- propagation: model_fns with `deadline` / `timeout` parameters get them;
+  a second call in the same session sees the smaller remaining budget.
+- async: a call that would take 200 ms is cancelled at the 25 ms deadline.
+- gateway: with one slot busy, a queued request is rejected at its
+  deadline instead of waiting for the slot.
+
+Exit 1 on failure.
+
+Usage
+    python benchmarks/bench_deadlines.py
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from latch import Intent, LatchClient
+from runtime.admission import AdmissionController
+from runtime.deadline import DOWNGRADE, Deadline, DeadlineConfig, DeadlineExceeded
+from runtime.gateway import RuntimeGateway
+from runtime.request_context import build_request_context
+
+BUDGET_MS = 25
+N = 200
+
+
+def _client(config: Optional[DeadlineConfig]) -> LatchClient:
+    return LatchClient(
+        intent=Intent(name="chat", max_latency_ms=BUDGET_MS),
+        deadlines=config,
+        signals_refresh_every=4,
+    )
+
+
+def run_fixed(latency_s: float, config: Optional[DeadlineConfig]) -> Dict[str, Any]:
+    calls = {"n": 0}
+
+    def model(prompt: str, *, model: str, max_tokens: int) -> dict:
+        calls["n"] += 1
+        time.sleep(latency_s)
+        return {"tokens_out": 8}
+
+    client = _client(config)
+    shed = met = 0
+    start = time.perf_counter()
+    for i in range(N):
+        session = client.request(tier="pro")
+        try:
+            result = session.call_model(f"q{i}", model_fn=model, model_id="m")
+        except DeadlineExceeded:
+            shed += 1
+            continue
+        met += result.latency_ms <= BUDGET_MS
+    return {
+        "model_calls": calls["n"],
+        "shed": shed,
+        "met": met,
+        "wall_s": time.perf_counter() - start,
+        "counters": dict(client.metrics.counters),
+    }
+
+
+def run_downgrade(config: Optional[DeadlineConfig]) -> Dict[str, Any]:
+    tokens: List[int] = []
+
+    def model(prompt: str, *, model: str, max_tokens: int) -> dict:
+        tokens.append(max_tokens)
+        time.sleep(0.00025 * max_tokens)
+        return {"tokens_out": max_tokens}
+
+    client = _client(config)
+    met = 0
+    for i in range(N):
+        result = client.request(tier="pro").call_model(f"q{i}", model_fn=model, model_id="m", max_tokens=160)
+        met += result.latency_ms <= BUDGET_MS
+    return {"met": met, "avg_tokens": sum(tokens) / len(tokens), "counters": dict(client.metrics.counters)}
+
+
+def check_propagation(failures: List[str]) -> None:
+    seen: List[Any] = []
+
+    def model(prompt: str, *, model: str, max_tokens: int, deadline: Deadline, timeout: float) -> dict:
+        seen.append((deadline, timeout))
+        time.sleep(0.010)
+        return {}
+
+    def wrapper(prompt: str, **kwargs: Any) -> dict:
+        seen.append(sorted(kwargs))
+        return {}
+
+    client = _client(DeadlineConfig())
+    session = client.request(tier="pro")
+    session.call_model("a", model_fn=model, model_id="m")
+    session.call_model("b", model_fn=model, model_id="m")
+    session.call_model("c", model_fn=wrapper, model_id="m")
+    (d1, t1), (d2, t2), wrapped = seen
+    print(f"propagation: timeout {t1 * 1000:.1f} ms then {t2 * 1000:.1f} ms; **kwargs wrapper got {wrapped}")
+    if d1 is not session.deadline or not (0 < t2 < t1 <= BUDGET_MS / 1000.0):
+        failures.append("deadline/timeout not propagated to model_fn")
+    if "deadline" in wrapped or "timeout" in wrapped:
+        failures.append("deadline leaked into a **kwargs model_fn")
+
+    upstream = Deadline.after_ms(5)
+    time.sleep(0.010)
+    try:
+        client.request(tier="pro", deadline=upstream).call_model("late", model_fn=model, model_id="m")
+        failures.append("expired upstream deadline was dispatched")
+    except DeadlineExceeded as exc:
+        if exc.reason != "expired":
+            failures.append(f"expired deadline shed with reason {exc.reason}")
+
+
+def check_async(failures: List[str]) -> None:
+    async def slow(prompt: str, *, model: str, max_tokens: int) -> dict:
+        await asyncio.sleep(0.200)
+        return {}
+
+    async def run() -> Dict[str, Any]:
+        client = _client(DeadlineConfig())
+        start = time.perf_counter()
+        try:
+            await client.request(tier="pro").acall_model("q", model_fn=slow, model_id="m")
+            reason = "completed"
+        except DeadlineExceeded as exc:
+            reason = exc.reason
+        return {
+            "reason": reason,
+            "elapsed_ms": (time.perf_counter() - start) * 1000.0,
+            "event": client.metrics.last_event(),
+        }
+
+    out = asyncio.run(run())
+    print(f"async: {out['reason']} after {out['elapsed_ms']:.1f} ms, recorded {out['event'].error_type}")
+    if out["reason"] != "timeout" or out["elapsed_ms"] > BUDGET_MS * 3:
+        failures.append("async call was not cancelled at its deadline")
+    if out["event"].error_type != "DeadlineExceeded":
+        failures.append("async timeout was not recorded as DeadlineExceeded")
+
+
+class _Backend:
+    def __init__(self) -> None:
+        self.requests: List[Dict[str, str]] = []
+
+    def execute(self, request: Dict[str, str]) -> Dict[str, str]:
+        self.requests.append(request)
+        time.sleep(0.100)
+        return {"status": "ok"}
+
+
+def check_gateway(failures: List[str]) -> None:
+    backend = _Backend()
+    gateway = RuntimeGateway(
+        admission=AdmissionController(concurrency_cap=1), backend=backend, deadlines=True
+    )
+    context = build_request_context("user", "pro", "q")
+    request = {"intent": "chat", "action": "allow", "max_latency_ms": str(BUDGET_MS), "prompt": "q"}
+    busy = threading.Thread(target=gateway.dispatch, args=(dict(request, max_latency_ms="1000"), context))
+    busy.start()
+    time.sleep(0.010)
+    start = time.perf_counter()
+    response = gateway.dispatch(request, context)
+    waited_ms = (time.perf_counter() - start) * 1000.0
+    busy.join()
+    print(f"gateway: queued request {response['status']}/{response['reason']} after {waited_ms:.1f} ms; "
+          f"admitted one got deadline_ms={backend.requests[0].get('deadline_ms')}")
+    if response["status"] != "rejected" or waited_ms > BUDGET_MS * 3:
+        failures.append("gateway let a request wait past its deadline")
+    if "deadline_ms" not in backend.requests[0]:
+        failures.append("gateway did not pass deadline_ms to the backend")
+
+
+def main() -> int:
+    failures: List[str] = []
+
+    base = run_fixed(0.040, None)
+    shed = run_fixed(0.040, DeadlineConfig())
+    print(f"slow model, no deadlines: {base['model_calls']} model calls, {base['met']} on time, {base['wall_s']:.2f} s")
+    print(f"slow model, deadlines:    {shed['model_calls']} model calls, {shed['shed']} shed, {shed['wall_s']:.2f} s "
+          f"{shed['counters']}")
+    if shed["model_calls"] > base["model_calls"] * 0.2:
+        failures.append("deadlines did not stop calls that were sure to miss")
+
+    healthy = run_fixed(0.005, DeadlineConfig())
+    print(f"healthy model, deadlines: {healthy['shed']} shed, {healthy['met']}/{N} on time")
+    if healthy["shed"]:
+        failures.append("a healthy model had calls shed")
+
+    plain = run_downgrade(None)
+    down = run_downgrade(DeadlineConfig(on_predicted_miss=DOWNGRADE))
+    print(f"downgrade: on time {plain['met']}/{N} -> {down['met']}/{N}, "
+          f"avg max_tokens {plain['avg_tokens']:.0f} -> {down['avg_tokens']:.0f} {down['counters']}")
+    # The p50 predictor is token-blind (it sees downgraded calls and scales the
+    # full request by them), so how many calls end up inside the deadline swings
+    # from run to run; only the downgrade itself is checked.
+    if not down["counters"].get("deadline_downgraded") or down["avg_tokens"] >= plain["avg_tokens"]:
+        failures.append("calls predicted to miss were not downgraded")
+
+    check_propagation(failures)
+    check_async(failures)
+    check_gateway(failures)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: deadlines propagate, shed sure misses early and cancel late async calls")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+"""
+Benchmark: ColumnarEventStore vs the previous deque of frozen MetricEvent objects.
+
+Reports append throughput, retained memory (tracemalloc) and the cost of a
+per-model rollup and a p95-over-time-range query.
+
+Usage
+    python benchmarks/bench_event_store.py [capacity]
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sys
+import time
+import tracemalloc
+from collections import deque
+from typing import Deque, Dict, List
+
+from metrics.collector import MetricEvent
+from metrics.event_store import ColumnarEventStore
+
+MODELS = ("small", "medium", "large")
+ERRORS = ("", "", "", "", "", "", "", "", "", "Timeout")
+
+
+def _event_args(i: int) -> tuple:
+    return (
+        1_700_000_000.0 + i * 0.001,
+        50.0 + (i * 37 % 400),
+        128 + i % 512,
+        64 + i % 128,
+        ERRORS[i % len(ERRORS)],
+        "background" if i % 4 == 0 else "user",
+        MODELS[i % len(MODELS)],
+        float(i % 9),
+        0.0004 * (1 + i % 5),
+    )
+
+
+def _fill_deque(n: int, capacity: int) -> Deque[MetricEvent]:
+    events: Deque[MetricEvent] = deque(maxlen=capacity)
+    for i in range(n):
+        events.append(MetricEvent(*_event_args(i)))
+    return events
+
+
+def _fill_store(n: int, capacity: int) -> ColumnarEventStore:
+    store = ColumnarEventStore(capacity=capacity)
+    for i in range(n):
+        store.append(*_event_args(i))
+    return store
+
+
+def _deque_group_by_model(events: Deque[MetricEvent]) -> Dict[str, List[float]]:
+    out: Dict[str, List[float]] = {}
+    for e in list(events):
+        row = out.setdefault(e.model_id, [0, 0, 0.0, 0, 0, 0.0])
+        row[0] += 1
+        row[1] += 1 if e.error_type else 0
+        row[2] += e.latency_ms
+        row[3] += e.tokens_in
+        row[4] += e.tokens_out
+        row[5] += e.cost_estimate
+    return out
+
+
+def _deque_p95(events: Deque[MetricEvent], t0: float) -> float:
+    values = sorted(e.latency_ms for e in list(events) if e.ts >= t0)
+    return values[int(0.95 * (len(values) - 1))] if values else 0.0
+
+
+def _measure(label: str, fill, n: int, capacity: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = fill(n, capacity)
+    elapsed = time.perf_counter() - start
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>8}: append {n / elapsed:>12,.0f} ev/s   retained {retained / 1024:>9,.0f} KiB")
+    return obj
+
+
+def _time(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def run(capacity: int = 100_000) -> None:
+    n = capacity * 2
+    events = _measure("deque", _fill_deque, n, capacity)
+    store = _measure("columnar", _fill_store, n, capacity)
+    t0 = store.row(len(store) // 2)[0]
+
+    print(f"{'deque':>8}: group_by_model {_time(lambda: _deque_group_by_model(events)):8.2f} ms"
+          f"   p95(range) {_time(lambda: _deque_p95(events, t0)):8.2f} ms")
+    print(f"{'columnar':>8}: group_by_model {_time(lambda: store.group_by_model()):8.2f} ms"
+          f"   p95(range) {_time(lambda: store.percentiles((0.95,), t0=t0)):8.2f} ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
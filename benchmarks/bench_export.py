@@ -0,0 +1,124 @@
+"""
+Benchmark: request-path cost of metrics export with a slow sink.
+
+A `SlowSink` sleeps on every batch (a stand-in for a congested disk or
+collector). The benchmark records events with and without an exporter and
+checks that:
+- record_event latency with export stays close to the no-export baseline,
+  i.e. sink I/O never lands on the request path;
+- under overload every event is accounted for: exported + dropped +
+  sampled_out == recorded (drop_oldest and sample policies);
+- the JSONL and Prometheus text sinks write what was recorded.
+
+Exits 1 if a check fails.
+
+Usage
+    python benchmarks/bench_export.py
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from metrics.collector import MetricEvent, MetricsCollector
+from metrics.export import DROP_OLDEST, SAMPLE, ExportSink, JsonlSink, MetricsExporter, PrometheusTextSink
+
+EVENTS = 50_000
+# Request-path overhead allowed on top of a collector without export.
+MAX_OVERHEAD_US = 5.0
+
+
+class SlowSink(ExportSink):
+    def __init__(self, delay_s: float) -> None:
+        self.delay_s = delay_s
+        self.events = 0
+
+    def write_batch(self, events: List[MetricEvent]) -> None:
+        time.sleep(self.delay_s)
+        self.events += len(events)
+
+
+def _record(metrics: MetricsCollector, n: int) -> float:
+    now = time.time()
+    record = metrics.record_event
+    start = time.perf_counter()
+    for i in range(n):
+        record(
+            100.0 + (i % 50),
+            tokens_in=128,
+            tokens_out=32,
+            error_type="timeout" if i % 10 == 0 else None,
+            request_type="user",
+            model_id="m" if i % 2 else "n",
+            ts=now,
+        )
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def _bench(policy: Optional[str]) -> bool:
+    exporter = None
+    if policy is not None:
+        exporter = MetricsExporter(
+            SlowSink(0.02), max_queue=2_000, batch_size=256, flush_interval_s=0.05, policy=policy
+        )
+    base = _record(MetricsCollector(), EVENTS)
+    us = _record(MetricsCollector(exporter=exporter), EVENTS)
+    if exporter is None:
+        print(f"{'no export':>12}: {us:6.2f} us/event")
+        return True
+    exporter.close()
+    s = exporter.stats()
+    total = s["export_exported"] + s["export_dropped"] + s["export_sampled_out"]
+    print(
+        f"{policy:>12}: {us:6.2f} us/event (baseline {base:5.2f})  exported={s['export_exported']} "
+        f"dropped={s['export_dropped']} sampled_out={s['export_sampled_out']} batches={s['export_batches']}"
+    )
+    ok = True
+    if total != EVENTS:
+        print(f"FAIL: {policy}: {total} events accounted for, expected {EVENTS}")
+        ok = False
+    if us - base > MAX_OVERHEAD_US:
+        print(f"FAIL: {policy}: request-path overhead {us - base:.2f} us > {MAX_OVERHEAD_US} us")
+        ok = False
+    return ok
+
+
+def _check_sinks() -> bool:
+    n = 1_000
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl = Path(tmp) / "events.jsonl"
+        prom = Path(tmp) / "latch.prom"
+        exporters = [MetricsExporter(JsonlSink(jsonl)), MetricsExporter(PrometheusTextSink(prom))]
+        for exporter in exporters:
+            _record(MetricsCollector(exporter=exporter), n)
+            exporter.close()
+        lines = jsonl.read_text(encoding="utf-8").splitlines()
+        text = prom.read_text(encoding="utf-8")
+    ok = len(lines) == n and json.loads(lines[0])["model_id"] == "n"
+    ok = ok and 'latch_requests_total{model_id="m",request_type="user"} 500' in text
+    ok = ok and 'latch_errors_total{model_id="n",request_type="user"} 100' in text
+    print(f"{'sinks':>12}: jsonl={len(lines)} lines, prometheus={len(text.splitlines())} lines  {'ok' if ok else 'FAIL'}")
+    return ok
+
+
+def main() -> int:
+    ok = _bench(None)
+    for policy in (DROP_OLDEST, SAMPLE):
+        ok = _bench(policy) and ok
+    ok = _check_sinks() and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+"""
+Benchmark: closed-loop FeedbackController on the queueing simulator.
+
+Drives QueueSimulator in virtual time through steady load, a traffic spike
+and back, once with static caps (the fixed policy token cap, no concurrency
+limit) and once under FeedbackController (token cap + admission cap from
+windowed p95). Every `TICK_MS` the p95 of requests that completed during the
+tick is fed to the controller.
+
+Checks (exit 1 on failure)
+- converges: after `SETTLE_S` in each phase, at least 90% of windows have
+  p95 within 1.25x the target;
+- stable: few mode transitions and no sustained cap oscillation;
+- the spike is reported: "degraded" is recommended during it and "normal"
+  once it has passed;
+- the static run misses the target during the spike (the test means something).
+
+Usage
+    python benchmarks/bench_feedback_controller.py [--verbose]
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sys
+from typing import List, Optional
+
+from control_plane.feedback_loop import ControllerConfig, FeedbackController
+from runtime.simulator import ClosedLoopRun, ControlWindow, SimConfig, direction_changes, run_closed_loop
+
+TARGET_MS = 2000.0
+STATIC_MAX_TOKENS = 512
+TICK_MS = 1000.0
+SETTLE_S = 20.0
+# (duration_s, arrivals/s)
+PHASES = ((60.0, 20.0), (60.0, 90.0), (60.0, 20.0))
+SIM = SimConfig(replicas=4, max_batch_size=16, default_tokens_out=192)
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def simulate(controller: Optional[FeedbackController], seed: int = 11) -> ClosedLoopRun:
+    return run_closed_loop(
+        controller, PHASES, config=SIM, seed=seed, tick_ms=TICK_MS, static_max_tokens=STATIC_MAX_TOKENS
+    )
+
+
+def _mode_at(windows: List[ControlWindow], phase: int) -> List[str]:
+    return [w.mode for w in windows if w.phase == phase]
+
+
+def _report(name: str, run: ClosedLoopRun, verbose: bool) -> List[float]:
+    windows = run.windows
+    within: List[float] = []
+    for phase, (_duration_s, rate) in enumerate(PHASES):
+        settled = [w for w in windows if w.phase == phase and w.t_s - sum(d for d, _ in PHASES[:phase]) > SETTLE_S]
+        ok = sum(1 for w in settled if w.p95_ms <= TARGET_MS * 1.25) / max(1, len(settled))
+        within.append(ok)
+        p95s = [w.p95_ms for w in settled]
+        print(
+            f"{name:>10} phase {phase} ({rate:3.0f}/s): settled p95 median {_pct(p95s, 0.5):7.0f} ms, "
+            f"max {max(p95s or [0.0]):7.0f} ms, within target {ok * 100:5.1f}%"
+        )
+    if verbose:
+        for w in windows[::5]:
+            print(f"    t={w.t_s:5.0f}s p95={w.p95_ms:7.0f} tokens={w.max_tokens:4d} cap={w.concurrency_cap:3d} {w.mode}")
+    return within
+
+
+def main(argv: list) -> int:
+    verbose = "--verbose" in argv
+    static = simulate(None)
+    controlled = simulate(FeedbackController(TARGET_MS, ControllerConfig()))
+
+    static_within = _report("static", static, verbose)
+    within = _report("controlled", controlled, verbose)
+    windows = controlled.windows
+    spike = [w.max_tokens for w in windows if w.phase == 1 and w.t_s - PHASES[0][0] > SETTLE_S]
+    flips = direction_changes(spike)
+    print(
+        f"controlled: {controlled.transitions} mode transitions, {controlled.shed} shed, "
+        f"{flips} token-cap direction changes in the settled spike"
+    )
+
+    failures = []
+    if min(within) < 0.9:
+        failures.append("controlled p95 did not converge within target")
+    if controlled.transitions > 4:
+        failures.append("mode flapping")
+    if flips > len(spike) // 4:
+        failures.append("token cap oscillates")
+    if "degraded" not in _mode_at(windows, 1) or _mode_at(windows, 2)[-1] != "normal":
+        failures.append("spike not reported as degraded -> normal")
+    if static_within[1] >= 0.9:
+        failures.append("static run met the target during the spike (scenario too easy)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: p95 converges and stays stable through the spike")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
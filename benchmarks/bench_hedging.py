@@ -0,0 +1,186 @@
+"""
+Benchmark: hedged requests.
+
+A simulated model answers in ~2 ms, but each attempt has a 4% chance of a
+60 ms stall (independent per attempt, like a slow replica or GC pause). The
+same call sequence runs through RequestSession.call_model with and without
+a Hedger, sync and async, and through the gateway.
+
+Checks (exit 1 on failure)
+- hedging cuts p99 by at least 3x (sync and async);
+- hedges issued stay within budget * eligible calls + burst;
+- intents without the "hedge" constraint are never hedged;
+- the gateway hedges hedge="true" requests (delay: p95 from its collector)
+  and reports the winner.
+
+Usage
+    python benchmarks/bench_hedging.py
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncio
+import random
+import statistics
+import threading
+import time
+from typing import Dict, List, Optional
+
+from latch import Intent, LatchClient
+from latch.types import Signals
+from control_plane.decision_engine import DecisionEngine
+from control_plane.policy_engine import decide_policy
+from control_plane.translator import Translator
+from metrics.collector import MetricsCollector
+from runtime.gateway import RuntimeGateway
+from runtime.hedging import HEDGE_CONSTRAINT, Hedger
+from runtime.request_context import build_request_context
+
+N = 600
+FAST_S = 0.002
+SLOW_S = 0.060
+SLOW_P = 0.04
+BUDGET = 0.05
+BURST = 10.0
+
+
+class _Stalls:
+    def __init__(self, seed: int) -> None:
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        with self._lock:
+            return SLOW_S if self._rng.random() < SLOW_P else FAST_S
+
+
+def _pct(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_sync(hedger: Optional[Hedger], constraints: List[str]) -> List[float]:
+    stalls = _Stalls(7)
+
+    def model(prompt: str, *, model: str, max_tokens: int) -> dict:
+        time.sleep(stalls.delay())
+        return {"tokens_out": 8}
+
+    client = LatchClient(intent=Intent(name="chat", constraints=constraints), hedger=hedger)
+    session = client.request(tier="pro")
+    out = []
+    for i in range(N):
+        start = time.perf_counter()
+        session.call_model(f"q{i}", model_fn=model, model_id="small")
+        out.append((time.perf_counter() - start) * 1000.0)
+    client.close()
+    return out
+
+
+async def run_async(hedger: Optional[Hedger]) -> List[float]:
+    stalls = _Stalls(11)
+
+    async def model(prompt: str, *, model: str, max_tokens: int) -> dict:
+        await asyncio.sleep(stalls.delay())
+        return {"tokens_out": 8}
+
+    client = LatchClient(intent=Intent(name="chat", constraints=[HEDGE_CONSTRAINT]), hedger=hedger)
+    session = client.request(tier="pro")
+    out = []
+    for i in range(N):
+        start = time.perf_counter()
+        await session.acall_model(f"q{i}", model_fn=model, model_id="small")
+        out.append((time.perf_counter() - start) * 1000.0)
+    client.close()
+    return out
+
+
+class _SlowBackend:
+    def __init__(self) -> None:
+        self.stalls = _Stalls(3)
+
+    def execute(self, request: Dict[str, str]) -> Dict[str, str]:
+        time.sleep(self.stalls.delay())
+        return {"status": "ok", "mode": request.get("mode", "")}
+
+
+def run_gateway() -> Dict[str, int]:
+    hedger = Hedger(budget=BUDGET, burst=BURST)
+    metrics = MetricsCollector()
+    gateway = RuntimeGateway(backend=_SlowBackend(), hedger=hedger, metrics=metrics)
+    intent = Intent(name="chat", constraints=[HEDGE_CONSTRAINT])
+    context = build_request_context(request_type="chat", tier="pro", prompt_text="q")
+    decision = DecisionEngine().decide(intent, decide_policy(intent, Signals(), context))
+    request = Translator().translate(intent, decision)
+    winners: Dict[str, int] = {}
+    for _ in range(300):
+        start = time.perf_counter()
+        response = gateway.dispatch(request, context)
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        metrics.record({"allowed": "true", "latency_ms": f"{latency_ms:.3f}"})
+        winners[response.get("hedge", "missing")] = winners.get(response.get("hedge", "missing"), 0) + 1
+    hedger.close()
+    return winners
+
+
+def _report(name: str, samples: List[float]) -> None:
+    print(f"{name:>18}: p50 {statistics.median(samples):6.2f} ms  p99 {_pct(samples, 0.99):6.2f} ms")
+
+
+def _within_budget(hedger: Hedger) -> bool:
+    stats = hedger.stats()
+    return stats["hedge_issued"] <= BUDGET * stats["hedge_eligible"] + BURST
+
+
+def main() -> int:
+    failures = []
+
+    base = run_sync(None, [HEDGE_CONSTRAINT])
+    hedger = Hedger(budget=BUDGET, burst=BURST)
+    hedged = run_sync(hedger, [HEDGE_CONSTRAINT])
+    _report("sync, no hedging", base)
+    _report("sync, hedged", hedged)
+    print(f"{'':>18}  {hedger.stats()}")
+    if _pct(hedged, 0.99) * 3 > _pct(base, 0.99):
+        failures.append("sync hedging did not cut p99 by 3x")
+    if not _within_budget(hedger):
+        failures.append("sync hedges exceeded the budget")
+    hedger.close()
+
+    off = Hedger(budget=BUDGET, burst=BURST)
+    run_sync(off, [])
+    if off.counters["hedge_eligible"] or off.counters["hedge_issued"]:
+        failures.append("an intent without the hedge constraint was hedged")
+    off.close()
+
+    abase = asyncio.run(run_async(None))
+    ahedger = Hedger(budget=BUDGET, burst=BURST)
+    ahedged = asyncio.run(run_async(ahedger))
+    _report("async, no hedging", abase)
+    _report("async, hedged", ahedged)
+    print(f"{'':>18}  {ahedger.stats()}")
+    if _pct(ahedged, 0.99) * 3 > _pct(abase, 0.99):
+        failures.append("async hedging did not cut p99 by 3x")
+    if not _within_budget(ahedger):
+        failures.append("async hedges exceeded the budget")
+
+    winners = run_gateway()
+    print(f"{'gateway':>18}: hedge field {winners}")
+    if "missing" in winners or winners.get("hedge", 0) == 0:
+        failures.append(f"gateway did not hedge hedge=\"true\" requests {winners}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: hedging cuts tail latency within its budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
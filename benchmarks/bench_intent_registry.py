@@ -0,0 +1,193 @@
+"""
+Benchmark: hot-reloadable intent registry.
+
+Scenarios (on copies of configs/default_intents.yaml and configs/policies.yaml)
+- lookup: registry.get(name) against reloading the YAML per lookup.
+- deny: blocked / "deny" intents resolve to the zero-token policy.
+- reload: edits to either file are picked up by check() and by the
+  watcher thread; new sessions see the new limits, and sessions that were
+  already open keep the snapshot they started with.
+- bad edit: a file that fails to load keeps the current snapshot and is
+  counted once.
+- concurrency: readers keep resolving intents and deciding policies while
+  a writer reloads continuously; no errors, versions never go backwards.
+
+Exit 1 on failure.
+
+Usage
+    python benchmarks/bench_intent_registry.py
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from latch import LatchClient
+from control_plane.config import DEFAULT_INTENTS_PATH, DEFAULT_POLICIES_PATH, load_intents
+from control_plane.intent_registry import IntentRegistry
+from latch.types import Signals
+from metrics.collector import MetricsCollector
+from runtime.request_context import build_request_context
+
+
+def _rewrite(path: Path, old: str, new: str) -> None:
+    text = path.read_text(encoding="utf-8")
+    path.write_text(text.replace(old, new), encoding="utf-8")
+    # Coarse filesystem clocks: make sure the stamp moves.
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def check_lookup(registry: IntentRegistry, failures: List[str]) -> None:
+    n = 200_000
+    start = time.perf_counter()
+    for _ in range(n):
+        registry.get("summarize")
+    get_ns = (time.perf_counter() - start) / n * 1e9
+    m = 200
+    start = time.perf_counter()
+    for _ in range(m):
+        load_intents(registry.intents_path)["summarize"]
+    load_us = (time.perf_counter() - start) / m * 1e6
+    print(f"lookup: registry.get {get_ns:.0f} ns vs load per lookup {load_us:.0f} us")
+    if get_ns > 2000:
+        failures.append(f"registry lookup costs {get_ns:.0f} ns")
+
+
+def check_deny(client: LatchClient, failures: List[str]) -> None:
+    registry = client.intents
+    context, policy = client.request(intent="exfiltrate", tier="pro").before_model_call("q", "m")
+    print(f"deny: denied={sorted(registry.snapshot.denied)}, exfiltrate -> {policy.max_tokens} tokens ({policy.notes})")
+    if not registry.is_denied("exfiltrate") or registry.is_denied("summarize") or policy.max_tokens != 0:
+        failures.append("blocked intent was not resolved to deny")
+
+
+def check_reload(client: LatchClient, intents_path: Path, policies_path: Path, failures: List[str]) -> None:
+    registry = client.intents
+    before = client.request(intent="summarize", tier="pro")
+    _, policy_before = before.before_model_call("q", "m")
+    v1 = registry.snapshot.version
+    _rewrite(intents_path, "max_latency_ms: 800", "max_latency_ms: 650")
+    _rewrite(policies_path, "default: 512", "default: 384")
+    if registry.check() is not True or registry.check() is not False:
+        failures.append("check() did not reload exactly once per edit")
+    after = client.request(intent="summarize", tier="pro")
+    _, policy_after = after.before_model_call("q", "m")
+    _, policy_old = before.before_model_call("q", "m")
+    print(f"reload: v{v1} -> v{registry.snapshot.version}, summarize max_latency_ms "
+          f"{registry['summarize'].max_latency_ms}, default cap {policy_before.max_tokens} -> "
+          f"{policy_after.max_tokens} (open session keeps {policy_old.max_tokens})")
+    if registry["summarize"].max_latency_ms != 650 or policy_after.max_tokens != 384:
+        failures.append("edited limits were not applied after reload")
+    if policy_old.max_tokens != policy_before.max_tokens:
+        failures.append("an open session switched configs mid-request")
+
+    registry.start(0.01)
+    try:
+        version = registry.snapshot.version
+        _rewrite(intents_path, "max_latency_ms: 650", "max_latency_ms: 700")
+        deadline = time.monotonic() + 2.0
+        while registry.snapshot.version == version and time.monotonic() < deadline:
+            time.sleep(0.005)
+    finally:
+        registry.stop()
+    print(f"watcher: summarize max_latency_ms {registry['summarize'].max_latency_ms}")
+    if registry["summarize"].max_latency_ms != 700:
+        failures.append("watcher thread did not pick up an edit")
+
+
+def check_bad_edit(client: LatchClient, intents_path: Path, failures: List[str]) -> None:
+    registry = client.intents
+    good = intents_path.read_text(encoding="utf-8")
+    snapshot = registry.snapshot
+    intents_path.write_text("intents:\n  - priority: 1\n", encoding="utf-8")
+    _rewrite(intents_path, "", "")
+    registry.check()
+    registry.check()
+    failed = client.metrics.counters.get("intent_registry_reload_failed", 0)
+    print(f"bad edit: kept v{registry.snapshot.version}, failures counted {failed}, "
+          f"last_error {type(registry.last_error).__name__}")
+    if registry.snapshot is not snapshot or failed != 1:
+        failures.append("a bad edit replaced the snapshot or was counted more than once")
+    intents_path.write_text(good, encoding="utf-8")
+    _rewrite(intents_path, "", "")
+    if not registry.check() or registry.last_error is not None:
+        failures.append("registry did not recover after the bad edit was fixed")
+
+
+def check_concurrency(registry: IntentRegistry, failures: List[str]) -> None:
+    stop = threading.Event()
+    errors: List[BaseException] = []
+    reads = [0] * 4
+    context = build_request_context("user", "pro", "q")
+    signals = Signals()
+
+    def reader(slot: int) -> None:
+        last = 0
+        try:
+            while not stop.is_set():
+                snapshot = registry.snapshot
+                if snapshot.version < last:
+                    raise AssertionError("version went backwards")
+                last = snapshot.version
+                intent = snapshot.get("summarize")
+                snapshot.engine.evaluate(intent, signals, context)
+                snapshot.is_denied("exfiltrate")
+                reads[slot] += 1
+        except BaseException as exc:  # surfaced below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(len(reads))]
+    for t in threads:
+        t.start()
+    reloads = 0
+    end = time.monotonic() + 0.5
+    while time.monotonic() < end:
+        reloads += registry.reload()
+    stop.set()
+    for t in threads:
+        t.join()
+    print(f"concurrency: {sum(reads)} reads across {len(reads)} threads during {reloads} reloads, "
+          f"{len(errors)} errors")
+    if errors or not reloads:
+        failures.append(f"readers failed during reloads: {errors[:1]}")
+
+
+def main() -> int:
+    failures: List[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        intents_path = Path(tmp) / "default_intents.yaml"
+        policies_path = Path(tmp) / "policies.yaml"
+        shutil.copyfile(DEFAULT_INTENTS_PATH, intents_path)
+        shutil.copyfile(DEFAULT_POLICIES_PATH, policies_path)
+        metrics = MetricsCollector()
+        registry = IntentRegistry(intents_path, policies_path, metrics=metrics)
+        client = LatchClient(intents=registry, metrics=metrics)
+
+        check_lookup(registry, failures)
+        check_deny(client, failures)
+        check_reload(client, intents_path, policies_path, failures)
+        check_bad_edit(client, intents_path, failures)
+        check_concurrency(registry, failures)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: intents are served from an immutable snapshot and hot-reloaded without locks")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,198 @@
+"""
+Benchmark: online per-model latency prediction.
+
+Scenarios
+- accuracy: synthetic latency = 20 + 0.02 * prompt + 0.5 * out + 3 * queue
+  (+ gaussian noise); after a warm-up the prediction error must be close to
+  the noise and the coefficients close to the truth.
+- drift: the per-output-token cost doubles mid-stream; the forgetting
+  factor must track the new regime.
+- offer: cost of the hot-path `offer()` (a deque append) per event, and
+  of the off-path `update()` that folds the queue in.
+- slo: simulated traffic with a 300 ms budget and prompts of 100..4000
+  tokens. Rule-based caps alone let long prompts miss; with the model the
+  policy caps max_tokens before the call and the violation rate drops.
+- deadline: the DOWNGRADE path of bench_deadlines (0.25 ms/token, 25 ms
+  budget), with a latency model on the collector: downgraded calls now fit.
+
+Exit 1 on failure.
+
+Usage
+    python benchmarks/bench_latency_model.py
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import random
+import time
+from typing import Dict, List, Tuple
+
+from latch import Intent, LatchClient
+from control_plane.config import PolicyConfig
+from control_plane.latency_model import LatencyModel
+from control_plane.policy_engine import PolicyEngine
+from latch.types import RequestContext, Signals
+from metrics.collector import MetricsCollector
+from runtime.deadline import DOWNGRADE, DeadlineConfig
+
+TRUTH = (20.0, 0.02, 0.5, 3.0)
+NOISE_MS = 2.0
+
+
+def _latency(rng: random.Random, w: Tuple[float, ...], prompt: int, out: int, queue: float) -> float:
+    return max(0.0, w[0] + w[1] * prompt + w[2] * out + w[3] * queue + rng.gauss(0.0, NOISE_MS))
+
+
+def _feed(model: LatencyModel, rng: random.Random, w: Tuple[float, ...], n: int) -> None:
+    for _ in range(n):
+        prompt, out, queue = rng.randint(50, 4000), rng.randint(1, 800), float(rng.randint(0, 8))
+        model.observe("m", prompt_tokens=prompt, tokens_out=out, queue_depth=queue,
+                      latency_ms=_latency(rng, w, prompt, out, queue))
+    model.update()
+
+
+def _mae(model: LatencyModel, rng: random.Random, w: Tuple[float, ...], n: int = 2000) -> float:
+    err = 0.0
+    for _ in range(n):
+        prompt, out, queue = rng.randint(50, 4000), rng.randint(1, 800), float(rng.randint(0, 8))
+        truth = w[0] + w[1] * prompt + w[2] * out + w[3] * queue
+        err += abs(model.predict("m", prompt, out, queue) - truth)
+    return err / n
+
+
+def check_accuracy(failures: List[str]) -> LatencyModel:
+    rng = random.Random(7)
+    model = LatencyModel(interval_s=None)
+    _feed(model, rng, TRUTH, 20)
+    if model.predict("m", 100, 100) is not None:
+        failures.append("cold model returned a prediction")
+    _feed(model, rng, TRUTH, 3000)
+    coefs, n = model.coefficients("m")
+    mae = _mae(model, rng, TRUTH)
+    print(f"accuracy: {n} samples, coefs {tuple(round(c, 3) for c in coefs)} vs {TRUTH}, MAE {mae:.2f} ms")
+    if mae > NOISE_MS * 1.5:
+        failures.append(f"prediction MAE {mae:.2f} ms is far above the {NOISE_MS} ms noise")
+    if abs(coefs[2] - TRUTH[2]) > 0.05 * TRUTH[2]:
+        failures.append("per-output-token coefficient is off by more than 5%")
+    return model
+
+
+def check_drift(model: LatencyModel, failures: List[str]) -> None:
+    rng = random.Random(11)
+    drifted = (TRUTH[0], TRUTH[1], TRUTH[2] * 2, TRUTH[3])
+    before = _mae(model, rng, drifted)
+    _feed(model, rng, drifted, 1500)
+    after = _mae(model, rng, drifted)
+    print(f"drift: out cost 0.5 -> 1.0 ms/token; MAE {before:.1f} ms -> {after:.2f} ms after 1500 events")
+    if after > NOISE_MS * 2:
+        failures.append("model did not track a doubled per-token cost")
+
+
+def check_offer_cost(failures: List[str]) -> None:
+    row = (0.0, 42.0, 300, 120, "", "chat", "m", 1.0, 0.0, 0.0, 0.0)
+    n = 200_000
+    queued = LatencyModel(interval_s=None, max_pending=n)
+    start = time.perf_counter()
+    for _ in range(n):
+        queued.offer(row)
+    offer_ns = (time.perf_counter() - start) / n * 1e9
+    start = time.perf_counter()
+    queued.update()
+    update_us = (time.perf_counter() - start) / n * 1e6
+    print(f"offer: {offer_ns:.0f} ns/event queued, update {update_us:.1f} us/event (off the request path)")
+    if offer_ns > 2000:
+        failures.append(f"offer() costs {offer_ns:.0f} ns, expected a plain append")
+
+
+def run_slo(with_model: bool, n: int = 4000) -> Dict[str, float]:
+    rng = random.Random(3)
+    truth = (30.0, 0.05, 0.45, 0.0)
+    # Updates run every 64 events here (in production: the background updater).
+    model = LatencyModel(interval_s=None) if with_model else None
+    engine = PolicyEngine(PolicyConfig(), latency_model=model)
+    intent = Intent(name="chat", max_latency_ms=300)
+    signals = Signals()
+    missed = tokens = 0
+    for i in range(n):
+        prompt = rng.randint(100, 4000)
+        context = RequestContext(user_id="u", trace_id=str(i), prompt_tokens=prompt, tier="pro", is_background=False)
+        cap = engine.evaluate(intent, signals, context, "m").max_tokens
+        out = cap  # generations run to the cap
+        latency = _latency(rng, truth, prompt, out, 0.0)
+        missed += latency > intent.max_latency_ms
+        tokens += out
+        if model is not None:
+            model.observe("m", prompt_tokens=prompt, tokens_out=out, latency_ms=latency)
+            if i % 64 == 63:
+                model.update()
+    return {"violations": missed / n, "avg_tokens": tokens / n}
+
+
+def check_slo(failures: List[str]) -> None:
+    plain = run_slo(False)
+    capped = run_slo(True)
+    print(f"slo: violations {plain['violations']:.1%} -> {capped['violations']:.1%}, "
+          f"avg max_tokens {plain['avg_tokens']:.0f} -> {capped['avg_tokens']:.0f}")
+    if capped["violations"] > plain["violations"] * 0.25:
+        failures.append("predicted caps did not cut SLO violations by 4x")
+
+
+def run_deadline(with_model: bool, n: int = 200) -> Dict[str, float]:
+    budget_ms = 25
+    tokens: List[int] = []
+
+    def fn(prompt: str, *, model: str, max_tokens: int) -> dict:
+        tokens.append(max_tokens)
+        time.sleep(0.00025 * max_tokens)
+        return {"tokens_out": max_tokens}
+
+    latency_model = LatencyModel(interval_s=0.02) if with_model else None
+    metrics = MetricsCollector(latency_model=latency_model) if with_model else None
+    client = LatchClient(
+        intent=Intent(name="chat", max_latency_ms=budget_ms),
+        metrics=metrics,
+        deadlines=DeadlineConfig(on_predicted_miss=DOWNGRADE),
+        signals_refresh_every=4,
+    )
+    met = 0
+    warmup = n // 4
+    for i in range(n):
+        result = client.request(tier="pro").call_model(f"q{i}", model_fn=fn, model_id="m", max_tokens=160)
+        met += i >= warmup and result.latency_ms <= budget_ms
+    if latency_model is not None:
+        latency_model.stop()
+    return {"met": met / (n - warmup), "avg_tokens": sum(tokens[warmup:]) / (n - warmup)}
+
+
+def check_deadline(failures: List[str]) -> None:
+    p50 = run_deadline(False)
+    model = run_deadline(True)
+    print(f"deadline downgrade (after warm-up): on time {p50['met']:.0%} -> {model['met']:.0%}, "
+          f"avg max_tokens {p50['avg_tokens']:.0f} -> {model['avg_tokens']:.0f}")
+    if model["met"] < 0.8:
+        failures.append("downgrades sized by the latency model still missed the deadline")
+
+
+def main() -> int:
+    failures: List[str] = []
+    model = check_accuracy(failures)
+    check_drift(model, failures)
+    check_offer_cost(failures)
+    check_slo(failures)
+    check_deadline(failures)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: per-model latency predictions are accurate, track drift and cap tokens before misses")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
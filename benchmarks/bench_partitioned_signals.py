@@ -0,0 +1,120 @@
+"""
+Benchmark: per-key partitioned signals (intent x tier x model_id).
+
+Reports the request-path cost of recording into a partition and of the
+per-key Signals lookup as the number of live keys grows, and checks that
+- the lookup stays flat (O(1)): the 4096-key cost is within 3x of the 1-key cost;
+- the key count never exceeds `max_keys` (LRU eviction of cold keys);
+- a slow model only makes its own partition hot: through the SDK, its
+  policy degrades while another model's policy for the same intent does not.
+
+Exits 1 if a check fails.
+
+Usage
+    python benchmarks/bench_partitioned_signals.py
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sys
+import time
+from typing import Any, Callable, List
+
+from latch import Intent, LatchClient
+from metrics.collector import MetricsCollector
+from metrics.partitioned_stats import PartitionedStats
+from metrics.signals import SignalsCache
+
+N = 50_000
+
+
+def _best_us(fn: Callable[[], Any], n: int, rounds: int = 5) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / n * 1e6
+
+
+def bench_scaling() -> bool:
+    lookups: List[float] = []
+    print(f"{'keys':>6} {'record_event':>13} {'for_key':>9}   (us/op)")
+    for keys in (1, 256, 4096):
+        metrics = MetricsCollector(partitions=PartitionedStats(max_keys=keys))
+        signals = SignalsCache(metrics, min_key_samples=1)
+        names = [(f"intent{i % 16}", "pro", f"model{i}") for i in range(keys)]
+        now = time.time()
+        for key in names:
+            metrics.record_event(100.0, 1, 1, None, "user", key[2], now, intent=key[0], tier=key[1])
+            signals.note_event(1, key)
+        i = 0
+
+        def record() -> None:
+            nonlocal i
+            i = (i + 1) % keys
+            key = names[i]
+            metrics.record_event(100.0, 1, 1, None, "user", key[2], now, intent=key[0], tier=key[1])
+
+        def lookup() -> None:
+            nonlocal i
+            i = (i + 1) % keys
+            signals.for_key(names[i])
+
+        record_us = _best_us(record, N // 10)
+        lookup_us = _best_us(lookup, N)
+        lookups.append(lookup_us)
+        print(f"{keys:>6} {record_us:>13.2f} {lookup_us:>9.3f}")
+    ok = lookups[-1] <= 3 * lookups[0]
+    print(f"lookup 4096 vs 1 key: {lookups[-1] / lookups[0]:.2f}x  {'ok' if ok else 'FAIL'}")
+    return ok
+
+
+def check_eviction_and_isolation() -> bool:
+    partitions = PartitionedStats(max_keys=64)
+    metrics = MetricsCollector(partitions=partitions)
+    now = time.time()
+    for i in range(10_000):
+        model = f"tenant-model-{i % 500}"
+        metrics.record_event(50.0, 1, 1, None, "user", model, now, intent="chat", tier="free")
+    bounded = len(partitions) <= 64
+    print(f"partitions {len(partitions)} (cap 64, {partitions.evictions} evicted)  {'ok' if bounded else 'FAIL'}")
+
+    client = LatchClient(intent=Intent(name="chat", max_latency_ms=500), metrics=metrics, signals_refresh_every=8)
+    session = client.request(tier="pro")
+
+    def model(prompt: str, *, model: str, max_tokens: int) -> dict:
+        return {"tokens_out": 1}
+
+    for _ in range(100):
+        session.call_model("hi", model_fn=model, model_id="fast")
+        # "slow" calls, recorded as if each took 5 s.
+        metrics.record_event(5000.0, 1, 1, None, "user", "slow", time.time(), intent="chat", tier="pro")
+        client.note_event(1, ("chat", "pro", "slow"))
+    policies = {}
+    for name in ("slow", "fast"):
+        session.call_model("hi", model_fn=model, model_id=name)
+        policies[name] = session.last_policy
+    isolated = policies["slow"].mode == "degraded" and policies["fast"].mode == "normal"
+    print(
+        f"global p95 {client.signals.current.p95_latency_ms:.0f} ms; policy slow={policies['slow'].notes} "
+        f"fast={policies['fast'].notes}  {'ok' if isolated else 'FAIL'}"
+    )
+    return bounded and isolated
+
+
+def main() -> int:
+    ok = bench_scaling()
+    ok = check_eviction_and_isolation() and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+"""
+Microbenchmark: per-decision cost of decide_policy, before and after compilation.
+
+"before" reproduces the previous path: a fresh PolicyEngine per call walking
+the hard-coded if-chain. "after" is the compiled, memoized default engine.
+
+Usage
+    python benchmarks/bench_policy.py
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import time
+from typing import Callable, List, Tuple
+
+from control_plane.policy_engine import decide_policy
+from latch.types import Intent, Policy, RequestContext, Signals
+
+
+class IfChainPolicyEngine:
+    def evaluate(self, intent: Intent, signals: Signals, request_context: RequestContext) -> Policy:
+        p95_latency = float(signals.p95_latency_ms)
+        cost_rate = float(signals.cost_rate)
+        error_rate = float(signals.error_rate)
+        queue_depth = float(signals.queue_depth)
+        tier = request_context.tier
+        prompt_tokens = int(request_context.prompt_tokens)
+
+        if "deny" in intent.constraints:
+            return Policy("degraded", "throughput", 0, "explicit_deny")
+        if error_rate > 0.05 or queue_depth > 8:
+            return Policy("degraded", "throughput", 128, "system_hot")
+        if p95_latency > intent.max_latency_ms:
+            return Policy("degraded", "latency", 256, "latency_hot")
+        if cost_rate > intent.max_cost:
+            return Policy("degraded", "throughput", 192, "cost_hot")
+        if intent.max_latency_ms <= 400 or intent.priority >= 8:
+            return Policy("normal", "latency", max(256, prompt_tokens // 2), "latency_priority")
+        if tier == "free":
+            return Policy("normal", "throughput", 256, "free_tier")
+        return Policy("normal", "throughput", 512, "default")
+
+
+def legacy_decide_policy(intent: Intent, signals: Signals, request_context: RequestContext) -> Policy:
+    return IfChainPolicyEngine().evaluate(intent, signals, request_context)
+
+
+def _workload(n: int = 4096) -> List[Tuple[Intent, Signals, RequestContext]]:
+    intents = [
+        Intent(name="summarize", priority=1, max_latency_ms=800, max_cost=0.004),
+        Intent(name="classify", priority=2, max_latency_ms=400, max_cost=0.003),
+        Intent(name="chat", priority=5, max_latency_ms=1200, max_cost=0.01),
+    ]
+    signals = [Signals(), Signals(p95_latency_ms=900.0), Signals(queue_depth=3.0, cost_rate=0.001)]
+    out = []
+    for i in range(n):
+        ctx = RequestContext(
+            user_id="u",
+            trace_id=str(i),
+            prompt_tokens=64 + (i * 97) % 2048,
+            tier="free" if i % 3 else "pro",
+            is_background=i % 4 == 0,
+        )
+        out.append((intents[i % len(intents)], signals[i % len(signals)], ctx))
+    return out
+
+
+def _ns_per_decision(fn: Callable[..., Policy], work, rounds: int = 50) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for intent, signals, ctx in work:
+                fn(intent, signals, ctx)
+        best = min(best, time.perf_counter() - start)
+    return best / (rounds * len(work)) * 1e9
+
+
+def run() -> None:
+    work = _workload()
+    before = _ns_per_decision(legacy_decide_policy, work)
+    after = _ns_per_decision(decide_policy, work)
+    print(f"before (new engine + if-chain): {before:8.0f} ns/decision")
+    print(f"after  (compiled + memoized):   {after:8.0f} ns/decision  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    run()
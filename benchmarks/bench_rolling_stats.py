@@ -0,0 +1,83 @@
+"""
+Benchmark: RollingStats (quantile sketch) vs the previous sorted-deque window.
+
+Measures record() and snapshot() cost at several window sizes, plus p95
+accuracy against an exact sort of the same window.
+
+Usage
+    python benchmarks/bench_rolling_stats.py
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import random
+import time
+from collections import deque
+from typing import Deque, List
+
+from metrics.rolling_stats import RollingStats
+
+
+class SortedDequeStats:
+    """The pre-sketch RollingStats p95 path: sort the whole window per snapshot."""
+
+    def __init__(self, window: int = 50) -> None:
+        self.window: Deque[float] = deque(maxlen=window)
+
+    def record(self, allowed: bool, latency_ms: float, cost: float, queue_depth: float) -> None:
+        self.window.append(latency_ms)
+
+    def p95(self) -> float:
+        if not self.window:
+            return 0.0
+        values = sorted(self.window)
+        return values[int(0.95 * (len(values) - 1))]
+
+
+def _samples(n: int, seed: int = 7) -> List[float]:
+    rng = random.Random(seed)
+    return [rng.lognormvariate(5.0, 0.8) for _ in range(n)]
+
+
+def _time_per_op(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e9
+
+
+def run(windows=(50, 1024, 16384, 131072), snapshots: int = 200) -> None:
+    print(f"{'window':>8} {'impl':>8} {'record_ns':>10} {'rec+p95_ns':>12} {'p95':>9} {'exact':>9}")
+    for window in windows:
+        values = _samples(window * 2)
+        exact = sorted(values[-window:])[int(0.95 * (window - 1))]
+        for name, stats in (("sorted", SortedDequeStats(window)), ("sketch", RollingStats(window))):
+            start = time.perf_counter()
+            for v in values:
+                stats.record(True, v, 0.0, 0.0)
+            record_ns = (time.perf_counter() - start) / len(values) * 1e9
+            if isinstance(stats, SortedDequeStats):
+                read = stats.p95
+                n = max(3, snapshots // max(1, window // 1024))
+            else:
+                read = lambda s=stats: s.snapshot()["p95_latency_ms"]
+                n = snapshots
+            reported = read()
+
+            # Interleave one record per read so cached sketch state never helps.
+            def record_and_read(s=stats, v=values[-1], read=read) -> float:
+                s.record(True, v, 0.0, 0.0)
+                return read()
+
+            p95_ns = _time_per_op(record_and_read, n)
+            print(f"{window:>8} {name:>8} {record_ns:>10.0f} {p95_ns:>12.0f} {reported:>9.1f} {exact:>9.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,116 @@
+"""
+Benchmark: cost/latency-aware model routing.
+
+Three simulated models (cheap/slow, mid, expensive/fast) serve a mixed
+workload of intents with different latency budgets. The cheap model gets 3x
+slower for the middle third of the run, then recovers. Strategies compared:
+always the fast model, always the cheap model, and ModelRouter.
+
+Checks (exit 1 on failure)
+- the router meets the latency budget about as often as always-fast
+  (within 3 points) at no more than half its cost;
+- it moves traffic off the cheap model while that model is slow, and
+  exploration brings the traffic back once it recovers.
+
+Usage
+    python benchmarks/bench_router.py
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from control_plane.router import ModelRouter, ModelSpec
+from latch.types import Intent
+
+N = 30_000
+MAX_TOKENS = 256
+MODELS = (
+    ModelSpec("small", cost_per_1k_tokens=0.0005, prior_ms_per_token=1.0, mode="cheap"),
+    ModelSpec("medium", cost_per_1k_tokens=0.002, prior_ms_per_token=0.5),
+    ModelSpec("large", cost_per_1k_tokens=0.01, prior_ms_per_token=0.2, mode="fast"),
+)
+TRUE_MS_PER_TOKEN = {"small": 1.2, "medium": 0.6, "large": 0.25}
+INTENTS = (
+    Intent(name="realtime", priority=5, max_latency_ms=400, max_cost=0.05),
+    Intent(name="chat", priority=3, max_latency_ms=900, max_cost=0.01),
+    Intent(name="batch", priority=1, max_latency_ms=3000, max_cost=0.002),
+)
+
+
+def _workload(seed: int = 5) -> List[Tuple[Intent, int, int, float]]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(N):
+        prompt = int(rng.lognormvariate(5.5, 0.6))
+        tokens_out = max(1, min(MAX_TOKENS, int(rng.expovariate(1 / 120))))
+        out.append((rng.choice(INTENTS), prompt, tokens_out, rng.lognormvariate(0.0, 0.15)))
+    return out
+
+
+def _latency(model: str, i: int, tokens: int, noise: float) -> float:
+    slow = 3.0 if model == "small" and N // 3 <= i < 2 * N // 3 else 1.0
+    return TRUE_MS_PER_TOKEN[model] * slow * tokens * noise
+
+
+def run(choose: Callable[[int, Intent, int], str], observe: Callable[..., None]) -> Dict[str, object]:
+    cost = 0.0
+    met = 0
+    shares: List[Dict[str, int]] = [{m.name: 0 for m in MODELS} for _ in range(3)]
+    prices = {m.name: m.cost_per_1k_tokens / 1000.0 for m in MODELS}
+    for i, (intent, prompt, tokens_out, noise) in enumerate(_workload()):
+        model = choose(i, intent, prompt)
+        tokens = prompt + tokens_out
+        latency = _latency(model, i, tokens, noise)
+        cost += prices[model] * tokens
+        met += latency <= intent.max_latency_ms
+        shares[i * 3 // N][model] += 1
+        observe(model, prompt_tokens=prompt, tokens_out=tokens_out, latency_ms=latency)
+    return {"cost": cost, "slo": met / N, "shares": shares}
+
+
+def main() -> int:
+    results = {
+        "always large": run(lambda i, intent, p: "large", lambda *a, **k: None),
+        "always small": run(lambda i, intent, p: "small", lambda *a, **k: None),
+    }
+    router = ModelRouter(MODELS, explore_after=100)
+    start = time.perf_counter()
+    results["router"] = run(lambda i, intent, p: router.route(intent, p, MAX_TOKENS).model_id, router.observe)
+    per_decision_us = (time.perf_counter() - start) / N * 1e6
+
+    for name, r in results.items():
+        shares = " | ".join(
+            " ".join(f"{m}={s[m] * 300 // N:2d}%" for m in s) for s in r["shares"]  # type: ignore[union-attr]
+        )
+        print(f"{name:>13}: cost {r['cost']:8.4f}  latency budget met {r['slo'] * 100:5.1f}%  [{shares}]")
+    print(f"router: {per_decision_us:.2f} us per route+observe, decisions {router.counters}")
+
+    large, ours = results["always large"], results["router"]
+    thirds = ours["shares"]  # type: ignore[assignment]
+    small_share = [t["small"] * 3 / N for t in thirds]
+    failures = []
+    if ours["slo"] < large["slo"] - 0.03:  # type: ignore[operator]
+        failures.append("router misses the latency budget more often than always-fast")
+    if ours["cost"] > 0.5 * large["cost"]:  # type: ignore[operator]
+        failures.append("router costs more than half of always-fast")
+    if not (small_share[1] < small_share[0] / 2 and small_share[2] > small_share[0] * 0.7):
+        failures.append(f"router did not track the cheap model's slowdown/recovery {small_share}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: router meets latency budgets at a fraction of the cost and tracks model drift")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
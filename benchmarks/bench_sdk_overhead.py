@@ -0,0 +1,98 @@
+"""
+SDK overhead budget: RequestSession.call_model vs calling the model directly.
+
+Overhead = (time through call_model) - (time calling model_fn directly), per
+call, for a no-op model. This covers context building, policy, token
+capping, the call plan and metric recording.
+
+Budget
+- Default 50 us/call (override with LATCH_SDK_OVERHEAD_BUDGET_US). The SDK
+  measures ~15-20 us/call on a slow shared CI core; the budget leaves
+  headroom for noise but fails on a per-call regression such as
+  reintroducing `inspect.signature` or a uuid per call.
+- Overhead must also stay near-constant across callable shapes (plain
+  function, bound method, **kwargs): the spread must stay under 3x.
+
+Usage
+    python benchmarks/bench_sdk_overhead.py          # report
+    python benchmarks/bench_sdk_overhead.py --check  # exit 1 if over budget
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict
+
+from latch import Intent, LatchClient
+
+PROMPT = "Summarize the following ticket. " * 8
+
+
+def plain_model(prompt: str, *, model: str, max_tokens: int) -> dict:
+    return {"tokens_out": 8}
+
+
+def kwargs_model(prompt: str, **kwargs: Any) -> dict:
+    return {"tokens_out": 8}
+
+
+class _Backend:
+    def generate(self, prompt: str, model: str = "", max_tokens: int = 0, temperature: float = 0.0) -> dict:
+        return {"tokens_out": 8}
+
+
+def _per_call_us(fn: Callable[[], Any], n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def measure(n: int = 5000, rounds: int = 7) -> Dict[str, float]:
+    client = LatchClient(intent=Intent(name="bench", max_latency_ms=1000))
+    session = client.request(tier="pro", metadata={"user_id": "bench"})
+    backend = _Backend()
+    shapes = {
+        "plain": plain_model,
+        "kwargs": kwargs_model,
+        "bound_method": backend.generate,
+    }
+    out: Dict[str, float] = {}
+    for name, fn in shapes.items():
+        samples = []
+        for _ in range(rounds):
+            wrapped = _per_call_us(lambda: session.call_model(PROMPT, model_fn=fn, model_id="small"), n)
+            direct = _per_call_us(lambda: fn(PROMPT, model="small", max_tokens=256), n)
+            samples.append(wrapped - direct)
+        out[name] = statistics.median(samples)
+    return out
+
+
+def main(argv: list) -> int:
+    budget_us = float(os.environ.get("LATCH_SDK_OVERHEAD_BUDGET_US", "50"))
+    overhead = measure()
+    for name, us in overhead.items():
+        print(f"{name:>13}: {us:7.2f} us/call overhead (budget {budget_us:.0f})")
+    spread = max(overhead.values()) / max(1e-9, min(overhead.values()))
+    print(f"{'spread':>13}: {spread:7.2f}x (limit 3.00x)")
+    if "--check" not in argv:
+        return 0
+    failed = [name for name, us in overhead.items() if us > budget_us]
+    if failed or spread > 3.0:
+        print(f"FAIL: SDK overhead regression ({', '.join(failed) or 'spread'})")
+        return 1
+    print("OK: SDK overhead within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
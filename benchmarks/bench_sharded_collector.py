@@ -0,0 +1,101 @@
+"""
+Benchmark: record_event throughput vs thread count, global lock vs sharded.
+
+"locked" is the plain MetricsCollector behind one lock (what a threaded
+server has to do today); "sharded" is ShardedMetricsCollector. After every
+run the merged snapshot is checked against what the threads recorded, so
+the benchmark doubles as a concurrency correctness check (exit 1 on a
+mismatch).
+
+Under the GIL, total throughput cannot grow much with threads; what the
+sharded collector removes is the lock convoy (threads parking on one lock).
+On a free-threaded build the shards record in parallel.
+
+Usage
+    python benchmarks/bench_sharded_collector.py
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sys
+import threading
+import time
+from typing import Any, Tuple
+
+from metrics.collector import MetricsCollector
+from metrics.sharded_collector import ShardedMetricsCollector
+
+PER_THREAD = 20_000
+
+
+class LockedCollector:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.inner = MetricsCollector()
+
+    def record_event(self, *args: Any, **kwargs: Any) -> None:
+        with self._lock:
+            self.inner.record_event(*args, **kwargs)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return self.inner.snapshot()
+
+
+def _run(collector: Any, threads: int) -> Tuple[float, dict]:
+    barrier = threading.Barrier(threads + 1)
+    now = time.time()
+
+    def worker(idx: int) -> None:
+        record = collector.record_event
+        # Every 10th event is an error, so allow_rate must come out at exactly 0.9.
+        barrier.wait()
+        for i in range(PER_THREAD):
+            record(
+                10.0 + (i & 63),
+                tokens_in=64,
+                tokens_out=16,
+                error_type="Timeout" if i % 10 == 0 else None,
+                request_type="user",
+                model_id="m",
+                ts=now,
+                cost_estimate=0.001,
+            )
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return threads * PER_THREAD / elapsed, collector.snapshot()
+
+
+def main() -> int:
+    ok = True
+    print(f"{'threads':>7} {'locked ev/s':>12} {'sharded ev/s':>13}  check")
+    for threads in (1, 2, 4, 8, 16):
+        locked_rate, _ = _run(LockedCollector(), threads)
+        sharded_rate, snap = _run(ShardedMetricsCollector(shards=threads), threads)
+        expected = threads * PER_THREAD
+        good = (
+            snap["count"] == expected
+            and abs(snap["allow_rate"] - 0.9) < 1e-9
+            and abs(snap["avg_cost"] - 0.001) < 1e-12
+            and snap["window_count"] == expected
+        )
+        ok = ok and good
+        print(f"{threads:>7} {locked_rate:>12.0f} {sharded_rate:>13.0f}  {'ok' if good else 'MISMATCH ' + str(snap['count'])}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
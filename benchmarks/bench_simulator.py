@@ -0,0 +1,81 @@
+"""
+Benchmark: discrete-event queueing simulator.
+
+Pushes seeded Poisson arrivals at increasing rates through QueueSimulator and
+reports simulation speed plus the simulated latency curve, then drives the
+same simulator through RuntimeGateway to show queue depth under overload.
+
+Usage
+    python benchmarks/bench_simulator.py [--requests 1000000]
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import argparse
+import random
+import time
+from typing import Iterator, List, Tuple
+
+from latch.types import RequestContext
+from runtime.admission import AdmissionController
+from runtime.gateway import RuntimeGateway
+from runtime.simulator import QueueSimulator, SimConfig, SimulatedLLMD
+
+
+def _arrivals(n: int, rate_per_s: float, seed: int) -> Iterator[Tuple[float, int]]:
+    rng = random.Random(seed)
+    t = 0.0
+    for _ in range(n):
+        t += rng.expovariate(rate_per_s) * 1000.0
+        yield t, rng.randint(32, 1024)
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def run(requests: int) -> None:
+    for rate in (40.0, 80.0, 120.0):
+        sim = QueueSimulator(SimConfig(), seed=7)
+        start = time.perf_counter()
+        latencies = [r.latency_ms for r in sim.run(_arrivals(requests, rate, seed=1))]
+        elapsed = time.perf_counter() - start
+        print(
+            f"rate {rate:5.0f}/s: {requests} requests in {elapsed:5.2f} s "
+            f"({requests / elapsed / 1000:6.1f}k req/s) | "
+            f"p50 {_pct(latencies, 0.5):8.1f} ms  p99 {_pct(latencies, 0.99):8.1f} ms"
+        )
+
+    ctx = RequestContext(user_id="u", trace_id="t", prompt_tokens=512, tier="pro", is_background=False)
+    for rate in (40.0, 200.0):
+        gateway = RuntimeGateway(
+            admission=AdmissionController(concurrency_cap=10_000, max_queue_depth=10_000),
+            backend=SimulatedLLMD(seed=3, arrival_rate_per_s=rate),
+        )
+        responses = [gateway.dispatch({"action": "allow", "mode": "balanced"}, ctx) for _ in range(5_000)]
+        latencies = [float(r["latency_ms"]) for r in responses]
+        depth = max(int(r["queue_depth"]) for r in responses)
+        print(
+            f"gateway {rate:5.0f}/s: p50 {_pct(latencies, 0.5):8.1f} ms  p99 {_pct(latencies, 0.99):8.1f} ms | "
+            f"max queue depth {depth}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200_000)
+    args = parser.parse_args()
+    run(args.requests)
+
+
+if __name__ == "__main__":
+    main()
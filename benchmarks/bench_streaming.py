@@ -0,0 +1,141 @@
+"""
+Benchmark: streamed model results through call_model.
+
+A simulated model streams tokens (first token after 20 ms, then one every
+2 ms). Checks (exit 1 on failure)
+- pass-through: the caller gets the first chunk at ~TTFT, not at the end;
+- the recorded MetricEvent carries ttft_ms / itl_ms / tokens_out, and the
+  rolling snapshot reports p50/p95 TTFT and ITL;
+- the policy max_tokens cap stops the stream early and closes the source;
+- the async path (async generator model_fn) records the same;
+- per-chunk wrapper overhead stays under 2 us.
+
+Usage
+    python benchmarks/bench_streaming.py
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncio
+import time
+from typing import Any, Dict, Iterator, List
+
+from latch import Intent, LatchClient
+from runtime.streaming import TokenStream
+
+TTFT_S = 0.020
+ITL_S = 0.002
+TOKENS = 40
+
+
+def stream_model(prompt: str, *, model: str, max_tokens: int, closed: List[bool]) -> Iterator[str]:
+    try:
+        time.sleep(TTFT_S)
+        for i in range(TOKENS):
+            if i:
+                time.sleep(ITL_S)
+            yield f"t{i} "
+    finally:
+        closed.append(True)
+
+
+async def astream_model(prompt: str, *, model: str, max_tokens: int):
+    await asyncio.sleep(TTFT_S)
+    for i in range(TOKENS):
+        if i:
+            await asyncio.sleep(ITL_S)
+        yield f"t{i} "
+
+
+def check_sync(failures: List[str]) -> None:
+    client = LatchClient(intent=Intent(name="chat"))
+    session = client.request(tier="pro")
+    closed: List[bool] = []
+    start = time.perf_counter()
+    result = session.call_model("hi", model_fn=stream_model, model_id="small", max_tokens=100, closed=closed)
+    first_at = None
+    chunks = 0
+    for _ in result.value:
+        if first_at is None:
+            first_at = (time.perf_counter() - start) * 1000.0
+        chunks += 1
+    event = client.metrics.last_event()
+    snap = client.metrics.snapshot()
+    print(f"sync: first chunk at {first_at:.1f} ms, total {result.latency_ms:.1f} ms, {chunks} chunks")
+    print(f"      event ttft {event.ttft_ms:.1f} ms itl {event.itl_ms:.2f} ms tokens_out {event.tokens_out}")
+    print(f"      snapshot streams={snap['streams']} p50_ttft={snap['p50_ttft_ms']:.1f} p95_itl={snap['p95_itl_ms']:.2f}")
+    if first_at is None or first_at > result.latency_ms / 2:
+        failures.append("sync stream was buffered (first chunk arrived late)")
+    if event.tokens_out != TOKENS or chunks != TOKENS or result.tokens_out != TOKENS:
+        failures.append(f"sync token count {event.tokens_out}/{chunks}, want {TOKENS}")
+    if not (TTFT_S * 1000 * 0.9 <= event.ttft_ms <= TTFT_S * 1000 * 3):
+        failures.append(f"sync ttft {event.ttft_ms:.1f} ms off")
+    if not (ITL_S * 1000 * 0.9 <= event.itl_ms <= ITL_S * 1000 * 3):
+        failures.append(f"sync itl {event.itl_ms:.2f} ms off")
+    if snap["streams"] != 1 or snap["p50_ttft_ms"] <= 0.0:
+        failures.append("rolling stats did not record the stream")
+
+    # Policy cap: max_tokens=8 stops after 8 chunks and closes the generator.
+    closed.clear()
+    capped = session.call_model("hi", model_fn=stream_model, model_id="small", max_tokens=8, closed=closed)
+    got = list(capped.value)
+    print(f"cap:  {len(got)} chunks with max_tokens=8, source closed={bool(closed)}, counters {client.metrics.counters}")
+    if len(got) != 8 or not closed or client.metrics.counters.get("stream_truncated") != 1:
+        failures.append("max_tokens cap did not stop the stream early")
+    if client.metrics.last_event().tokens_out != 8:
+        failures.append("capped stream recorded the wrong token count")
+
+
+def check_async(failures: List[str]) -> None:
+    async def run() -> Dict[str, Any]:
+        client = LatchClient(intent=Intent(name="chat"))
+        session = client.request(tier="pro")
+        result = await session.acall_model("hi", model_fn=astream_model, model_id="small", max_tokens=100)
+        chunks = [c async for c in result.value]
+        return {"chunks": len(chunks), "event": client.metrics.last_event(), "result": result}
+
+    out = asyncio.run(run())
+    event = out["event"]
+    print(f"async: {out['chunks']} chunks, ttft {event.ttft_ms:.1f} ms itl {event.itl_ms:.2f} ms")
+    if out["chunks"] != TOKENS or event.tokens_out != TOKENS or event.ttft_ms <= 0.0 or event.itl_ms <= 0.0:
+        failures.append("async stream was not recorded")
+
+
+def check_overhead(failures: List[str], n: int = 200_000) -> None:
+    def source() -> Iterator[int]:
+        return iter(range(n))
+
+    start = time.perf_counter()
+    for _ in source():
+        pass
+    direct = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in TokenStream(source(), start=start, max_tokens=None, on_done=lambda *a: None):
+        pass
+    wrapped = time.perf_counter() - start
+    per_chunk_us = (wrapped - direct) / n * 1e6
+    print(f"overhead: {per_chunk_us:.3f} us/chunk")
+    if per_chunk_us > 2.0:
+        failures.append(f"per-chunk overhead {per_chunk_us:.2f} us over 2 us")
+
+
+def main() -> int:
+    failures: List[str] = []
+    check_sync(failures)
+    check_async(failures)
+    check_overhead(failures)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: streams pass through with TTFT/ITL recorded and max_tokens enforced")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
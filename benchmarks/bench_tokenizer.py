@@ -0,0 +1,134 @@
+"""
+Benchmark: cost of accurate prompt token counting on the request path.
+
+Reports, per prompt size:
+- chars/4 (the old estimate), the heuristic tokenizer uncached, and a cache hit;
+- a multi-turn session (the prompt grows every turn): full recount vs the
+  session's incremental count, plus the total SDK overhead per call.
+
+`--check` exits 1 if counting a turn incrementally costs more than
+MAX_INCREMENTAL_SHARE of a full recount (the extra SDK overhead over chars/4,
+so the baseline SDK cost cancels out), or the incremental count drifts more
+than 2% from a full recount. The check is relative on purpose: counting
+cost grows with each turn's new text, so a fixed per-request budget on top
+of the SDK's own overhead only measured the machine. The fixed budget for
+the SDK path itself stays in bench_sdk_overhead.py.
+
+Usage
+    python benchmarks/bench_tokenizer.py
+    python benchmarks/bench_tokenizer.py --check
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sys
+import time
+from typing import Any, Callable, List
+
+from latch import Intent, LatchClient
+from runtime.tokenizer import CachedTokenizer, CharRatioTokenizer, HeuristicTokenizer
+
+TURN = (
+    "User: the deploy failed again, here is the log:\n"
+    "    ERROR 2024-05-01T12:00:03Z worker-7 timeout after 30000ms (retry 3/5)\n"
+    "Assistant: The worker timed out talking to the queue; check `QUEUE_URL` and the VPC rules.\n"
+)
+TURNS = 40
+MAX_INCREMENTAL_SHARE = 0.25
+MAX_DRIFT = 0.02
+
+
+def _best_us(fn: Callable[[], Any], n: int, rounds: int = 5) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / n * 1e6
+
+
+def _model(prompt: str, *, model: str, max_tokens: int) -> dict:
+    return {"tokens_out": 8}
+
+
+def _conversation() -> List[str]:
+    return [TURN * (i + 1) for i in range(TURNS)]
+
+
+def bench_counting() -> None:
+    ratio, heuristic = CharRatioTokenizer(), HeuristicTokenizer()
+    cached = CachedTokenizer(heuristic)
+    print(f"{'chars':>8} {'tokens':>7} {'chars/4':>8} {'heuristic':>10} {'cache hit':>10}   (us/count)")
+    for size in (256, 4096, 32768):
+        text = (TURN * (size // len(TURN) + 1))[:size]
+        cached.count(text)
+        n = max(10, 200_000 // size)
+        print(
+            f"{size:>8} {heuristic.count(text):>7} {_best_us(lambda: ratio.count(text), n):>8.2f} "
+            f"{_best_us(lambda: heuristic.count(text), n):>10.2f} {_best_us(lambda: cached.count(text), n):>10.2f}"
+        )
+
+
+def bench_session() -> tuple:
+    prompts = _conversation()
+    heuristic = HeuristicTokenizer()
+
+    def full_recount() -> None:
+        for p in prompts:
+            heuristic.count(p)
+
+    def session_run(client: LatchClient) -> Callable[[], None]:
+        def run() -> None:
+            session = client.request(tier="pro", metadata={"user_id": "bench"})
+            for p in prompts:
+                session.call_model(p, model_fn=_model, model_id="small")
+
+        return run
+
+    def direct() -> None:
+        for p in prompts:
+            _model(p, model="small", max_tokens=256)
+
+    # A fresh cache per client so growing prompts are never cache hits.
+    incremental = LatchClient(intent=Intent(name="bench"), tokenizer=CachedTokenizer(heuristic, max_entries=1))
+    legacy = LatchClient(intent=Intent(name="bench"), tokenizer=CachedTokenizer(CharRatioTokenizer(), max_entries=1))
+    base_us = _best_us(direct, 20)
+    full_us = _best_us(full_recount, 20) / TURNS
+    inc_us = (_best_us(session_run(incremental), 20) - base_us) / TURNS
+    legacy_us = (_best_us(session_run(legacy), 20) - base_us) / TURNS
+
+    session = incremental.request()
+    drift = 0.0
+    for p in prompts:
+        drift = max(drift, abs(session.count_prompt_tokens(p) - heuristic.count(p)) / heuristic.count(p))
+
+    print(f"\nmulti-turn session ({TURNS} turns, final prompt {len(prompts[-1])} chars)")
+    print(f"{'full recount':>24}: {full_us:7.2f} us/turn (counting only)")
+    print(f"{'sdk, incremental':>24}: {inc_us:7.2f} us/call overhead")
+    print(f"{'sdk, chars/4':>24}: {legacy_us:7.2f} us/call overhead")
+    print(f"{'incremental drift':>24}: {drift * 100:7.2f} %")
+    return max(0.0, inc_us - legacy_us) / full_us, drift
+
+
+def main(argv: list) -> int:
+    bench_counting()
+    share, drift = bench_session()
+    print(f"{'incremental / recount':>24}: {share * 100:7.2f} % (limit {MAX_INCREMENTAL_SHARE:.0%})")
+    if "--check" not in argv:
+        return 0
+    if share > MAX_INCREMENTAL_SHARE or drift > MAX_DRIFT:
+        print(f"FAIL: incremental counting costs {share:.0%} of a recount / drift {drift:.2%}")
+        return 1
+    print("OK: incremental token counting stays a small fraction of a full recount")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
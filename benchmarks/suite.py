@@ -0,0 +1,309 @@
+"""
+Benchmark suite: SDK and control-plane hot paths, with a regression gate.
+
+Cases (all reported as microseconds per operation; lower is better)
+- sdk_call_model_overhead: RequestSession.call_model minus the direct model call
+- decide_policy: one policy decision on a mixed workload
+- record_event: MetricsCollector.record_event
+- rolling_snapshot_w{N}: RollingStats.record + snapshot at window size N
+- demo_agent_handle: end-to-end DemoAgent.handle with the control loop on
+
+The whole set of cases runs `--repeats` times, interleaved, so a slow spell
+on the machine hits every case instead of one. Each repeat keeps a case's
+best round; the reported value is the median over repeats, and the spread
+(max - min over repeats) is stored next to it. A fixed pure-Python
+calibration loop is timed the same way; the gate compares cases relative
+to it.
+
+Results are written as JSON. `--check` compares them against the stored
+baseline (benchmarks/baseline.json) and exits 1 if any case is slower than
+baseline by more than the allowed percentage (`--max-regression`, or
+LATCH_BENCH_MAX_REGRESSION, default 30) AND by more than its noise floor:
+the larger of the case's fixed floor (NOISE_FLOOR_US) and the spread seen
+in the baseline run. Sub-microsecond jitter on a fast case is therefore
+never a regression. Baselines are machine-specific: refresh with
+`--update-baseline` on the machine that runs the gate.
+
+Usage
+    python benchmarks/suite.py                       # run, write benchmarks/results.json
+    python benchmarks/suite.py --check               # ... and gate against the baseline
+    python benchmarks/suite.py --update-baseline     # store this run as the baseline
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from control_plane.config import load_intents
+from control_plane.policy_engine import decide_policy
+from latch import Intent, LatchClient
+from latch.types import RequestContext, Signals
+from metrics.collector import MetricsCollector
+from metrics.rolling_stats import RollingStats
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+RESULTS_PATH = BENCH_DIR / "results.json"
+SCHEMA_VERSION = 1
+CALIBRATION = "calibration"
+
+PROMPT = "Summarize the following ticket. " * 8
+
+# Absolute slowdown (us/op) a case must exceed before a percentage regression
+# counts; below it the difference is scheduler / allocator noise.
+NOISE_FLOOR_US: Dict[str, float] = {
+    "sdk_call_model_overhead": 5.0,
+    "decide_policy": 0.5,
+    "record_event": 2.0,
+    "rolling_snapshot_w256": 10.0,
+    "rolling_snapshot_w4096": 10.0,
+    "rolling_snapshot_w65536": 10.0,
+    "demo_agent_handle": 10.0,
+}
+
+
+def _best_us_per_op(fn: Callable[[], Any], n: int, rounds: int, ops_per_call: int = 1) -> float:
+    best = float("inf")
+    # Like timeit: keep collector pauses out of the measurement.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(n):
+                fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best / (n * ops_per_call) * 1e6
+
+
+def _calibration_loop() -> None:
+    # Fixed pure-Python work (dict/attribute/arithmetic mix) used to normalise for machine speed.
+    acc = {"n": 0}
+    for i in range(200):
+        acc["n"] = (acc["n"] + i * 31) % 1009
+
+
+def bench_calibration(n: int, rounds: int) -> float:
+    return _best_us_per_op(_calibration_loop, n, rounds)
+
+
+def _noop_model(prompt: str, *, model: str, max_tokens: int) -> dict:
+    return {"tokens_out": 8}
+
+
+def bench_sdk_overhead(n: int, rounds: int) -> float:
+    client = LatchClient(intent=Intent(name="bench", max_latency_ms=1000))
+    session = client.request(tier="pro", metadata={"user_id": "bench"})
+    wrapped = _best_us_per_op(lambda: session.call_model(PROMPT, model_fn=_noop_model, model_id="small"), n, rounds)
+    direct = _best_us_per_op(lambda: _noop_model(PROMPT, model="small", max_tokens=256), n, rounds)
+    return max(0.0, wrapped - direct)
+
+
+def _policy_workload(n: int = 1024) -> List[Tuple[Intent, Signals, RequestContext]]:
+    intents = list(load_intents().values())
+    signals = [Signals(), Signals(p95_latency_ms=900.0), Signals(queue_depth=3.0, cost_rate=0.001)]
+    out = []
+    for i in range(n):
+        ctx = RequestContext(
+            user_id="u",
+            trace_id=str(i),
+            prompt_tokens=64 + (i * 97) % 2048,
+            tier="free" if i % 3 else "pro",
+            is_background=i % 4 == 0,
+        )
+        out.append((intents[i % len(intents)], signals[i % len(signals)], ctx))
+    return out
+
+
+def bench_decide_policy(n: int, rounds: int) -> float:
+    work = _policy_workload()
+
+    def sweep() -> None:
+        for intent, signals, ctx in work:
+            decide_policy(intent, signals, ctx)
+
+    return _best_us_per_op(sweep, max(1, n // len(work)), rounds, ops_per_call=len(work))
+
+
+def bench_record_event(n: int, rounds: int) -> float:
+    metrics = MetricsCollector()
+    rng = random.Random(3)
+    latencies = [rng.lognormvariate(5.0, 0.8) for _ in range(1024)]
+    now = time.time()
+    i = 0
+
+    def one() -> None:
+        nonlocal i
+        i = (i + 1) & 1023
+        metrics.record_event(
+            latencies[i], tokens_in=128, tokens_out=32, error_type=None, request_type="user", model_id="m", ts=now
+        )
+
+    return _best_us_per_op(one, n, rounds)
+
+
+def bench_rolling_snapshot(window: int, n: int, rounds: int) -> float:
+    stats = RollingStats(window)
+    rng = random.Random(5)
+    for _ in range(window):
+        stats.record(True, rng.lognormvariate(5.0, 0.8), 0.001, 1.0)
+
+    def one() -> None:
+        # One record per read so no cached state is reused.
+        stats.record(True, 150.0, 0.001, 1.0)
+        stats.snapshot()
+
+    return _best_us_per_op(one, n, rounds)
+
+
+def bench_demo_agent(n: int, rounds: int) -> float:
+    from demo.demo_agent import DemoAgent
+    from demo.traffic_simulator import generate_traffic
+
+    agent = DemoAgent()
+    traffic = list(generate_traffic())
+    i = 0
+
+    def one() -> None:
+        nonlocal i
+        i = (i + 1) % len(traffic)
+        intent, ctx = traffic[i]
+        agent.handle(intent, ctx, True)
+
+    return _best_us_per_op(one, n, rounds)
+
+
+def run_once(quick: bool = False) -> Dict[str, float]:
+    # Short rounds: the best of them filters out scheduler noise within a repeat.
+    scale = 10 if quick else 2
+    rounds = 3 if quick else 5
+    calibration_before = bench_calibration(2000 // scale, rounds)
+    results: Dict[str, float] = {
+        "sdk_call_model_overhead": bench_sdk_overhead(5000 // scale, rounds),
+        "decide_policy": bench_decide_policy(50_000 // scale, rounds),
+        "record_event": bench_record_event(50_000 // scale, rounds),
+    }
+    for window in (256, 4096, 65536):
+        results[f"rolling_snapshot_w{window}"] = bench_rolling_snapshot(window, 2000 // scale, rounds)
+    results["demo_agent_handle"] = bench_demo_agent(5000 // scale, rounds)
+    results[CALIBRATION] = (calibration_before + bench_calibration(2000 // scale, rounds)) / 2.0
+    return results
+
+
+def run(quick: bool = False, repeats: int = 5) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """(median us/op per case, spread per case) over `repeats` interleaved runs."""
+    runs = [run_once(quick) for _ in range(max(1, repeats))]
+    medians = {name: statistics.median(r[name] for r in runs) for name in runs[0]}
+    spreads = {name: max(r[name] for r in runs) - min(r[name] for r in runs) for name in runs[0]}
+    return medians, spreads
+
+
+def to_json(results: Dict[str, float], spreads: Dict[str, float], repeats: int) -> Dict[str, Any]:
+    return {
+        "schema": SCHEMA_VERSION,
+        "unit": "us/op",
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "repeats": repeats,
+        "results": {name: round(value, 4) for name, value in results.items()},
+        "spread": {name: round(value, 4) for name, value in spreads.items()},
+    }
+
+
+def compare(
+    current: Dict[str, float],
+    baseline: Dict[str, float],
+    max_regression_pct: float,
+    baseline_spread: Optional[Dict[str, float]] = None,
+) -> List[str]:
+    """
+    Names of cases slower than baseline by more than `max_regression_pct`
+    and by more than their noise floor (NOISE_FLOOR_US or the baseline's
+    spread, whichever is larger).
+
+    When both runs carry a calibration time, cases are compared in units of
+    it, so a machine that is uniformly slower today does not fail the gate.
+    """
+    failed = []
+    speed = 1.0
+    if current.get(CALIBRATION, 0) > 0 and baseline.get(CALIBRATION, 0) > 0:
+        speed = current[CALIBRATION] / baseline[CALIBRATION]
+        print(f"{'machine speed vs baseline':>26}: {1.0 / speed:10.2f}x")
+    spread = baseline_spread or {}
+    for name, base in baseline.items():
+        now = current.get(name)
+        if name == CALIBRATION or now is None or base <= 0:
+            continue
+        delta = now / speed - base
+        change = delta / base * 100.0
+        floor = max(NOISE_FLOOR_US.get(name, 0.0), spread.get(name, 0.0))
+        regressed = change > max_regression_pct and delta > floor
+        flag = "REGRESSION" if regressed else "ok"
+        print(f"{name:>26}: {now:10.3f} us  (baseline {base:10.3f}, {change:+6.1f}%, floor {floor:.2f})  {flag}")
+        if regressed:
+            failed.append(name)
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the hot-path benchmark suite.")
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--check", action="store_true", help="fail on regressions against the baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=float(os.environ.get("LATCH_BENCH_MAX_REGRESSION", "30")),
+        help="allowed slowdown vs baseline, in percent",
+    )
+    parser.add_argument("--quick", action="store_true", help="fewer iterations (smoke run)")
+    parser.add_argument("--repeats", type=int, default=None, help="interleaved runs to take the median of")
+    args = parser.parse_args(argv)
+
+    repeats = args.repeats if args.repeats is not None else (1 if args.quick else 5)
+    results, spreads = run(quick=args.quick, repeats=repeats)
+    payload = to_json(results, spreads, repeats)
+    args.output.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline updated: {args.baseline}")
+
+    if not args.check:
+        for name, value in results.items():
+            print(f"{name:>26}: {value:10.3f} us/op")
+        return 0
+    if not args.baseline.exists():
+        print(f"FAIL: no baseline at {args.baseline} (run with --update-baseline)")
+        return 1
+    stored = json.loads(args.baseline.read_text(encoding="utf-8"))
+    failed = compare(results, stored["results"], args.max_regression, stored.get("spread"))
+    if failed:
+        print(f"FAIL: regressed more than {args.max_regression:.0f}%: {', '.join(failed)}")
+        return 1
+    print(f"OK: no case regressed more than {args.max_regression:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
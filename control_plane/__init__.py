@@ -1,13 +1,21 @@
 from .intents import Intent
+from .config import PolicyConfig
 from .policy_engine import PolicyEngine
 from .decision_engine import DecisionEngine
 from .translator import Translator
-from .feedback_loop import FeedbackLoop
+from .feedback_loop import ControllerConfig, FeedbackController, FeedbackLoop
+from .latency_model import LatencyModel
+from .intent_registry import IntentRegistry
 
 __all__ = [
     "Intent",
+    "PolicyConfig",
     "PolicyEngine",
     "DecisionEngine",
     "Translator",
     "FeedbackLoop",
+    "FeedbackController",
+    "ControllerConfig",
+    "LatencyModel",
+    "IntentRegistry",
 ]
@@ -0,0 +1,219 @@
+"""
+Config Loading (MVP)
+
+Purpose
+- Load `configs/policies.yaml` and `configs/default_intents.yaml` into small,
+  typed, immutable objects the control plane can compile once.
+
+Hard constraints for MVP
+- PyYAML is used when installed; otherwise a minimal parser handles the
+  subset our configs use (nested mappings, block lists, inline `[]`, scalars).
+- Loading happens at startup / reload time, never on the request path.
+
+Non-goals
+- Not a general policy language.
+- Not full YAML.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
+
+from latch.types import Intent
+
+try:  # Optional dependency.
+    import yaml as _yaml
+except ImportError:  # pragma: no cover - depends on environment
+    _yaml = None
+
+CONFIG_DIR = Path(__file__).resolve().parents[1] / "configs"
+DEFAULT_POLICIES_PATH = CONFIG_DIR / "policies.yaml"
+DEFAULT_INTENTS_PATH = CONFIG_DIR / "default_intents.yaml"
+
+PathLike = Union[str, Path]
+
+
+@dataclass(frozen=True)
+class PolicyConfig:
+    """Thresholds and token caps for the policy rules (defaults match the built-in rules)."""
+
+    blocked_intents: FrozenSet[str] = frozenset()
+    error_rate_hot: float = 0.05
+    queue_depth_hot: float = 8.0
+    latency_priority_max_latency_ms: int = 400
+    latency_priority_min_priority: int = 8
+    system_hot_max_tokens: int = 128
+    latency_hot_max_tokens: int = 256
+    cost_hot_max_tokens: int = 192
+    latency_priority_min_tokens: int = 256
+    free_tier_max_tokens: int = 256
+    default_max_tokens: int = 512
+    # With a latency model: cap max_tokens so predicted latency stays under
+    # this fraction of intent.max_latency_ms (never below predicted_min_tokens).
+    predicted_latency_headroom: float = 0.9
+    predicted_min_tokens: int = 32
+    free_tiers: FrozenSet[str] = field(default_factory=lambda: frozenset({"free"}))
+
+
+def load_yaml(path: PathLike) -> Dict[str, Any]:
+    text = Path(path).read_text(encoding="utf-8")
+    if _yaml is not None:
+        data = _yaml.safe_load(text)
+    else:
+        data = parse_simple_yaml(text)
+    return data or {}
+
+
+def load_policy_config(path: Optional[PathLike] = None) -> PolicyConfig:
+    data = load_yaml(path or DEFAULT_POLICIES_PATH)
+    thresholds = data.get("thresholds") or {}
+    caps = data.get("max_tokens") or {}
+    base = PolicyConfig()
+    return PolicyConfig(
+        blocked_intents=frozenset(str(n) for n in (data.get("blocked_intents") or [])),
+        error_rate_hot=float(thresholds.get("error_rate", base.error_rate_hot)),
+        queue_depth_hot=float(thresholds.get("queue_depth", base.queue_depth_hot)),
+        latency_priority_max_latency_ms=int(
+            thresholds.get("latency_priority_max_latency_ms", base.latency_priority_max_latency_ms)
+        ),
+        latency_priority_min_priority=int(
+            thresholds.get("latency_priority_min_priority", base.latency_priority_min_priority)
+        ),
+        system_hot_max_tokens=int(caps.get("system_hot", base.system_hot_max_tokens)),
+        latency_hot_max_tokens=int(caps.get("latency_hot", base.latency_hot_max_tokens)),
+        cost_hot_max_tokens=int(caps.get("cost_hot", base.cost_hot_max_tokens)),
+        latency_priority_min_tokens=int(caps.get("latency_priority_floor", base.latency_priority_min_tokens)),
+        free_tier_max_tokens=int(caps.get("free_tier", base.free_tier_max_tokens)),
+        default_max_tokens=int(caps.get("default", base.default_max_tokens)),
+        predicted_latency_headroom=float(
+            thresholds.get("predicted_latency_headroom", base.predicted_latency_headroom)
+        ),
+        predicted_min_tokens=int(caps.get("predicted_floor", base.predicted_min_tokens)),
+        free_tiers=frozenset(str(t) for t in (data.get("free_tiers") or sorted(base.free_tiers))),
+    )
+
+
+def intent_from_dict(raw: Dict[str, Any]) -> Intent:
+    base = Intent(name=str(raw["name"]))
+    return Intent(
+        name=str(raw["name"]),
+        priority=int(raw.get("priority", base.priority)),
+        max_latency_ms=int(raw.get("max_latency_ms", base.max_latency_ms)),
+        max_cost=float(raw.get("max_cost", base.max_cost)),
+        constraints=[str(c) for c in (raw.get("constraints") or [])],
+        params={str(k): str(v) for k, v in (raw.get("params") or {}).items()},
+    )
+
+
+def load_intents(path: Optional[PathLike] = None) -> Dict[str, Intent]:
+    """Load intents keyed by name, in file order."""
+    data = load_yaml(path or DEFAULT_INTENTS_PATH)
+    return {intent.name: intent for intent in (intent_from_dict(raw) for raw in data.get("intents") or [])}
+
+
+# -- minimal YAML subset (fallback when PyYAML is unavailable) ---------------
+
+
+def parse_simple_yaml(text: str) -> Any:
+    lines: List[Tuple[int, str]] = []
+    for raw in text.splitlines():
+        content = _strip_comment(raw).rstrip()
+        if not content.strip():
+            continue
+        indent = len(content) - len(content.lstrip(" "))
+        lines.append((indent, content.strip()))
+    if not lines:
+        return None
+    value, _ = _parse_block(lines, 0, lines[0][0])
+    return value
+
+
+def _strip_comment(line: str) -> str:
+    if line.lstrip().startswith("#"):
+        return ""
+    quote = ""
+    for i, ch in enumerate(line):
+        if ch in "'\"":
+            quote = "" if quote == ch else (quote or ch)
+        elif ch == "#" and not quote and (i == 0 or line[i - 1] == " "):
+            return line[:i]
+    return line
+
+
+def _parse_block(lines: List[Tuple[int, str]], i: int, indent: int) -> Tuple[Any, int]:
+    if lines[i][1].startswith("- ") or lines[i][1] == "-":
+        return _parse_list(lines, i, indent)
+    return _parse_mapping(lines, i, indent)
+
+
+def _parse_list(lines: List[Tuple[int, str]], i: int, indent: int) -> Tuple[List[Any], int]:
+    out: List[Any] = []
+    while i < len(lines) and lines[i][0] == indent and (lines[i][1].startswith("- ") or lines[i][1] == "-"):
+        item = lines[i][1][1:].strip()
+        if not item:
+            if i + 1 < len(lines) and lines[i + 1][0] > indent:
+                value, i = _parse_block(lines, i + 1, lines[i + 1][0])
+                out.append(value)
+            else:
+                out.append(None)
+                i += 1
+        elif _is_mapping_entry(item):
+            # "- key: value" starts a mapping whose keys sit two columns in.
+            lines = lines[:i] + [(indent + 2, item)] + lines[i + 1 :]
+            value, i = _parse_mapping(lines, i, indent + 2)
+            out.append(value)
+        else:
+            out.append(_parse_scalar(item))
+            i += 1
+    return out, i
+
+
+def _parse_mapping(lines: List[Tuple[int, str]], i: int, indent: int) -> Tuple[Dict[str, Any], int]:
+    out: Dict[str, Any] = {}
+    while i < len(lines) and lines[i][0] == indent and not lines[i][1].startswith("- "):
+        key, _, rest = lines[i][1].partition(":")
+        key = key.strip().strip("'\"")
+        i += 1
+        if rest.strip():
+            out[key] = _parse_scalar(rest)
+        elif i < len(lines) and (
+            lines[i][0] > indent or (lines[i][0] == indent and lines[i][1].startswith("- "))
+        ):
+            out[key], i = _parse_block(lines, i, lines[i][0])
+        else:
+            out[key] = None
+    return out, i
+
+
+def _is_mapping_entry(item: str) -> bool:
+    if item[0] in "'\"[{":
+        return False
+    key, sep, rest = item.partition(":")
+    return bool(sep) and (not rest or rest.startswith(" "))
+
+
+def _parse_scalar(raw: str) -> Any:
+    s = raw.strip()
+    if s in ("", "~", "null"):
+        return None
+    if s == "[]":
+        return []
+    if s == "{}":
+        return {}
+    if s.startswith("[") and s.endswith("]"):
+        return [_parse_scalar(part) for part in s[1:-1].split(",") if part.strip()]
+    if len(s) >= 2 and s[0] in "'\"" and s[-1] == s[0]:
+        return s[1:-1]
+    low = s.lower()
+    if low in ("true", "yes"):
+        return True
+    if low in ("false", "no"):
+        return False
+    for cast in (int, float):
+        try:
+            return cast(s)
+        except ValueError:
+            pass
+    return s
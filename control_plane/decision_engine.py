@@ -7,6 +7,11 @@ This module decides WHAT should happen given:
 
 Outputs:
 - high-level actions: model_choice, max_tokens, context_strategy, priority_hint
+- with a ModelRouter (see `router.py`): the model to call, picked per request
+  as the cheapest one predicted to meet the intent's latency and cost
+- with a LatencyModel (see `latency_model.py`): the predicted latency of the
+  call at the policy's max_tokens; a predicted miss on a plain "allow" is
+  routed fast instead
 
 MUST NOT:
 - implement observability dashboards
@@ -18,7 +23,10 @@ Keep it rules-first and deterministic for MVP.
 """
 
 from dataclasses import dataclass
+from typing import Any, Optional
+
 from .intents import Intent
+from .router import ModelRouter
 from latch.types import Policy
 
 
@@ -28,14 +36,41 @@ class Decision:
     action: str
     reason: str
     mode: str
+    model_id: str = ""  # set when a router picked the model
+    predicted_latency_ms: Optional[float] = None  # set when a latency model is warm for the model
 
 
 class DecisionEngine:
-    def decide(self, intent: Intent, policy: Policy) -> Decision:
+    def __init__(self, router: Optional[ModelRouter] = None, latency_model: Optional[Any] = None) -> None:
+        self.router = router
+        self.latency_model = latency_model
+
+    def decide(
+        self,
+        intent: Intent,
+        policy: Policy,
+        prompt_tokens: int = 0,
+        model_id: str = "",
+        queue_depth: float = 0.0,
+    ) -> Decision:
         if policy.max_tokens <= 0:
             return Decision(False, "deny", policy.notes, policy.mode)
         if intent.priority >= 8:
             return Decision(True, "escalate", "high_priority", policy.mode)
+        if self.router is not None:
+            route = self.router.route(intent, prompt_tokens, policy.max_tokens)
+            predicted = self._predict(route.model_id, prompt_tokens, policy.max_tokens, queue_depth)
+            return Decision(
+                True, route.action, f"{policy.notes}:{route.reason}", policy.mode, route.model_id, predicted
+            )
+        predicted = self._predict(model_id, prompt_tokens, policy.max_tokens, queue_depth)
         if policy.priority == "latency":
-            return Decision(True, "route_fast", policy.notes, policy.mode)
-        return Decision(True, "allow", policy.notes, policy.mode)
+            return Decision(True, "route_fast", policy.notes, policy.mode, predicted_latency_ms=predicted)
+        if predicted is not None and predicted > intent.max_latency_ms:
+            return Decision(True, "route_fast", "predicted_latency", policy.mode, predicted_latency_ms=predicted)
+        return Decision(True, "allow", policy.notes, policy.mode, predicted_latency_ms=predicted)
+
+    def _predict(self, model_id: str, prompt_tokens: int, max_tokens: int, queue_depth: float) -> Optional[float]:
+        if self.latency_model is None or not model_id:
+            return None
+        return self.latency_model.predict(model_id, prompt_tokens, max_tokens, queue_depth)
@@ -15,6 +15,17 @@ Outputs
   - recommended_mode: optional ("degraded" | "normal")
   - notes: short reason string for logs/tests
 
+Closed loop (`FeedbackController`)
+- AIMD on two knobs, driven by windowed p95 vs the intent's max_latency_ms:
+  the token cap (applied to policies) and the admission concurrency cap.
+  - p95 above target: multiply both by `decrease_factor` (at most once per
+    `cooldown_s`, so the queue gets time to drain before the next cut).
+  - p95 below `headroom` * target and out of cooldown: add one step each.
+  - In between (the hysteresis band): hold.
+- Mode: "degraded" after `degrade_after` consecutive overloaded windows,
+  back to "normal" after `recover_after` consecutive healthy ones; the
+  transition is reported once as `recommended_mode`.
+
 Hard constraints for MVP
 - Must be lightweight; no heavy analytics.
 - No dashboards; only structured logs/records.
@@ -25,7 +36,11 @@ Non-goals
 - Not anomaly detection platform.
 """
 
-from typing import Dict
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from latch.types import Intent, Policy, Signals
 
 
 class FeedbackLoop:
@@ -43,3 +58,124 @@ class FeedbackLoop:
         ok = self.verify(outcome)
         outcome["slo_ok"] = "true" if ok else "false"
         return outcome
+
+
+@dataclass(frozen=True)
+class ControllerConfig:
+    min_tokens: int = 64
+    max_tokens: int = 512
+    tokens_step: int = 16
+    min_concurrency: int = 4
+    max_concurrency: int = 64
+    concurrency_step: int = 1
+    decrease_factor: float = 0.7
+    headroom: float = 0.8
+    cooldown_s: float = 5.0
+    degrade_after: int = 3
+    recover_after: int = 10
+
+
+@dataclass(frozen=True)
+class Feedback:
+    outcome: str  # "improved" | "worse" | "no_change"
+    recommended_mode: Optional[str]  # set only on a transition
+    notes: str
+    max_tokens: int
+    concurrency_cap: int
+
+
+class FeedbackController:
+    def __init__(
+        self,
+        target_latency_ms: float,
+        config: Optional[ControllerConfig] = None,
+        *,
+        admission: Optional[Any] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        `admission` (a runtime AdmissionController) gets every concurrency
+        change via `set_concurrency_cap`. Caps start at their maximum.
+        """
+        self.target_latency_ms = float(target_latency_ms)
+        self.config = config or ControllerConfig()
+        self.admission = admission
+        self._clock = clock
+        self.max_tokens = self.config.max_tokens
+        self.concurrency_cap = self.config.max_concurrency
+        self.mode = "normal"
+        self._last_p95: Optional[float] = None
+        self._last_decrease = float("-inf")
+        self._hot = 0
+        self._healthy = 0
+        self._applied: Dict[Tuple[Policy, int, str], Policy] = {}
+        self._push_concurrency()
+
+    @classmethod
+    def for_intent(cls, intent: Intent, config: Optional[ControllerConfig] = None, **kwargs: Any) -> "FeedbackController":
+        return cls(intent.max_latency_ms, config, **kwargs)
+
+    def update(self, signals: Signals, now: Optional[float] = None) -> Feedback:
+        """One control step on a fresh windowed snapshot."""
+        cfg = self.config
+        now = self._clock() if now is None else now
+        p95 = signals.p95_latency_ms
+        target = self.target_latency_ms
+
+        if p95 > target:
+            self._hot += 1
+            self._healthy = 0
+            if now - self._last_decrease >= cfg.cooldown_s:
+                self._last_decrease = now
+                self.max_tokens = max(cfg.min_tokens, int(self.max_tokens * cfg.decrease_factor))
+                self.concurrency_cap = max(cfg.min_concurrency, int(self.concurrency_cap * cfg.decrease_factor))
+                notes = "decrease"
+            else:
+                notes = "cooldown"
+        elif p95 < target * cfg.headroom:
+            self._healthy += 1
+            self._hot = 0
+            if now - self._last_decrease >= cfg.cooldown_s:
+                self.max_tokens = min(cfg.max_tokens, self.max_tokens + cfg.tokens_step)
+                self.concurrency_cap = min(cfg.max_concurrency, self.concurrency_cap + cfg.concurrency_step)
+                notes = "increase"
+            else:
+                notes = "cooldown"
+        else:
+            self._hot = 0
+            self._healthy = 0
+            notes = "hold"
+        self._push_concurrency()
+
+        recommended: Optional[str] = None
+        if self.mode == "normal" and self._hot >= cfg.degrade_after:
+            self.mode = recommended = "degraded"
+        elif self.mode == "degraded" and self._healthy >= cfg.recover_after:
+            self.mode = recommended = "normal"
+
+        last, self._last_p95 = self._last_p95, p95
+        if last is None or abs(p95 - last) <= 0.05 * max(last, 1.0):
+            outcome = "no_change"
+        else:
+            outcome = "improved" if p95 < last else "worse"
+        return Feedback(outcome, recommended, notes, self.max_tokens, self.concurrency_cap)
+
+    def apply(self, policy: Policy) -> Policy:
+        """`policy` with the controller's token cap and mode (denials pass through)."""
+        if policy.max_tokens <= 0:
+            return policy
+        key = (policy, self.max_tokens, self.mode)
+        out = self._applied.get(key)
+        if out is None:
+            out = policy
+            if policy.max_tokens > self.max_tokens or (self.mode == "degraded" and policy.mode != "degraded"):
+                mode = "degraded" if self.mode == "degraded" else policy.mode
+                out = replace(policy, max_tokens=min(policy.max_tokens, self.max_tokens), mode=mode)
+            if len(self._applied) >= 4096:
+                self._applied.clear()
+            self._applied[key] = out
+        return out
+
+    def _push_concurrency(self) -> None:
+        if self.admission is not None:
+            self.admission.set_concurrency_cap(self.concurrency_cap)
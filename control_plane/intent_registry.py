@@ -0,0 +1,189 @@
+"""
+Intent Registry (MVP)
+
+Purpose
+- Serve intents from `configs/default_intents.yaml` (plus the policy rules
+  from `configs/policies.yaml`) by name, and pick up edits to either file
+  without a restart so limits can be retuned in production.
+
+Design
+- Each load builds an immutable IntentSnapshot: a read-only name -> Intent
+  map, the frozenset of denied names (`blocked_intents` plus intents with
+  the "deny" constraint) and a PolicyEngine compiled from that snapshot's
+  policy config.
+- Reloads are copy-on-write: a new snapshot is built off to the side and
+  published with a single reference assignment. Readers grab `snapshot`
+  once and never lock; only reloads serialize on a lock.
+- `check()` compares file (mtime_ns, size) stamps and reloads on change;
+  `start(interval_s)` runs it on a daemon thread. A config that fails to
+  load, or a file that cannot be stat'ed, keeps the current snapshot and
+  bumps `intent_registry_reload_failed` once per bad edit or outage; the
+  next change is tried again.
+
+Hard constraints for MVP
+- Stdlib only (PyYAML used if installed, see `config.py`); mtime polling,
+  no inotify.
+
+Non-goals
+- No per-tenant intents, no remote config store.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, FrozenSet, Mapping, Optional, Tuple
+
+from latch.types import Intent
+from metrics.periodic import PeriodicTask
+
+from .config import DEFAULT_INTENTS_PATH, DEFAULT_POLICIES_PATH, PathLike, load_intents, load_policy_config
+from .policy_engine import PolicyEngine
+
+# (mtime_ns, size) per watched file.
+Stamps = Tuple[Tuple[int, int], Tuple[int, int]]
+# Stands in for the stamps while a file cannot be stat'ed.
+_UNREADABLE: Stamps = ((-1, -1), (-1, -1))
+
+
+@dataclass(frozen=True)
+class IntentSnapshot:
+    version: int
+    intents: Mapping[str, Intent]
+    denied: FrozenSet[str]
+    engine: PolicyEngine
+    stamps: Stamps
+
+    def get(self, name: str) -> Optional[Intent]:
+        return self.intents.get(name)
+
+    def is_denied(self, name: str) -> bool:
+        return name in self.denied
+
+
+class IntentRegistry:
+    def __init__(
+        self,
+        intents_path: Optional[PathLike] = None,
+        policies_path: Optional[PathLike] = None,
+        *,
+        latency_model: Optional[Any] = None,
+        metrics: Optional[Any] = None,
+    ) -> None:
+        """
+        Loads both files immediately (errors propagate). `latency_model` is
+        handed to every compiled PolicyEngine (see `latency_model.py`).
+        """
+        self.intents_path = Path(intents_path or DEFAULT_INTENTS_PATH)
+        self.policies_path = Path(policies_path or DEFAULT_POLICIES_PATH)
+        self.latency_model = latency_model
+        self.metrics = metrics
+        self.last_error: Optional[Exception] = None
+        self._failed_stamps: Optional[Stamps] = None
+        self._reload_lock = threading.Lock()
+        self._watcher = PeriodicTask("latch-intent-registry", self.check)
+        self._snapshot = self._build(self._stamps(), 1)
+
+    # -- readers (lock-free) ---------------------------------------------------------
+
+    @property
+    def snapshot(self) -> IntentSnapshot:
+        return self._snapshot
+
+    def get(self, name: str) -> Optional[Intent]:
+        return self._snapshot.intents.get(name)
+
+    def __getitem__(self, name: str) -> Intent:
+        intent = self._snapshot.intents.get(name)
+        if intent is None:
+            raise KeyError(f"unknown intent {name!r}")
+        return intent
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._snapshot.intents
+
+    def is_denied(self, name: str) -> bool:
+        return name in self._snapshot.denied
+
+    # -- reloading -------------------------------------------------------------------
+
+    def _stamps(self) -> Stamps:
+        a = os.stat(self.intents_path)
+        b = os.stat(self.policies_path)
+        return (a.st_mtime_ns, a.st_size), (b.st_mtime_ns, b.st_size)
+
+    def _build(self, stamps: Stamps, version: int) -> IntentSnapshot:
+        # Stamps are taken before reading, so an edit landing mid-load is seen by the next check.
+        intents = load_intents(self.intents_path)
+        config = load_policy_config(self.policies_path)
+        denied = config.blocked_intents | frozenset(n for n, i in intents.items() if "deny" in i.constraints)
+        return IntentSnapshot(
+            version=version,
+            intents=MappingProxyType(intents),
+            denied=denied,
+            engine=PolicyEngine(config, latency_model=self.latency_model),
+            stamps=stamps,
+        )
+
+    def check(self) -> bool:
+        """Reload if either file changed since the current snapshot; True if a new one was published."""
+        try:
+            stamps = self._stamps()
+        except OSError as exc:
+            self._unreadable(exc, count=self._failed_stamps != _UNREADABLE)
+            return False
+        if stamps == self._snapshot.stamps or stamps == self._failed_stamps:
+            return False
+        return self._reload(stamps)
+
+    def reload(self) -> bool:
+        """Reload unconditionally; True if a new snapshot was published."""
+        try:
+            stamps = self._stamps()
+        except OSError as exc:
+            self._unreadable(exc, count=True)
+            return False
+        return self._reload(stamps)
+
+    def _reload(self, stamps: Stamps) -> bool:
+        with self._reload_lock:
+            current = self._snapshot
+            try:
+                snapshot = self._build(stamps, current.version + 1)
+            except Exception as exc:  # a bad edit must not take down readers or the watcher
+                self._failed_stamps = stamps
+                self._failed(exc)
+                return False
+            self._snapshot = snapshot
+            self._failed_stamps = None
+            self.last_error = None
+        self._incr("intent_registry_reload")
+        return True
+
+    def _unreadable(self, exc: OSError, *, count: bool) -> None:
+        with self._reload_lock:
+            self._failed_stamps = _UNREADABLE
+        if count:
+            self._failed(exc)
+        else:
+            self.last_error = exc
+
+    def _failed(self, exc: Exception) -> None:
+        self.last_error = exc
+        self._incr("intent_registry_reload_failed")
+
+    def _incr(self, name: str) -> None:
+        if self.metrics is not None:
+            self.metrics.incr(name)
+
+    # -- background watching -----------------------------------------------------------
+
+    def start(self, interval_s: float = 1.0) -> None:
+        """Check file mtimes on a daemon thread every `interval_s`."""
+        self._watcher.start(interval_s)
+
+    def stop(self) -> None:
+        self._watcher.stop()
@@ -0,0 +1,196 @@
+"""
+Online Latency Model (MVP)
+
+Purpose
+- Predict a request's latency before it is sent, per model_id, so policies
+  can cap max_tokens before the SLO is breached instead of reacting to p95
+  afterwards.
+
+Model
+- latency_ms ~ w0 + w1 * prompt_tokens + w2 * tokens_out + w3 * queue_depth,
+  one linear model per model_id, fitted by recursive least squares with a
+  forgetting factor (`forgetting`, ~1/(1 - forgetting) events of memory) so
+  it tracks drift. Features are scaled to similar magnitudes; P is clamped
+  so directions that never vary (e.g. queue_depth always 0) cannot wind up.
+- Predictions need `min_samples` updates for that model; before that every
+  query returns None and callers keep their rule-based behaviour.
+
+Off the request path
+- `offer(row)` (called by MetricsCollector for every successful event) is a
+  deque append; it never fits on the caller's thread. Updates run on a
+  daemon thread every `interval_s`, started by the first offer (or by
+  `start()`). With `interval_s=None` nothing is started and the owner calls
+  `update()` itself.
+- Coefficients are published as an immutable tuple per model; readers
+  (`predict`, `max_tokens_for`) never lock.
+
+Hard constraints for MVP
+- Stdlib only; 4 features, O(16) work per update.
+
+Non-goals
+- No non-linear models, no per-tenant fits.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from metrics.periodic import PeriodicTask
+
+# Feature scales: prompt tokens / 1000, output tokens / 100, queue depth / 10.
+_SCALES = (1.0, 1e-3, 1e-2, 1e-1)
+_DIM = len(_SCALES)
+
+# (coefficients in raw units, samples)
+Coefficients = Tuple[Tuple[float, float, float, float], int]
+
+
+class _RLS:
+    __slots__ = ("theta", "P", "n")
+
+    def __init__(self, delta: float) -> None:
+        self.theta = [0.0] * _DIM
+        self.P = [[delta if i == j else 0.0 for j in range(_DIM)] for i in range(_DIM)]
+        self.n = 0
+
+    def update(self, x: List[float], y: float, lam: float, max_trace: float) -> None:
+        P = self.P
+        Px = [sum(P[i][j] * x[j] for j in range(_DIM)) for i in range(_DIM)]
+        denom = lam + sum(x[i] * Px[i] for i in range(_DIM))
+        k = [v / denom for v in Px]
+        err = y - sum(self.theta[i] * x[i] for i in range(_DIM))
+        for i in range(_DIM):
+            self.theta[i] += k[i] * err
+        inv = 1.0 / lam
+        for i in range(_DIM):
+            row = P[i]
+            ki = k[i]
+            for j in range(_DIM):
+                row[j] = (row[j] - ki * Px[j]) * inv
+        trace = sum(P[i][i] for i in range(_DIM))
+        if trace > max_trace:
+            scale = max_trace / trace
+            for row in P:
+                for j in range(_DIM):
+                    row[j] *= scale
+        self.n += 1
+
+
+class LatencyModel:
+    def __init__(
+        self,
+        *,
+        forgetting: float = 0.995,
+        min_samples: int = 30,
+        delta: float = 1e4,
+        max_trace: float = 1e6,
+        max_pending: int = 50_000,
+        interval_s: Optional[float] = 0.5,
+    ) -> None:
+        self.forgetting = float(forgetting)
+        self.min_samples = int(min_samples)
+        self.delta = float(delta)
+        self.max_trace = float(max_trace)
+        self.interval_s = interval_s
+        self._pending: Deque[Tuple] = deque(maxlen=int(max_pending))
+        # Set once the updater has been started (stop() does not reset it).
+        self._started = False
+        self._start_lock = threading.Lock()
+        self._fits: Dict[str, _RLS] = {}
+        self._coef: Dict[str, Coefficients] = {}
+        self._update_lock = threading.Lock()
+        self._updater = PeriodicTask("latch-latency-model", self.update)
+        self.updates = 0
+
+    # -- feeding -------------------------------------------------------------------
+
+    def offer(self, row: Tuple) -> None:
+        """Queue one event row (MetricEvent field order); errors are skipped. O(1)."""
+        if row[4]:
+            return
+        self._pending.append(row)
+        if not self._started and self.interval_s is not None:
+            self.start(self.interval_s)
+
+    def observe(
+        self, model_id: str, *, prompt_tokens: int, tokens_out: int, latency_ms: float, queue_depth: float = 0.0
+    ) -> None:
+        """Queue one observation directly (same path as `offer`)."""
+        self.offer((0.0, latency_ms, prompt_tokens, tokens_out, "", "", model_id, queue_depth, 0.0))
+
+    def update(self) -> int:
+        """Fold every queued observation into the fits; returns how many."""
+        pending = self._pending
+        if not pending:
+            return 0
+        with self._update_lock:
+            touched: Dict[str, _RLS] = {}
+            n = 0
+            lam = self.forgetting
+            while pending:
+                try:
+                    row = pending.popleft()
+                except IndexError:
+                    break
+                model_id = row[6]
+                fit = self._fits.get(model_id)
+                if fit is None:
+                    fit = self._fits[model_id] = _RLS(self.delta)
+                x = [1.0, float(row[2]) * _SCALES[1], float(row[3]) * _SCALES[2], float(row[7]) * _SCALES[3]]
+                fit.update(x, float(row[1]), lam, self.max_trace)
+                touched[model_id] = fit
+                n += 1
+            for model_id, fit in touched.items():
+                raw = tuple(t * s for t, s in zip(fit.theta, _SCALES))
+                self._coef[model_id] = (raw, fit.n)  # type: ignore[assignment]
+            self.updates += n
+            return n
+
+    # -- queries (lock-free) -------------------------------------------------------
+
+    def coefficients(self, model_id: str) -> Optional[Coefficients]:
+        return self._coef.get(model_id)
+
+    def _warm(self, model_id: str) -> Optional[Tuple[float, float, float, float]]:
+        entry = self._coef.get(model_id)
+        if entry is None or entry[1] < self.min_samples:
+            return None
+        return entry[0]
+
+    def predict(
+        self, model_id: str, prompt_tokens: int, tokens_out: int, queue_depth: float = 0.0
+    ) -> Optional[float]:
+        """Predicted latency in ms, or None while the model is not warm."""
+        w = self._warm(model_id)
+        if w is None:
+            return None
+        return max(0.0, w[0] + w[1] * prompt_tokens + w[2] * tokens_out + w[3] * queue_depth)
+
+    def max_tokens_for(
+        self, model_id: str, budget_ms: float, prompt_tokens: int, queue_depth: float = 0.0
+    ) -> Optional[int]:
+        """
+        Largest tokens_out predicted to finish within `budget_ms` (0 if even the
+        prompt alone does not fit). None while not warm or when output length
+        shows no latency effect.
+        """
+        w = self._warm(model_id)
+        if w is None or w[2] <= 1e-9:
+            return None
+        base = w[0] + w[1] * prompt_tokens + w[3] * queue_depth
+        return max(0, int((budget_ms - base) / w[2]))
+
+    # -- background updates ---------------------------------------------------------
+
+    def start(self, interval_s: float = 0.5) -> None:
+        """Apply queued observations on a daemon thread every `interval_s`."""
+        # Offers may come from many threads (shards sharing one model).
+        with self._start_lock:
+            self._started = True
+            self._updater.start(interval_s)
+
+    def stop(self) -> None:
+        self._updater.stop()
+        self.update()
@@ -6,8 +6,14 @@ Purpose
 
 Inputs
 - intent: customer goals (latency vs cost vs priority vs quality floor)
-- signals: lightweight real-time aggregates (p95 latency, error rate, cost rate, queue depth)
+- signals: lightweight real-time aggregates (p95 latency, error rate, cost rate, queue depth);
+  per (intent, tier, model_id) partition when the caller has them (see
+  SignalsCache.for_key), global otherwise
 - request_context: request type/tier/prompt size
+- config: thresholds/caps/blocked intents from configs/policies.yaml (see `config.py`)
+- latency_model (optional, see `latency_model.py`): per-model latency
+  predictions; max_tokens is capped so the predicted latency of the call
+  fits the intent's budget before the SLO is breached
 
 Outputs
 - policy: small, deterministic decision object with mode/priority/max_tokens/notes
@@ -24,38 +30,155 @@ Non-goals
 Keep it small, testable, and boring.
 """
 
+from typing import Any, Callable, Dict, Optional
+
 from latch.types import Intent, Policy, RequestContext, Signals
 
+from .config import PolicyConfig, load_policy_config
 
-def decide_policy(intent: Intent, signals: Signals, request_context: RequestContext) -> Policy:
-    """Public API for policy decisions in the control plane."""
-    return PolicyEngine().evaluate(intent, signals, request_context)
+_default_engine: Optional["PolicyEngine"] = None
 
-class PolicyEngine:
-    def evaluate(self, intent: Intent, signals: Signals, request_context: RequestContext) -> Policy:
-        p95_latency = float(signals.p95_latency_ms)
-        cost_rate = float(signals.cost_rate)
-        error_rate = float(signals.error_rate)
-        queue_depth = float(signals.queue_depth)
-        tier = request_context.tier
-        prompt_tokens = int(request_context.prompt_tokens)
 
-        if "deny" in intent.constraints:
-            return Policy("degraded", "throughput", 0, "explicit_deny")
+def default_engine() -> "PolicyEngine":
+    """Process-wide engine compiled once from configs/policies.yaml."""
+    global _default_engine
+    if _default_engine is None:
+        try:
+            config = load_policy_config()
+        except (OSError, ValueError):
+            config = PolicyConfig()
+        _default_engine = PolicyEngine(config)
+    return _default_engine
 
-        if error_rate > 0.05 or queue_depth > 8:
-            return Policy("degraded", "throughput", 128, "system_hot")
 
-        if p95_latency > intent.max_latency_ms:
-            return Policy("degraded", "latency", 256, "latency_hot")
+def set_default_engine(engine: "PolicyEngine") -> None:
+    global _default_engine
+    _default_engine = engine
 
-        if cost_rate > intent.max_cost:
-            return Policy("degraded", "throughput", 192, "cost_hot")
 
-        if intent.max_latency_ms <= 400 or intent.priority >= 8:
-            return Policy("normal", "latency", max(256, prompt_tokens // 2), "latency_priority")
+def decide_policy(
+    intent: Intent, signals: Signals, request_context: RequestContext, model_id: str = ""
+) -> Policy:
+    """Public API for policy decisions in the control plane."""
+    return default_engine().evaluate(intent, signals, request_context, model_id)
 
-        if tier == "free":
-            return Policy("normal", "throughput", 256, "free_tier")
 
-        return Policy("normal", "throughput", 512, "default")
+class PolicyEngine:
+    """
+    Rules compiled once into a closure over constants.
+
+    Identical outputs are interned (shared Policy instances) and the final
+    non-degraded branch is memoized on (latency budget, priority, tier).
+    Latency-priority caps keep the exact rule, max(floor, prompt_tokens // 2);
+    only the prompt-size half is computed per call. Both the memo and the
+    intern table hold at most `memo_size` entries.
+
+    With a `latency_model`, the rule-based policy is then capped per call
+    (model_id, prompt size, queue depth); predicted caps are rounded down to
+    multiples of `_PREDICTED_STEP` tokens so interning stays bounded.
+    """
+
+    _PREDICTED_STEP = 16
+
+    def __init__(
+        self,
+        config: Optional[PolicyConfig] = None,
+        *,
+        memo_size: int = 4096,
+        latency_model: Optional[Any] = None,
+    ) -> None:
+        self.config = config or PolicyConfig()
+        self.memo_size = int(memo_size)
+        self.latency_model = latency_model
+        self._memo: Dict[tuple, Policy] = {}
+        self._interned: Dict[Policy, Policy] = {}
+        self._decide = self._compile(self.config)
+
+    def intern(self, policy: Policy) -> Policy:
+        interned = self._interned
+        found = interned.get(policy)
+        if found is None:
+            if len(interned) >= self.memo_size:
+                interned.clear()
+            found = interned[policy] = policy
+        return found
+
+    def evaluate(
+        self, intent: Intent, signals: Signals, request_context: RequestContext, model_id: str = ""
+    ) -> Policy:
+        policy = self._decide(intent, signals, request_context)
+        if self.latency_model is not None and model_id and policy.max_tokens > 0:
+            return self._cap_predicted(policy, intent, signals, request_context, model_id)
+        return policy
+
+    def _cap_predicted(
+        self, policy: Policy, intent: Intent, signals: Signals, request_context: RequestContext, model_id: str
+    ) -> Policy:
+        cfg = self.config
+        fit = self.latency_model.max_tokens_for(
+            model_id,
+            intent.max_latency_ms * cfg.predicted_latency_headroom,
+            request_context.prompt_tokens,
+            signals.queue_depth,
+        )
+        if fit is None:
+            return policy
+        step = self._PREDICTED_STEP
+        tokens = max(min(cfg.predicted_min_tokens, policy.max_tokens), fit // step * step)
+        if tokens >= policy.max_tokens:
+            return policy
+        return self.intern(Policy(policy.mode, "latency", tokens, "predicted_latency"))
+
+    def _compile(self, cfg: PolicyConfig) -> Callable[[Intent, Signals, RequestContext], Policy]:
+        intern = self.intern
+        blocked_policy = intern(Policy("degraded", "throughput", 0, "blocked_intent"))
+        deny_policy = intern(Policy("degraded", "throughput", 0, "explicit_deny"))
+        system_hot = intern(Policy("degraded", "throughput", cfg.system_hot_max_tokens, "system_hot"))
+        latency_hot = intern(Policy("degraded", "latency", cfg.latency_hot_max_tokens, "latency_hot"))
+        cost_hot = intern(Policy("degraded", "throughput", cfg.cost_hot_max_tokens, "cost_hot"))
+        free_tier = intern(Policy("normal", "throughput", cfg.free_tier_max_tokens, "free_tier"))
+        default = intern(Policy("normal", "throughput", cfg.default_max_tokens, "default"))
+
+        blocked = cfg.blocked_intents
+        free_tiers = cfg.free_tiers
+        error_hot = cfg.error_rate_hot
+        queue_hot = cfg.queue_depth_hot
+        lp_max_latency = cfg.latency_priority_max_latency_ms
+        lp_min_priority = cfg.latency_priority_min_priority
+        lp_floor = cfg.latency_priority_min_tokens
+        # Memoized for latency-priority keys; raised per call for large prompts.
+        lp_policy = intern(Policy("normal", "latency", lp_floor, "latency_priority"))
+        memo = self._memo
+        memo_size = self.memo_size
+
+        def decide(intent: Intent, signals: Signals, request_context: RequestContext) -> Policy:
+            if intent.name in blocked:
+                return blocked_policy
+            if "deny" in intent.constraints:
+                return deny_policy
+            if signals.error_rate > error_hot or signals.queue_depth > queue_hot:
+                return system_hot
+            if signals.p95_latency_ms > intent.max_latency_ms:
+                return latency_hot
+            if signals.cost_rate > intent.max_cost:
+                return cost_hot
+
+            key = (intent.max_latency_ms, intent.priority, request_context.tier)
+            policy = memo.get(key)
+            if policy is None:
+                if intent.max_latency_ms <= lp_max_latency or intent.priority >= lp_min_priority:
+                    policy = lp_policy
+                elif request_context.tier in free_tiers:
+                    policy = free_tier
+                else:
+                    policy = default
+                if len(memo) >= memo_size:
+                    memo.clear()
+                memo[key] = policy
+            if policy is lp_policy:
+                tokens = int(request_context.prompt_tokens) // 2
+                if tokens > lp_floor:
+                    return intern(Policy("normal", "latency", tokens, "latency_priority"))
+            return policy
+
+        return decide
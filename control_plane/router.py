@@ -0,0 +1,176 @@
+"""
+Model Router (MVP)
+
+Purpose
+- Send each request to the cheapest model that is predicted to meet the
+  intent's `max_latency_ms` and `max_cost`, instead of a caller-chosen one.
+
+Estimators (per model, online, EWMA with weight `alpha`)
+- latency per token (prompt + output tokens)
+- output tokens per call (predictions use min(max_tokens, this) once known)
+- cost per token (starts from the model's list price)
+- error rate
+Estimates start from the spec (`prior_ms_per_token`, list price); the first
+`min_samples` observations are averaged so the prior is replaced quickly.
+
+Routing
+- Candidates are ranked by predicted cost; the first one whose predicted
+  latency fits `latency_margin` * max_latency_ms (predictions are means;
+  the margin absorbs their spread), whose predicted cost fits max_cost and
+  whose error rate is below `max_error_rate` wins ("cheapest_feasible").
+- Nothing fits: the model with the lowest predicted latency ("fastest").
+- Exploration: a model that has not been routed to for `explore_after`
+  decisions gets the next request ("explore"), so estimates for models the
+  router stopped choosing (e.g. one that was slow for a while) stay fresh.
+
+Hard constraints for MVP
+- Deterministic (no randomness); O(models) per decision; stdlib only.
+
+Non-goals
+- Not a bandit library; no contextual features beyond token counts.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from latch.types import Intent
+
+# SDK model_id that asks the client's router to choose.
+AUTO_MODEL = "auto"
+
+# Runtime mode a model maps to, and the DecisionEngine action that selects it.
+_MODE_ACTION = {"fast": "route_fast", "cheap": "route_economy", "balanced": "allow"}
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    name: str
+    cost_per_1k_tokens: float
+    prior_ms_per_token: float
+    mode: str = "balanced"  # "fast" | "balanced" | "cheap"
+
+
+@dataclass(frozen=True)
+class Route:
+    model_id: str
+    action: str
+    reason: str  # "cheapest_feasible" | "fastest" | "explore"
+    predicted_latency_ms: float
+    predicted_cost: float
+
+
+class ModelEstimate:
+    __slots__ = ("spec", "ms_per_token", "cost_per_token", "tokens_out", "error_rate", "samples", "last_routed")
+
+    def __init__(self, spec: ModelSpec) -> None:
+        self.spec = spec
+        self.ms_per_token = spec.prior_ms_per_token
+        self.cost_per_token = spec.cost_per_1k_tokens / 1000.0
+        self.tokens_out: Optional[float] = None
+        self.error_rate = 0.0
+        self.samples = 0
+        self.last_routed = 0
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        models: Sequence[ModelSpec],
+        *,
+        alpha: float = 0.1,
+        min_samples: int = 5,
+        max_error_rate: float = 0.2,
+        explore_after: int = 200,
+        latency_margin: float = 0.8,
+    ) -> None:
+        if not models:
+            raise ValueError("ModelRouter needs at least one model")
+        self.alpha = float(alpha)
+        self.min_samples = int(min_samples)
+        self.max_error_rate = float(max_error_rate)
+        self.explore_after = int(explore_after)
+        self.latency_margin = float(latency_margin)
+        self._estimates: Dict[str, ModelEstimate] = {m.name: ModelEstimate(m) for m in models}
+        # Cheapest list price first; re-sorted by estimated cost as estimates move.
+        self._by_cost: List[ModelEstimate] = sorted(self._estimates.values(), key=lambda e: e.cost_per_token)
+        self._lock = threading.Lock()
+        self._decisions = 0
+        self.counters: Dict[str, int] = {"cheapest_feasible": 0, "fastest": 0, "explore": 0}
+
+    @property
+    def models(self) -> List[str]:
+        return list(self._estimates)
+
+    def estimate(self, model_id: str) -> Optional[ModelEstimate]:
+        return self._estimates.get(model_id)
+
+    def route(self, intent: Intent, prompt_tokens: int, max_tokens: int) -> Route:
+        prompt_tokens = max(0, int(prompt_tokens))
+        max_tokens = max(0, int(max_tokens))
+        latency_budget = intent.max_latency_ms * self.latency_margin
+        with self._lock:
+            self._decisions += 1
+            now = self._decisions
+            stale = min(self._by_cost, key=lambda e: e.last_routed)
+            if now - stale.last_routed > self.explore_after:
+                return self._pick(stale, self._tokens(stale, prompt_tokens, max_tokens), "explore", now)
+            for est in self._by_cost:
+                tokens = self._tokens(est, prompt_tokens, max_tokens)
+                if (
+                    est.ms_per_token * tokens <= latency_budget
+                    and est.cost_per_token * tokens <= intent.max_cost
+                    and est.error_rate <= self.max_error_rate
+                ):
+                    return self._pick(est, tokens, "cheapest_feasible", now)
+            fastest = min(self._by_cost, key=lambda e: (e.error_rate > self.max_error_rate, e.ms_per_token))
+            return self._pick(fastest, self._tokens(fastest, prompt_tokens, max_tokens), "fastest", now)
+
+    @staticmethod
+    def _tokens(est: ModelEstimate, prompt_tokens: int, max_tokens: int) -> float:
+        out = max_tokens if est.tokens_out is None else min(max_tokens, est.tokens_out)
+        return max(1.0, prompt_tokens + out)
+
+    def _pick(self, est: ModelEstimate, tokens: float, reason: str, now: int) -> Route:
+        est.last_routed = now
+        self.counters[reason] += 1
+        spec = est.spec
+        return Route(
+            spec.name,
+            _MODE_ACTION.get(spec.mode, "allow"),
+            reason,
+            est.ms_per_token * tokens,
+            est.cost_per_token * tokens,
+        )
+
+    def observe(
+        self,
+        model_id: str,
+        *,
+        prompt_tokens: int,
+        tokens_out: int,
+        latency_ms: float,
+        cost: Optional[float] = None,
+        error: bool = False,
+    ) -> None:
+        """Fold one finished call into the model's estimates (`cost` None: list price)."""
+        est = self._estimates.get(model_id)
+        if est is None:
+            return
+        tokens = max(1, int(prompt_tokens) + int(tokens_out))
+        a = self.alpha
+        with self._lock:
+            est.samples += 1
+            # Plain average until warm, so the prior is replaced quickly.
+            w = max(a, 1.0 / est.samples) if est.samples <= self.min_samples else a
+            est.error_rate += w * ((1.0 if error else 0.0) - est.error_rate)
+            if error:
+                return
+            est.ms_per_token += w * (float(latency_ms) / tokens - est.ms_per_token)
+            out = float(tokens_out)
+            est.tokens_out = out if est.tokens_out is None else est.tokens_out + w * (out - est.tokens_out)
+            if cost is not None:
+                est.cost_per_token += w * (float(cost) / tokens - est.cost_per_token)
+                self._by_cost.sort(key=lambda e: e.cost_per_token)
@@ -15,6 +15,11 @@ Outputs
   - max_queue_depth: int
   - batching: "low" | "auto"
   - concurrency_cap: int
+  - cache: "true" | "false" (intents with the "no_cache" constraint opt out)
+  - model_id: only when the DecisionEngine's router picked a model
+  - hedge: "true" only for intents with the "hedge" constraint
+  - prompt / max_tokens: passed through when the caller has them; the
+    gateway's response cache and coalescing key on both
 
 Hard constraints for MVP
 - Do NOT call real llm-d APIs; provide a fake adapter elsewhere.
@@ -26,20 +31,36 @@ Non-goals
 - Not observability or tracing export.
 """
 
-from typing import Dict
+from typing import Dict, Optional
 from .decision_engine import Decision
 from .intents import Intent
 
 
+# Queue-depth tolerance per action: latency-priority traffic may wait behind a
+# deeper queue; degraded or denied traffic is shed early.
+_MAX_QUEUE_DEPTH = {"escalate": 256, "route_fast": 256, "route_economy": 64, "allow": 128, "deny": 0}
+_DEGRADED_MAX_QUEUE_DEPTH = 16
+
+
 class Translator:
-    def translate(self, intent: Intent, decision: Decision) -> Dict[str, str]:
+    def translate(
+        self,
+        intent: Intent,
+        decision: Decision,
+        *,
+        prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Dict[str, str]:
         if decision.action == "route_fast":
             runtime_mode = "fast"
         elif decision.action == "route_economy":
             runtime_mode = "cheap"
         else:
             runtime_mode = "balanced"
-        return {
+        max_queue_depth = _MAX_QUEUE_DEPTH.get(decision.action, 128)
+        if decision.mode == "degraded":
+            max_queue_depth = min(max_queue_depth, _DEGRADED_MAX_QUEUE_DEPTH)
+        request = {
             "intent": intent.name,
             "action": decision.action,
             "policy_mode": decision.mode,
@@ -49,4 +70,15 @@ class Translator:
             "max_latency_ms": str(intent.max_latency_ms),
             "max_cost": f"{intent.max_cost:.4f}",
             "params": str(intent.params),
+            "max_queue_depth": str(max_queue_depth),
+            "cache": "false" if "no_cache" in intent.constraints else "true",
         }
+        if decision.model_id:
+            request["model_id"] = decision.model_id
+        if "hedge" in intent.constraints:
+            request["hedge"] = "true"
+        if prompt is not None:
+            request["prompt"] = prompt
+        if max_tokens is not None:
+            request["max_tokens"] = str(max_tokens)
+        return request
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from control_plane import DecisionEngine, FeedbackLoop, Translator
 from control_plane.policy_engine import decide_policy
 from control_plane.decision_engine import Decision
@@ -6,32 +8,38 @@ from latch.types import Signals
 from metrics.collector import MetricsCollector
 from runtime.gateway import RuntimeGateway
 from runtime.request_context import RequestContext
+from runtime.response_cache import ResponseCache
 
 
 class DemoAgent:
-    def __init__(self) -> None:
+    def __init__(self, *, response_cache: Optional[ResponseCache] = None) -> None:
         self.decider = DecisionEngine()
         self.translator = Translator()
-        self.runtime = RuntimeGateway()
-        self.feedback = FeedbackLoop()
         self.metrics = MetricsCollector()
+        self.runtime = RuntimeGateway(metrics=self.metrics, response_cache=response_cache)
+        self.feedback = FeedbackLoop()
 
     def _baseline_decision(self) -> Decision:
         return Decision(True, "allow", "baseline", "normal")
 
-    def handle(self, intent: Intent, context: RequestContext, use_control: bool) -> dict:
+    def handle(
+        self, intent: Intent, context: RequestContext, use_control: bool, prompt: Optional[str] = None
+    ) -> dict:
+        max_tokens = None
         if use_control:
             policy = decide_policy(intent, Signals(), context)
             decision = self.decider.decide(intent, policy)
+            max_tokens = policy.max_tokens
         else:
             decision = self._baseline_decision()
-        request = self.translator.translate(intent, decision)
+        request = self.translator.translate(intent, decision, prompt=prompt, max_tokens=max_tokens)
         response = self.runtime.dispatch(request, context)
+        shed = response.get("status") == "rejected"
         outcome = {
             "intent": intent.name,
-            "allowed": "true" if decision.allowed else "false",
-            "action": decision.action,
-            "reason": decision.reason,
+            "allowed": "true" if decision.allowed and not shed else "false",
+            "action": "shed" if shed else decision.action,
+            "reason": response.get("reason", decision.reason) if shed else decision.reason,
             # Keep `mode` as the policy/controller mode for now (normal/degraded).
             # Runtime-facing mode (fast/cheap/balanced) is separately recorded.
             "mode": decision.mode,
@@ -41,6 +49,8 @@ class DemoAgent:
             "latency_ms": response.get("latency_ms", "0"),
             "queue_depth": response.get("queue_depth", "0"),
             "cost": response.get("cost", "0"),
+            "error_type": response.get("error_type", ""),
+            "cache": response.get("cache", "off"),
         }
         self.feedback.record(outcome)
         self.metrics.record(outcome)
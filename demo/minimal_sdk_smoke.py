@@ -3,7 +3,7 @@ Minimal SDK smoke test (Phase 1).
 
 Runs a single wrapped model call to validate:
 - request context construction
-- stubbed policy invocation
+- policy invocation (cached live signals)
 - metric event recording
 """
 
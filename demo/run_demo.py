@@ -5,15 +5,16 @@ if __name__ == "__main__" and __package__ is None:
 
     sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from demo.traffic_simulator import generate_traffic
+from demo.traffic_simulator import generate_traffic, prompt_for
 from demo.demo_agent import DemoAgent
 from metrics.signals import derive_signals
+from runtime.response_cache import ResponseCache
 
 
-def run(use_control: bool) -> None:
-    agent = DemoAgent()
+def run(use_control: bool, cache: bool = False) -> None:
+    agent = DemoAgent(response_cache=ResponseCache() if cache else None)
     for intent, context in generate_traffic():
-        outcome = agent.handle(intent, context, use_control)
+        outcome = agent.handle(intent, context, use_control, prompt_for(intent, context))
         print(outcome)
     snapshot = agent.metrics.snapshot()
     print("metrics", snapshot)
@@ -25,6 +26,8 @@ def main() -> None:
     run(use_control=False)
     print("with_control")
     run(use_control=True)
+    print("with_control_cached")
+    run(use_control=True, cache=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,428 @@
+"""
+Trace Replay (demo)
+
+Replays a production-style JSONL trace through DemoAgent or the SDK and
+prints p50/p95/p99 latency of served requests, shed rate (admission sheds),
+deny rate (policy denials such as blocked intents) and cost.
+
+Trace format (one JSON object per line; unknown keys are ignored)
+    {"ts": 1712000000.25, "intent": "summarize", "tier": "free",
+     "prompt_tokens": 512, "is_background": false, "user_id": "u1", "trace_id": "t1"}
+- `ts` (or `timestamp`) is in seconds; `prompt_size` is accepted for
+  `prompt_tokens`, `background` / `request_type` for `is_background`.
+
+Mechanics
+- Streaming: lines are read from an mmap of the file, one at a time; the trace
+  is never loaded into memory.
+- Open-loop: each record is issued at its original offset from the first
+  record, divided by `speed` (2.0 = twice as fast, 0.5 = stretched out,
+  0 = as fast as possible). Slow responses never delay later arrivals (with
+  `concurrency` > 1); late issues are reported as schedule lag.
+- SDK target: calls go through RequestSession.call_model to a SimulatedLLMD
+  backend fed with each record's trace offset as its arrival time, so the
+  reported latency is the simulated backend latency plus the SDK wrapper's
+  own time. Each shard simulates its own backend.
+- Threaded (`concurrency` > 1): the SDK target records into a
+  ShardedMetricsCollector; DemoAgent is not thread-safe, so the agent target
+  serializes its calls. A record whose target raises is counted in `errors`
+  (by exception type) instead of aborting the replay or being dropped.
+- Sharding: `workers` processes each take every N-th record, so every shard
+  spans the whole timeline and they replay side by side. Per-shard latency
+  sketches are merged for the summary.
+
+Usage
+    python demo/trace_replay.py TRACE.jsonl [--speed 10] [--workers 4] [--target agent|sdk]
+    python demo/trace_replay.py TRACE.jsonl --synthesize 100000   # write a synthetic trace first
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    # Allow `python demo/trace_replay.py` from any working directory.
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import argparse
+import json
+import mmap
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from control_plane.config import load_intents
+from latch.types import Intent, RequestContext
+from metrics.sketch import QuantileSketch, merge_sketches
+
+PathLike = Union[str, Path]
+
+# Target outcomes.
+SERVED = "served"
+SHED = "shed"
+DENIED = "denied"
+
+
+@dataclass(frozen=True)
+class TraceRecord:
+    ts: float
+    intent: str
+    tier: str
+    prompt_tokens: int
+    is_background: bool
+    user_id: str
+    trace_id: str
+
+
+@dataclass
+class ReplaySummary:
+    requests: int = 0
+    shed: int = 0
+    denied: int = 0
+    cost: float = 0.0
+    max_lag_ms: float = 0.0
+    wall_s: float = 0.0
+    errors: int = 0
+    error_types: Dict[str, int] = field(default_factory=dict)
+    latency: QuantileSketch = field(default_factory=QuantileSketch)
+
+    @property
+    def shed_rate(self) -> float:
+        return (self.shed / self.requests) if self.requests else 0.0
+
+    @property
+    def deny_rate(self) -> float:
+        return (self.denied / self.requests) if self.requests else 0.0
+
+    def merge(self, other: "ReplaySummary") -> None:
+        self.requests += other.requests
+        self.shed += other.shed
+        self.denied += other.denied
+        self.cost += other.cost
+        self.max_lag_ms = max(self.max_lag_ms, other.max_lag_ms)
+        self.wall_s = max(self.wall_s, other.wall_s)
+        self.errors += other.errors
+        for name, n in other.error_types.items():
+            self.error_types[name] = self.error_types.get(name, 0) + n
+        self.latency = merge_sketches([self.latency, other.latency])
+
+    def as_dict(self) -> Dict[str, float]:
+        p50, p95, p99 = self.latency.quantiles((0.5, 0.95, 0.99))
+        return {
+            "requests": self.requests,
+            "p50_latency_ms": round(p50, 3),
+            "p95_latency_ms": round(p95, 3),
+            "p99_latency_ms": round(p99, 3),
+            "shed_rate": round(self.shed_rate, 4),
+            "deny_rate": round(self.deny_rate, 4),
+            "total_cost": round(self.cost, 4),
+            "avg_cost": round(self.cost / self.latency.count, 6) if self.latency.count else 0.0,
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "wall_s": round(self.wall_s, 2),
+            "errors": self.errors,
+        }
+
+
+# -- reading -----------------------------------------------------------------
+
+
+def iter_trace_lines(path: PathLike, *, shard: int = 0, shards: int = 1, limit: Optional[int] = None) -> Iterator[bytes]:
+    """Non-blank lines of `path` whose index % shards == shard (mmap-backed, streaming)."""
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            index = 0
+            for line in iter(mm.readline, b""):
+                if not line.strip():
+                    continue
+                if limit is not None and index >= limit:
+                    return
+                if index % shards == shard:
+                    yield line
+                index += 1
+
+
+def parse_record(line: Union[bytes, str]) -> TraceRecord:
+    raw: Dict[str, Any] = json.loads(line)
+    if "is_background" in raw:
+        background = bool(raw["is_background"])
+    elif "background" in raw:
+        background = bool(raw["background"])
+    else:
+        background = str(raw.get("request_type", "user")).lower() == "background"
+    return TraceRecord(
+        ts=float(raw.get("ts", raw.get("timestamp", 0.0))),
+        intent=str(raw.get("intent", "default")),
+        tier=str(raw.get("tier", "free")),
+        prompt_tokens=int(raw.get("prompt_tokens", raw.get("prompt_size", 256))),
+        is_background=background,
+        user_id=str(raw.get("user_id", "anonymous")),
+        trace_id=str(raw.get("trace_id", "")),
+    )
+
+
+def iter_trace(path: PathLike, *, shard: int = 0, shards: int = 1, limit: Optional[int] = None) -> Iterator[TraceRecord]:
+    for line in iter_trace_lines(path, shard=shard, shards=shards, limit=limit):
+        yield parse_record(line)
+
+
+def first_timestamp(path: PathLike) -> float:
+    for record in iter_trace(path, limit=1):
+        return record.ts
+    return 0.0
+
+
+def write_synthetic_trace(path: PathLike, n: int, *, rate_per_s: float = 50.0, seed: int = 0) -> None:
+    """Poisson arrivals over the default intents, for trying the replayer without a real trace."""
+    rng = random.Random(seed)
+    intents = list(load_intents())
+    t = 1_700_000_000.0
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            t += rng.expovariate(rate_per_s)
+            record = {
+                "ts": round(t, 4),
+                "intent": rng.choice(intents),
+                "tier": "pro" if rng.random() < 0.3 else "free",
+                "prompt_tokens": int(rng.lognormvariate(5.5, 0.8)),
+                "is_background": rng.random() < 0.25,
+                "user_id": f"user-{rng.randrange(1000)}",
+                "trace_id": f"trace-{i}",
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+# -- targets -----------------------------------------------------------------
+
+# A target handles one record and returns (latency_ms, outcome, cost); outcome
+# is SERVED, SHED or DENIED. Latency and cost only count for served requests.
+Target = Callable[[TraceRecord], Tuple[float, str, float]]
+
+
+def _context(record: TraceRecord) -> RequestContext:
+    return RequestContext(
+        user_id=record.user_id,
+        trace_id=record.trace_id,
+        prompt_tokens=record.prompt_tokens,
+        tier=record.tier,
+        is_background=record.is_background,
+    )
+
+
+def agent_target(use_control: bool = True, concurrency: int = 1) -> Target:
+    from demo.demo_agent import DemoAgent
+
+    agent = DemoAgent()
+    intents = load_intents()
+    # DemoAgent (decider, feedback loop, plain collector) is single-threaded.
+    serial = threading.Lock() if concurrency > 1 else None
+
+    def handle(record: TraceRecord) -> Tuple[float, str, float]:
+        intent = intents.get(record.intent) or Intent(name=record.intent)
+        if serial is None:
+            outcome = agent.handle(intent, _context(record), use_control)
+        else:
+            with serial:
+                outcome = agent.handle(intent, _context(record), use_control)
+        if outcome.get("allowed") != "true":
+            return 0.0, SHED if outcome.get("action") == "shed" else DENIED, 0.0
+        return float(outcome.get("latency_ms", 0.0)), SERVED, float(outcome.get("cost", 0.0))
+
+    return handle
+
+
+def sdk_target(concurrency: int = 1) -> Target:
+    from latch import LatchClient
+    from metrics.sharded_collector import ShardedMetricsCollector
+    from runtime.simulator import SimulatedLLMD
+
+    client = LatchClient(metrics=ShardedMetricsCollector() if concurrency > 1 else None)
+    intents = load_intents()
+    # Virtual arrival times follow the trace; the simulator is single-threaded.
+    llmd = SimulatedLLMD(arrival_rate_per_s=0.0)
+    llmd_lock = threading.Lock()
+    t0: List[float] = []
+
+    def handle(record: TraceRecord) -> Tuple[float, str, float]:
+        session = client.request(
+            request_type="background" if record.is_background else "user",
+            tier=record.tier,
+            metadata={"user_id": record.user_id, "trace_id": record.trace_id, "prompt_tokens": record.prompt_tokens},
+            intent=intents.get(record.intent) or Intent(name=record.intent),
+        )
+        backend: Dict[str, str] = {}
+
+        def model(prompt: str, *, model: str, max_tokens: int) -> Dict[str, Any]:
+            if max_tokens <= 0:
+                return {"tokens_out": 0}
+            with llmd_lock:
+                if not t0:
+                    t0.append(record.ts)
+                backend.update(
+                    llmd.execute(
+                        {
+                            "arrival_ms": str(max(0.0, record.ts - t0[0]) * 1000.0),
+                            "prompt_tokens": str(record.prompt_tokens),
+                            "max_tokens": str(max_tokens),
+                        }
+                    )
+                )
+            return {"tokens_out": int(backend["tokens_out"]), "cost": float(backend["cost"])}
+
+        # call_model evaluates the policy once; a zero cap means the intent was denied.
+        result = session.call_model("", model_fn=model, model_id="replay")
+        if session.last_policy.max_tokens <= 0:
+            return 0.0, DENIED, 0.0
+        return float(backend["latency_ms"]) + result.latency_ms, SERVED, float(backend["cost"])
+
+    return handle
+
+
+_TARGETS: Dict[str, Callable[..., Target]] = {"agent": agent_target, "sdk": sdk_target}
+
+
+# -- replay ------------------------------------------------------------------
+
+
+def replay_shard(
+    path: PathLike,
+    *,
+    target: str = "agent",
+    speed: float = 1.0,
+    shard: int = 0,
+    shards: int = 1,
+    limit: Optional[int] = None,
+    concurrency: int = 1,
+    t0: Optional[float] = None,
+    start_at: Optional[float] = None,
+    use_control: bool = True,
+) -> ReplaySummary:
+    """Replay one shard open-loop. `start_at` (wall clock) lines shards up with each other."""
+    handle = agent_target(use_control, concurrency) if target == "agent" else _TARGETS[target](concurrency)
+    t0 = first_timestamp(path) if t0 is None else t0
+    start_at = time.time() if start_at is None else start_at
+    summary = ReplaySummary()
+    lock = threading.Lock()
+
+    def run_one(record: TraceRecord) -> None:
+        try:
+            latency_ms, outcome, cost = handle(record)
+        except Exception as exc:
+            name = type(exc).__name__
+            with lock:
+                summary.requests += 1
+                summary.errors += 1
+                summary.error_types[name] = summary.error_types.get(name, 0) + 1
+            return
+        with lock:
+            summary.requests += 1
+            if outcome == SHED:
+                summary.shed += 1
+            elif outcome == DENIED:
+                summary.denied += 1
+            else:
+                summary.cost += cost
+                summary.latency.add(latency_ms)
+
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="latch-replay") if concurrency > 1 else None
+    # Bound in-flight work so a slow target cannot buffer the whole trace.
+    slots = threading.BoundedSemaphore(concurrency * 4)
+    try:
+        for record in iter_trace(path, shard=shard, shards=shards, limit=limit):
+            if speed > 0:
+                due = start_at + (record.ts - t0) / speed
+                delay = due - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    summary.max_lag_ms = max(summary.max_lag_ms, -delay * 1000.0)
+            if pool is None:
+                run_one(record)
+                continue
+            slots.acquire()
+            future = pool.submit(run_one, record)
+            future.add_done_callback(lambda _f: slots.release())
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+    summary.wall_s = time.time() - start_at
+    return summary
+
+
+def replay(
+    path: PathLike,
+    *,
+    target: str = "agent",
+    speed: float = 1.0,
+    workers: int = 1,
+    limit: Optional[int] = None,
+    concurrency: int = 1,
+    use_control: bool = True,
+) -> ReplaySummary:
+    if target not in _TARGETS:
+        raise ValueError(f"unknown target {target!r} (expected one of {sorted(_TARGETS)})")
+    t0 = first_timestamp(path)
+    if workers <= 1:
+        return replay_shard(
+            path, target=target, speed=speed, limit=limit, concurrency=concurrency, t0=t0, use_control=use_control
+        )
+    # Give worker processes a moment to start so none begins behind schedule.
+    start_at = time.time() + 0.5
+    summary = ReplaySummary()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                replay_shard,
+                str(path),
+                target=target,
+                speed=speed,
+                shard=shard,
+                shards=workers,
+                limit=limit,
+                concurrency=concurrency,
+                t0=t0,
+                start_at=start_at,
+                use_control=use_control,
+            )
+            for shard in range(workers)
+        ]
+        for future in futures:
+            summary.merge(future.result())
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay a JSONL trace through the control loop.")
+    parser.add_argument("trace")
+    parser.add_argument("--target", choices=sorted(_TARGETS), default="agent")
+    parser.add_argument("--speed", type=float, default=1.0, help="time compression (0 = as fast as possible)")
+    parser.add_argument("--workers", type=int, default=1, help="shard across this many processes")
+    parser.add_argument("--concurrency", type=int, default=1, help="in-flight requests per worker (sdk target)")
+    parser.add_argument("--limit", type=int, default=None, help="replay only the first N records")
+    parser.add_argument("--baseline", action="store_true", help="agent target without the control loop")
+    parser.add_argument("--synthesize", type=int, metavar="N", help="first write N synthetic records to TRACE")
+    args = parser.parse_args(argv)
+
+    if args.synthesize:
+        write_synthetic_trace(args.trace, args.synthesize)
+    summary = replay(
+        args.trace,
+        target=args.target,
+        speed=args.speed,
+        workers=args.workers,
+        limit=args.limit,
+        concurrency=args.concurrency,
+        use_control=not args.baseline,
+    )
+    print("replay", summary.as_dict())
+    if summary.error_types:
+        print("errors", summary.error_types)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,11 @@
 from typing import Iterable, List, Tuple
+from control_plane.config import load_intents
 from control_plane.intents import Intent
 from runtime.request_context import RequestContext
 
 
 def generate_traffic() -> Iterable[Tuple[Intent, RequestContext]]:
-    intents: List[Intent] = [
-        Intent(name="summarize", priority=1, max_latency_ms=800, max_cost=0.004),
-        Intent(name="classify", priority=2, max_latency_ms=400, max_cost=0.003),
-        Intent(name="exfiltrate", priority=9, max_latency_ms=200, max_cost=0.001, constraints=["deny"]),
-    ]
+    intents: List[Intent] = list(load_intents().values())
     prompt_sizes = [128, 256, 512, 1024, 1536]
     for i in range(10):
         intent = intents[i % len(intents)]
@@ -23,3 +20,8 @@ def generate_traffic() -> Iterable[Tuple[Intent, RequestContext]]:
             metadata={"spike": "true" if i in (6, 7, 8) else "false"},
         )
         yield intent, context
+
+
+def prompt_for(intent: Intent, context: RequestContext) -> str:
+    """Deterministic stand-in prompt: same intent and size -> same text (so repeats can hit a cache)."""
+    return f"{intent.name}: the attached {context.prompt_tokens}-token document"
@@ -1,6 +1,6 @@
 """Latch SDK package (scaffold)."""
 
 from .types import Intent, Policy, RequestContext, Signals
-from runtime.sdk import LatchClient
+from runtime.sdk import AsyncLatchClient, LatchClient
 
-__all__ = ["Intent", "Policy", "RequestContext", "Signals", "LatchClient"]
+__all__ = ["Intent", "Policy", "RequestContext", "Signals", "LatchClient", "AsyncLatchClient"]
@@ -44,8 +44,11 @@ class Signals:
 
     p95_latency_ms: float = 0.0
     error_rate: float = 0.0
-    cost_rate: float = 0.0
+    cost_rate: float = 0.0  # avg cost per request over the recent window
     queue_depth: float = 0.0
+    qps: float = 0.0
+    cost_per_sec: float = 0.0
+    p50_latency_ms: float = 0.0
 
 
 @dataclass(frozen=True)
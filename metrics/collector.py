@@ -10,9 +10,13 @@ Collect ONLY
 - error_type (optional)
 - queue_depth (if available from runtime/fake_llmd)
 - cost_estimate (derived, optional)
+- ttft_ms / itl_ms (streamed calls only: time to first token, mean
+  inter-token gap; 0.0 otherwise)
 
 Hard constraints for MVP
-- In-memory only (no Prometheus, no Datadog integration).
+- In-memory only (no Prometheus, no Datadog integration). History beyond the
+  window goes through an optional exporter (see `metrics.export`), which
+  queues rows without blocking and does I/O on its own thread.
 - No distributed tracing setup (OTel optional later).
 - Must not block the request path; collection should be O(1).
 
@@ -23,10 +27,11 @@ Non-goals
 
 from __future__ import annotations
 
-from collections import deque
 from dataclasses import dataclass
-from typing import Deque, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from .event_store import ColumnarEventStore
+from .partitioned_stats import PartitionedStats
 from .rolling_stats import RollingStats
 
 
@@ -41,19 +46,44 @@ class MetricEvent:
     model_id: str
     queue_depth: float
     cost_estimate: float
+    ttft_ms: float = 0.0
+    itl_ms: float = 0.0
 
 
 class MetricsCollector:
-    def __init__(self, *, max_events: int = 1000) -> None:
+    def __init__(
+        self,
+        *,
+        max_events: int = 1000,
+        exporter: Optional[Any] = None,
+        partitions: Optional[PartitionedStats] = None,
+        latency_model: Optional[Any] = None,
+    ) -> None:
         self.stats = RollingStats()
-        self._events: Deque[MetricEvent] = deque(maxlen=int(max_events))
+        # Optional per-(intent, tier, model_id) stats next to the global ones.
+        self.partitions = partitions
+        # Columnar ring buffer; MetricEvent rows are only built on read.
+        self.store = ColumnarEventStore(capacity=int(max_events))
+        # Plain event counters (cache hits/misses, coalesced calls, ...).
+        self.counters: Dict[str, int] = {}
+        # Optional metrics.export.MetricsExporter; receives every event row.
+        self.exporter = exporter
+        # Optional control_plane.latency_model.LatencyModel; learns from every event row.
+        self.latency_model = latency_model
 
     def record(self, outcome: Dict[str, str]) -> None:
+        """
+        Record a gateway/demo outcome. Denials and admission sheds lower
+        allow_rate and are counted ("denied" / "shed") but are not errors:
+        error_rate only sees outcomes carrying an error_type.
+        """
         allowed = outcome.get("allowed", "false") == "true"
         latency_ms = float(outcome.get("latency_ms", "0"))
         cost = float(outcome.get("cost", "0"))
         queue_depth = float(outcome.get("queue_depth", "0"))
-        self.stats.record(allowed, latency_ms, cost, queue_depth)
+        if not allowed:
+            self.incr("shed" if outcome.get("action") == "shed" else "denied")
+        self.stats.record(allowed, latency_ms, cost, queue_depth, error=outcome_error(outcome))
 
     def record_event(
         self,
@@ -67,35 +97,129 @@ class MetricsCollector:
         *,
         queue_depth: float = 0.0,
         cost_estimate: float = 0.0,
+        intent: str = "",
+        tier: str = "",
+        ttft_ms: Optional[float] = None,
+        itl_ms: Optional[float] = None,
     ) -> None:
         """
         Record a single request-path metric event.
 
         This is the SDK-facing API. It is intentionally in-memory only.
+        `intent` / `tier` only select the partition (when partitions are on).
+        `ttft_ms` (and `itl_ms`, for 2+ tokens) mark a streamed call.
         """
-        err = (error_type or "").strip()
-        allowed = err == ""
-        self._events.append(
-            MetricEvent(
-                ts=float(ts),
-                latency_ms=float(latency_ms),
-                tokens_in=int(tokens_in),
-                tokens_out=int(tokens_out),
-                error_type=err,
-                request_type=(request_type or "user"),
-                model_id=(model_id or "unknown"),
-                queue_depth=float(queue_depth),
-                cost_estimate=float(cost_estimate),
-            )
+        row = _row(
+            latency_ms,
+            tokens_in,
+            tokens_out,
+            error_type,
+            request_type,
+            model_id,
+            ts,
+            queue_depth,
+            cost_estimate,
+            ttft_ms,
+            itl_ms,
         )
+        self._ingest_row(row, intent, tier, ttft_ms is not None, itl_ms)
+
+    def record_events(self, rows: Iterable[Tuple]) -> int:
+        """
+        Bulk variant of `record_event`.
+
+        Each row is (latency_ms, tokens_in, tokens_out, error_type, request_type,
+        model_id, ts[, queue_depth[, cost_estimate[, intent[, tier[, ttft_ms[, itl_ms]]]]]]).
+        Returns the number recorded.
+        """
+        ingest = self._ingest_row
+        n = 0
+        for row in rows:
+            k = len(row)
+            ttft_ms = row[11] if k > 11 else None
+            itl_ms = row[12] if k > 12 else None
+            event = _row(*row[:7], row[7] if k > 7 else 0.0, row[8] if k > 8 else 0.0, ttft_ms, itl_ms)
+            intent = str(row[9]) if k > 9 else ""
+            tier = str(row[10]) if k > 10 else ""
+            ingest(event, intent, tier, ttft_ms is not None, itl_ms)
+            n += 1
+        return n
+
+    def _ingest_row(self, row: Tuple, intent: str, tier: str, streamed: bool, itl_ms: Optional[float]) -> None:
+        """Fan one event row (MetricEvent field order) out to the store, stats and consumers."""
+        self.store.append(*row)
+        if self.exporter is not None:
+            self.exporter.offer(row)
+        if self.latency_model is not None:
+            self.latency_model.offer(row)
         # Feed RollingStats with the minimal aggregates needed for control signals.
-        self.stats.record(allowed, float(latency_ms), float(cost_estimate), float(queue_depth))
+        ok = row[4] == ""
+        self.stats.record(ok, row[1], row[8], row[7], row[0])
+        partitions = self.partitions
+        if partitions is not None:
+            key = (intent, tier, row[6])
+            partitions.record(key, ok, row[1], row[8], row[7], row[0])
+        if streamed:
+            self.stats.record_stream(row[9], itl_ms)
+            if partitions is not None:
+                partitions.record_stream(key, row[9], itl_ms)
 
     def events(self) -> List[MetricEvent]:
-        return list(self._events)
+        return [MetricEvent(*row) for row in self.store.rows()]
 
     def last_event(self) -> Optional[MetricEvent]:
-        return self._events[-1] if self._events else None
+        n = len(self.store)
+        return MetricEvent(*self.store.row(n - 1)) if n else None
+
+    def incr(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
 
     def snapshot(self) -> dict:
-        return self.stats.snapshot()
+        return self._with_counters(self.stats.snapshot())
+
+    def _with_counters(self, out: dict) -> dict:
+        return add_counters(out, self.counters)
+
+
+def _row(
+    latency_ms: float,
+    tokens_in: int,
+    tokens_out: int,
+    error_type: Optional[str],
+    request_type: str,
+    model_id: str,
+    ts: float,
+    queue_depth: float,
+    cost_estimate: float,
+    ttft_ms: Optional[float],
+    itl_ms: Optional[float],
+) -> Tuple:
+    """Normalize one event into a store row (MetricEvent field order)."""
+    return (
+        float(ts),
+        float(latency_ms),
+        int(tokens_in),
+        int(tokens_out),
+        (error_type or "").strip(),
+        request_type or "user",
+        model_id or "unknown",
+        float(queue_depth),
+        float(cost_estimate),
+        0.0 if ttft_ms is None else float(ttft_ms),
+        0.0 if itl_ms is None else float(itl_ms),
+    )
+
+
+def outcome_error(outcome: Dict[str, str]) -> bool:
+    """True if an outcome dict reports a failed call (not a denial or a shed)."""
+    return bool((outcome.get("error_type") or "").strip())
+
+
+def add_counters(snapshot: dict, counters: Dict[str, int]) -> dict:
+    """Merge plain counters into a stats snapshot (plus cache_hit_rate when cache counters exist)."""
+    if counters:
+        snapshot.update(counters)
+        lookups = counters.get("cache_hit", 0) + counters.get("cache_miss", 0)
+        if lookups:
+            snapshot["cache_hit_rate"] = counters.get("cache_hit", 0) / lookups
+    return snapshot
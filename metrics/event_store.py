@@ -0,0 +1,340 @@
+"""
+Columnar Event Store (MVP)
+
+Purpose
+- Keep the recent request-path events without allocating an object per event.
+- Answer small aggregate queries over the buffer (per-model rollups, latency
+  percentiles over a time range) without materializing rows.
+
+How it works
+- Fixed-capacity ring buffer; one typed `array` per column, preallocated.
+- String columns (request_type, model_id, error_type) are interned to small
+  integer codes; the code tables only grow when a new value is first seen.
+- Column slices are exposed as `memoryview`s over the arrays (zero-copy).
+  A ring that has wrapped yields two segments, oldest first.
+- If NumPy is installed, aggregates use it over `numpy.frombuffer` views;
+  otherwise they fall back to plain Python over the same buffers.
+
+Hard constraints for MVP
+- In-memory only; stdlib by default (NumPy optional).
+- append() is O(1) and allocation-free for already-seen strings.
+- Time-range queries bisect on `ts` while the live rows are in
+  non-decreasing `ts` order. Concurrent, batched and hedged calls can append
+  out of order; append() notes the latest inversion (one compare), and while
+  one is live, ranges fall back to a scan and aggregates mask on `ts`.
+
+Non-goals
+- Not long-term storage, not a query language.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:  # Optional: vectorized aggregates.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+NUMERIC_COLUMNS = {
+    "ts": "d",
+    "latency_ms": "d",
+    "tokens_in": "q",
+    "tokens_out": "q",
+    "queue_depth": "d",
+    "cost_estimate": "d",
+    "ttft_ms": "d",  # 0.0 for calls that were not streamed
+    "itl_ms": "d",
+}
+CODE_COLUMNS = ("request_type", "model_id", "error_type")
+
+
+class _Interner:
+    __slots__ = ("codes", "names")
+
+    def __init__(self) -> None:
+        self.codes: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.names)
+            self.codes[value] = code
+            self.names.append(value)
+        return code
+
+
+class _LogicalView:
+    """Oldest-first indexable view over a ring column (used for bisect)."""
+
+    def __init__(self, column: array, start: int, size: int) -> None:
+        self._column = column
+        self._start = start
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, i: int) -> float:
+        cap = len(self._column)
+        return self._column[(self._start + i) % cap]
+
+
+class ColumnarEventStore:
+    def __init__(self, capacity: int = 1000) -> None:
+        self.capacity = max(1, int(capacity))
+        self._columns: Dict[str, array] = {
+            name: array(code, bytes(array(code).itemsize * self.capacity))
+            for name, code in NUMERIC_COLUMNS.items()
+        }
+        for name in CODE_COLUMNS:
+            self._columns[name] = array("I", bytes(array("I").itemsize * self.capacity))
+        self._interners: Dict[str, _Interner] = {name: _Interner() for name in CODE_COLUMNS}
+        self._next = 0  # total events ever appended
+        self._last_ts = float("-inf")
+        self._inversion = -1  # sequence number of the latest append with ts < the previous ts
+
+        # Bind hot-path columns once.
+        c = self._columns
+        self._ts, self._lat, self._tin, self._tout = c["ts"], c["latency_ms"], c["tokens_in"], c["tokens_out"]
+        self._queue, self._cost = c["queue_depth"], c["cost_estimate"]
+        self._ttft, self._itl = c["ttft_ms"], c["itl_ms"]
+        self._rt, self._model, self._err = c["request_type"], c["model_id"], c["error_type"]
+        self._rt_codes = self._interners["request_type"]
+        self._model_codes = self._interners["model_id"]
+        self._err_codes = self._interners["error_type"]
+
+    # -- writes --------------------------------------------------------------
+
+    def append(
+        self,
+        ts: float,
+        latency_ms: float,
+        tokens_in: int,
+        tokens_out: int,
+        error_type: str,
+        request_type: str,
+        model_id: str,
+        queue_depth: float,
+        cost_estimate: float,
+        ttft_ms: float = 0.0,
+        itl_ms: float = 0.0,
+    ) -> None:
+        i = self._next % self.capacity
+        if ts < self._last_ts:
+            self._inversion = self._next
+        self._last_ts = ts
+        self._ts[i] = ts
+        self._lat[i] = latency_ms
+        self._tin[i] = tokens_in
+        self._tout[i] = tokens_out
+        self._queue[i] = queue_depth
+        self._cost[i] = cost_estimate
+        self._ttft[i] = ttft_ms
+        self._itl[i] = itl_ms
+        self._rt[i] = self._rt_codes.code(request_type)
+        self._model[i] = self._model_codes.code(model_id)
+        self._err[i] = self._err_codes.code(error_type)
+        self._next += 1
+
+    # -- layout --------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return min(self._next, self.capacity)
+
+    @property
+    def total_appended(self) -> int:
+        return self._next
+
+    @property
+    def ordered(self) -> bool:
+        """True while the live rows are in non-decreasing `ts` order."""
+        # The inversion at seq i is between rows i-1 and i; it matters while both are live.
+        return self._inversion < 0 or self._inversion <= self._next - self.capacity
+
+    def _start(self) -> int:
+        """Physical index of the oldest live event."""
+        return self._next % self.capacity if self._next > self.capacity else 0
+
+    def _physical(self, logical: int) -> int:
+        return (self._start() + logical) % self.capacity
+
+    def names(self, column: str) -> List[str]:
+        """Code table for an interned column (code -> string)."""
+        return list(self._interners[column].names)
+
+    def segments(self, column: str, start: int = 0, stop: Optional[int] = None) -> List[memoryview]:
+        """
+        Zero-copy views of `column` for logical rows [start, stop), oldest first.
+
+        The views alias the ring buffer: later appends overwrite them in place.
+        """
+        size = len(self)
+        stop = size if stop is None else max(0, min(stop, size))
+        start = max(0, min(start, stop))
+        if start == stop:
+            return []
+        mv = memoryview(self._columns[column])
+        a = self._physical(start)
+        b = a + (stop - start)
+        if b <= self.capacity:
+            return [mv[a:b]]
+        return [mv[a:], mv[: b - self.capacity]]
+
+    def time_range(self, t0: Optional[float] = None, t1: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Logical [start, stop) covering t0 <= ts < t1. Exact while `ordered`;
+        otherwise the smallest span holding every match (rows inside it may
+        fall outside the range, see `_mask`).
+        """
+        view = _LogicalView(self._ts, self._start(), len(self))
+        if t0 is None and t1 is None:
+            return 0, len(view)
+        if self.ordered:
+            start = 0 if t0 is None else bisect_left(view, t0)
+            stop = len(view) if t1 is None else bisect_left(view, t1)
+            return start, max(start, stop)
+        hits = [i for i in range(len(view)) if _in_range(view[i], t0, t1)]
+        return (hits[0], hits[-1] + 1) if hits else (0, 0)
+
+    def _mask(self, start: int, stop: int, t0: Optional[float], t1: Optional[float]):
+        """Per-row keep flags for [start, stop) when the span may hold out-of-range rows, else None."""
+        if self.ordered or (t0 is None and t1 is None):
+            return None
+        ts = self._values("ts", start, stop)
+        if np is not None:
+            keep = np.ones(len(ts), dtype=bool)
+            if t0 is not None:
+                keep &= ts >= t0
+            if t1 is not None:
+                keep &= ts < t1
+            return keep
+        return [_in_range(v, t0, t1) for v in ts]
+
+    # -- rows (compat) -------------------------------------------------------
+
+    def row(self, logical: int) -> tuple:
+        i = self._physical(logical)
+        return (
+            self._ts[i],
+            self._lat[i],
+            self._tin[i],
+            self._tout[i],
+            self._err_codes.names[self._err[i]],
+            self._rt_codes.names[self._rt[i]],
+            self._model_codes.names[self._model[i]],
+            self._queue[i],
+            self._cost[i],
+            self._ttft[i],
+            self._itl[i],
+        )
+
+    def rows(self) -> Iterator[tuple]:
+        for logical in range(len(self)):
+            yield self.row(logical)
+
+    # -- aggregates ----------------------------------------------------------
+
+    def _values(self, column: str, start: int, stop: int, keep=None):
+        segs = self.segments(column, start, stop)
+        if np is not None:
+            code = self._columns[column].typecode
+            dtype = {"d": np.float64, "q": np.int64, "I": np.uint32}[code]
+            parts = [np.frombuffer(s, dtype=dtype) for s in segs]
+            if not parts:
+                return np.empty(0, dtype=dtype)
+            values = parts[0] if len(parts) == 1 else np.concatenate(parts)
+            return values if keep is None else values[keep]
+        flat = segs[0] if len(segs) == 1 else [v for seg in segs for v in seg]
+        if keep is not None:
+            return [v for v, k in zip(flat, keep) if k]
+        return flat
+
+    def percentiles(
+        self,
+        qs: Sequence[float] = (0.5, 0.95, 0.99),
+        *,
+        column: str = "latency_ms",
+        t0: Optional[float] = None,
+        t1: Optional[float] = None,
+    ) -> List[float]:
+        """Exact percentiles (nearest-rank, floor) of `column` over a time range."""
+        start, stop = self.time_range(t0, t1)
+        values = self._values(column, start, stop, self._mask(start, stop, t0, t1))
+        n = len(values)
+        if n == 0:
+            return [0.0 for _ in qs]
+        idx = [int(min(1.0, max(0.0, q)) * (n - 1)) for q in qs]
+        if np is not None:
+            part = np.partition(values, sorted(set(idx)))
+            return [float(part[i]) for i in idx]
+        ordered = sorted(values)
+        return [float(ordered[i]) for i in idx]
+
+    def group_by_model(self, *, t0: Optional[float] = None, t1: Optional[float] = None) -> Dict[str, dict]:
+        """Per-model rollup: count, errors, avg latency, tokens and cost."""
+        start, stop = self.time_range(t0, t1)
+        keep = self._mask(start, stop, t0, t1)
+        names = self._model_codes.names
+        err_none = self._err_codes.codes.get("")
+        models = self._values("model_id", start, stop, keep)
+        errors = self._values("error_type", start, stop, keep)
+        latency = self._values("latency_ms", start, stop, keep)
+        tin = self._values("tokens_in", start, stop, keep)
+        tout = self._values("tokens_out", start, stop, keep)
+        cost = self._values("cost_estimate", start, stop, keep)
+
+        if np is not None:
+            k = len(names)
+            count = np.bincount(models, minlength=k)
+            is_err = np.ones(len(errors), dtype=bool) if err_none is None else errors != err_none
+            err = np.bincount(models, weights=is_err, minlength=k)
+            lat = np.bincount(models, weights=latency, minlength=k)
+            ti = np.bincount(models, weights=tin, minlength=k)
+            to = np.bincount(models, weights=tout, minlength=k)
+            co = np.bincount(models, weights=cost, minlength=k)
+            rows = {
+                names[m]: (int(count[m]), int(err[m]), float(lat[m]), int(ti[m]), int(to[m]), float(co[m]))
+                for m in range(k)
+                if count[m]
+            }
+        else:
+            k = len(names)
+            count = Counter(models)
+            if err_none is None:
+                err = [count.get(m, 0) for m in range(k)]
+            else:
+                err = _sum_by(models, map(err_none.__ne__, errors), k)
+            lat = _sum_by(models, latency, k)
+            ti = _sum_by(models, tin, k)
+            to = _sum_by(models, tout, k)
+            co = _sum_by(models, cost, k)
+            rows = {names[m]: (n, err[m], lat[m], ti[m], to[m], co[m]) for m, n in count.items()}
+
+        return {
+            name: {
+                "count": int(n),
+                "errors": int(e),
+                "error_rate": e / n,
+                "avg_latency_ms": lat_sum / n,
+                "tokens_in": int(a),
+                "tokens_out": int(b),
+                "cost": c,
+            }
+            for name, (n, e, lat_sum, a, b, c) in rows.items()
+        }
+
+
+def _in_range(ts: float, t0: Optional[float], t1: Optional[float]) -> bool:
+    return (t0 is None or ts >= t0) and (t1 is None or ts < t1)
+
+
+def _sum_by(codes: Iterable[int], values: Iterable[float], k: int) -> List[float]:
+    sums = [0] * k
+    for code, value in zip(codes, values):
+        sums[code] += value
+    return sums
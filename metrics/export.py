@@ -0,0 +1,269 @@
+"""
+Metrics Export (MVP)
+
+Purpose
+- Keep event history beyond the collector's in-memory window (capacity
+  planning) without ever blocking the request path on I/O.
+
+Pipeline
+- `MetricsCollector(exporter=...)` hands each recorded event row to
+  `MetricsExporter.offer()`: one bounded-deque append, no I/O, no waiting.
+  offer() is safe to call from many threads (the shards of a
+  ShardedMetricsCollector share one exporter): the backpressure checks and
+  counters sit under a short lock that is never held across I/O.
+- A background thread drains the queue in batches (`batch_size`, or whatever
+  is queued after `flush_interval_s`) and hands `MetricEvent` lists to a sink.
+- Sinks: `JsonlSink` (append-only event log), `PrometheusTextSink`
+  (text-exposition snapshot for the node_exporter textfile collector), or any
+  `ExportSink` subclass.
+
+Backpressure (when the sink cannot keep up)
+- "drop_oldest": the queue keeps the newest `max_queue` events; evictions are
+  counted in `dropped`.
+- "sample": once the queue is more than `sample_above` full, only every
+  `sample_every`-th event is admitted (`sampled_out`); a full queue drops the
+  newcomer (`dropped`).
+
+Hard constraints for MVP
+- Stdlib only; one exporter thread; sink errors are counted, never raised
+  into the request path.
+
+Non-goals
+- Not a Prometheus client / HTTP endpoint; not remote write.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from .collector import MetricEvent
+from .periodic import PeriodicTask
+from .sketch import QuantileSketch
+
+PathLike = Union[str, Path]
+
+DROP_OLDEST = "drop_oldest"
+SAMPLE = "sample"
+
+
+class ExportSink(ABC):
+    """Receives batches of events on the exporter thread."""
+
+    @abstractmethod
+    def write_batch(self, events: List[MetricEvent]) -> None:
+        """Export one batch; an exception counts as a sink error, not a crash."""
+
+    def close(self) -> None:
+        return None
+
+
+class JsonlSink(ExportSink):
+    """Appends one JSON object per event."""
+
+    def __init__(self, path: PathLike) -> None:
+        self.path = Path(path)
+        self._f = open(self.path, "a", encoding="utf-8")
+
+    def write_batch(self, events: List[MetricEvent]) -> None:
+        self._f.write("".join(json.dumps(vars(e), separators=(",", ":")) + "\n" for e in events))
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Series:
+    __slots__ = ("requests", "errors", "tokens_in", "tokens_out", "cost", "latency_sum", "latency")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.cost = 0.0
+        self.latency_sum = 0.0
+        self.latency = QuantileSketch()
+
+
+class PrometheusTextSink(ExportSink):
+    """
+    Cumulative per-(model_id, request_type) counters and a latency summary,
+    rewritten atomically after every batch.
+    """
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, path: PathLike, *, prefix: str = "latch") -> None:
+        self.path = Path(path)
+        self.prefix = prefix
+        self._series: Dict[Tuple[str, str], _Series] = {}
+
+    def write_batch(self, events: List[MetricEvent]) -> None:
+        for e in events:
+            key = (e.model_id, e.request_type)
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.requests += 1
+            series.errors += 1 if e.error_type else 0
+            series.tokens_in += e.tokens_in
+            series.tokens_out += e.tokens_out
+            series.cost += e.cost_estimate
+            series.latency_sum += e.latency_ms
+            series.latency.add(e.latency_ms)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def render(self) -> str:
+        p = self.prefix
+        counters = (
+            ("requests_total", "Requests recorded.", lambda s: s.requests),
+            ("errors_total", "Requests that ended in an error.", lambda s: s.errors),
+            ("tokens_in_total", "Prompt tokens.", lambda s: s.tokens_in),
+            ("tokens_out_total", "Completion tokens.", lambda s: s.tokens_out),
+            ("cost_total", "Estimated cost.", lambda s: s.cost),
+        )
+        labels = {
+            key: f'model_id="{_escape_label(key[0])}",request_type="{_escape_label(key[1])}"' for key in self._series
+        }
+        lines: List[str] = []
+        for name, help_text, value in counters:
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} counter")
+            for key, series in self._series.items():
+                lines.append(f"{p}_{name}{{{labels[key]}}} {value(series)}")
+        lines.append(f"# HELP {p}_latency_ms Request latency in milliseconds.")
+        lines.append(f"# TYPE {p}_latency_ms summary")
+        for key, series in self._series.items():
+            for q, v in zip(self.QUANTILES, series.latency.quantiles(self.QUANTILES)):
+                lines.append(f'{p}_latency_ms{{{labels[key]},quantile="{q}"}} {v:.3f}')
+            lines.append(f"{p}_latency_ms_sum{{{labels[key]}}} {series.latency_sum:.3f}")
+            lines.append(f"{p}_latency_ms_count{{{labels[key]}}} {series.requests}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    def __init__(
+        self,
+        sink: ExportSink,
+        *,
+        max_queue: int = 10_000,
+        batch_size: int = 512,
+        flush_interval_s: float = 1.0,
+        policy: str = DROP_OLDEST,
+        sample_above: float = 0.5,
+        sample_every: int = 10,
+        start: bool = True,
+    ) -> None:
+        if policy not in (DROP_OLDEST, SAMPLE):
+            raise ValueError(f"unknown backpressure policy {policy!r}")
+        self.sink = sink
+        self.max_queue = max(1, int(max_queue))
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval_s = float(flush_interval_s)
+        self.policy = policy
+        self._sample_threshold = int(self.max_queue * float(sample_above))
+        self.sample_every = max(1, int(sample_every))
+        # drop_oldest relies on the deque bound; sample checks the length itself.
+        self._queue: Deque[Tuple] = deque(maxlen=self.max_queue if policy == DROP_OLDEST else None)
+        self._flusher = PeriodicTask("latch-metrics-export", self.drain)
+        self._offer_lock = threading.Lock()
+        self._offers = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.exported = 0
+        self.batches = 0
+        self.sink_errors = 0
+        self.close_timeouts = 0
+        if start:
+            self.start()
+
+    # -- request path --------------------------------------------------------------
+
+    def offer(self, row: Tuple) -> None:
+        """Queue one event row (MetricEvent field order). Never blocks on I/O."""
+        queue = self._queue
+        with self._offer_lock:
+            depth = len(queue)
+            if self.policy == DROP_OLDEST:
+                if depth >= self.max_queue:
+                    self.dropped += 1
+            else:
+                if depth >= self.max_queue:
+                    self.dropped += 1
+                    return
+                if depth >= self._sample_threshold:
+                    self._offers += 1
+                    if self._offers % self.sample_every:
+                        self.sampled_out += 1
+                        return
+            queue.append(row)
+        if depth + 1 >= self.batch_size:
+            self._flusher.wake()
+
+    # -- exporter thread ------------------------------------------------------------
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def start(self) -> None:
+        self._flusher.start(self.flush_interval_s)
+
+    def drain(self, max_batches: Optional[int] = None) -> int:
+        """Export everything queued (in `batch_size` chunks). Returns events exported."""
+        queue = self._queue
+        n = 0
+        batches = 0
+        while queue and (max_batches is None or batches < max_batches):
+            batch: List[MetricEvent] = []
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(MetricEvent(*queue.popleft()))
+            except IndexError:
+                pass
+            try:
+                self.sink.write_batch(batch)
+                self.exported += len(batch)
+                n += len(batch)
+            except Exception:
+                self.sink_errors += 1
+            self.batches += 1
+            batches += 1
+        return n
+
+    def close(self, timeout_s: Optional[float] = 5.0) -> None:
+        """
+        Stop the thread, export what is still queued, close the sink.
+
+        If the thread is still inside the sink after `timeout_s`, nothing is
+        drained or closed here (that would race it); `close_timeouts` is bumped
+        and a later close() finishes the job.
+        """
+        if not self._flusher.stop(timeout_s):
+            self.close_timeouts += 1
+            return
+        self.drain()
+        self.sink.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "export_queue_depth": len(self._queue),
+            "export_exported": self.exported,
+            "export_batches": self.batches,
+            "export_dropped": self.dropped,
+            "export_sampled_out": self.sampled_out,
+            "export_sink_errors": self.sink_errors,
+            "export_close_timeouts": self.close_timeouts,
+        }
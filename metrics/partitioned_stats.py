@@ -0,0 +1,116 @@
+"""
+Partitioned Rolling Stats (MVP)
+
+Purpose
+- One slow model or one noisy tenant should make only its own traffic look
+  hot. Stats are kept per (intent, tier, model_id) alongside the global
+  RollingStats, so the control loop can decide per partition.
+
+Bounds
+- At most `max_keys` partitions (the global memory cap; each partition is a
+  RollingStats with a small `window` and a short wall-clock window).
+- LRU: recording moves a key to the back; a new key beyond the cap evicts the
+  least recently recorded one. Keys idle for `idle_ttl_s` are evicted too
+  (checked lazily at the LRU head, O(1) amortized).
+
+Hot path
+- `record` and `get` are a dict lookup plus (for `record`) an O(1) reorder.
+
+Thread safety
+- One instance may be shared by many writers (e.g. every shard of a
+  ShardedMetricsCollector), so `record`, `record_stream` and `snapshot` touch
+  a partition's RollingStats only under the lock. `get` hands the stats out
+  unlocked: read plain counters from it, snapshot through `snapshot(key)`.
+
+Hard constraints for MVP
+- In-memory, per process, stdlib only.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterator, Optional, Tuple
+
+from .rolling_stats import RollingStats
+
+PartitionKey = Tuple[str, str, str]  # (intent, tier, model_id)
+
+
+class PartitionedStats:
+    def __init__(
+        self,
+        *,
+        max_keys: int = 256,
+        window: int = 256,
+        bucket_s: float = 1.0,
+        buckets: int = 10,
+        idle_ttl_s: Optional[float] = 600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_keys = max(1, int(max_keys))
+        self.window = int(window)
+        self.bucket_s = float(bucket_s)
+        self.buckets = int(buckets)
+        self.idle_ttl_s = idle_ttl_s
+        self._clock = clock
+        # key -> (stats, last recorded at); LRU order, oldest first.
+        self._parts: "OrderedDict[PartitionKey, Tuple[RollingStats, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._parts)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._parts
+
+    def keys(self) -> Iterator[PartitionKey]:
+        return iter(list(self._parts))
+
+    def get(self, key: PartitionKey) -> Optional[RollingStats]:
+        entry = self._parts.get(key)
+        return entry[0] if entry is not None else None
+
+    def record(
+        self,
+        key: PartitionKey,
+        allowed: bool,
+        latency_ms: float,
+        cost: float,
+        queue_depth: float,
+        ts: Optional[float] = None,
+    ) -> RollingStats:
+        now = self._clock() if ts is None else ts
+        with self._lock:
+            entry = self._parts.get(key)
+            if entry is None:
+                stats = RollingStats(self.window, bucket_s=self.bucket_s, buckets=self.buckets, clock=self._clock)
+                self._evict(now)
+            else:
+                stats = entry[0]
+                self._parts.move_to_end(key)
+            self._parts[key] = (stats, now)
+            stats.record(allowed, latency_ms, cost, queue_depth, ts)
+        return stats
+
+    def record_stream(self, key: PartitionKey, ttft_ms: float, itl_ms: Optional[float] = None) -> None:
+        """Streamed-call timings for a partition recorded by `record` (no-op once it was evicted)."""
+        with self._lock:
+            entry = self._parts.get(key)
+            if entry is not None:
+                entry[0].record_stream(ttft_ms, itl_ms)
+
+    def _evict(self, now: float) -> None:
+        """Make room for one new key. Caller holds the lock."""
+        parts = self._parts
+        ttl = self.idle_ttl_s
+        while parts and (len(parts) >= self.max_keys or (ttl is not None and now - next(iter(parts.values()))[1] > ttl)):
+            parts.popitem(last=False)
+            self.evictions += 1
+
+    def snapshot(self, key: PartitionKey) -> Optional[dict]:
+        with self._lock:
+            entry = self._parts.get(key)
+            return entry[0].snapshot() if entry is not None else None
@@ -0,0 +1,76 @@
+"""
+Periodic Background Work (MVP)
+
+Purpose
+- One daemon-thread loop for every "do this off the request path every N
+  seconds" job: SignalsCache refresh, LatencyModel updates, IntentRegistry
+  file polling, MetricsAggregator merging and MetricsExporter flushing.
+
+How it works
+- `start(interval_s)` launches a thread named `name` that calls `fn` every
+  `interval_s`; a second `start()` while running is a no-op.
+- `wake()` runs the next tick right away (the exporter flushes early when a
+  batch fills up).
+- An exception in `fn` is counted in `errors` and the loop goes on; the
+  next tick retries.
+- `stop(timeout_s)` ends the loop and joins the thread. It returns False
+  (and keeps the thread, so a later stop() can finish) if the thread is
+  still inside `fn` after `timeout_s`.
+
+Hard constraints for MVP
+- Stdlib only; one thread per task, no shared scheduler.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable, Optional
+
+
+class PeriodicTask:
+    def __init__(self, name: str, fn: Callable[[], object]) -> None:
+        self.name = name
+        self._fn = fn
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self.errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, interval_s: float) -> None:
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._wake.clear()
+        self._thread = threading.Thread(target=self._run, args=(float(interval_s),), name=self.name, daemon=True)
+        self._thread.start()
+
+    def _run(self, interval_s: float) -> None:
+        wake = self._wake
+        while True:
+            wake.wait(interval_s)
+            if self._stopping:
+                return
+            wake.clear()
+            try:
+                self._fn()
+            except Exception:
+                self.errors += 1
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout_s: Optional[float] = 1.0) -> bool:
+        thread = self._thread
+        if thread is None:
+            return True
+        self._stopping = True
+        self._wake.set()
+        thread.join(timeout_s)
+        if thread.is_alive():
+            return False
+        self._thread = None
+        return True
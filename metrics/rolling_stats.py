@@ -4,63 +4,191 @@ Rolling Stats (MVP)
 Purpose
 - Maintain rolling aggregates required by the control loop:
   - moving average
-  - p50/p95 approximations (simple is fine)
-  - error rate over a short window
+  - p50/p95/p99/p999 from a streaming quantile sketch (see `metrics.sketch`)
+  - error rate, qps and cost/sec over the last N seconds (see `metrics.time_window`)
+  - for streamed calls: p50/p95 time-to-first-token and inter-token latency
 
 Hard constraints for MVP
 - Keep implementation simple and deterministic.
 - No external libraries needed beyond stdlib.
 - Operate on a bounded in-memory window.
+- Recording is O(1); snapshot cost is independent of the window size.
 
 Non-goals
-- No heavy quantile algorithms.
 - No time-series database integration.
 """
 
+import time
 from collections import deque
-from typing import Deque
+from typing import Callable, Deque, List, Optional
+
+from .sketch import DEFAULT_QUANTILES, QuantileSketch
+from .time_window import TimeWindowStats
 
 
 class RollingStats:
-    def __init__(self, window: int = 50) -> None:
-        self.window: Deque[float] = deque(maxlen=window)
+    def __init__(
+        self,
+        window: int = 1024,
+        *,
+        relative_accuracy: float = 0.01,
+        bucket_s: float = 1.0,
+        buckets: int = 60,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        # The window keeps sketch bucket keys (not raw latencies) so samples can be
+        # evicted from the sketch when they fall out of the window.
+        self.window: Deque[int] = deque(maxlen=window)
+        self.sketch = QuantileSketch(relative_accuracy=relative_accuracy)
         self.count = 0
         self.allowed = 0
         self.total_cost = 0.0
         self.total_latency = 0.0
         self.total_queue = 0.0
+        # Wall-clock window for rates (qps, error rate, cost/sec) over the last N seconds.
+        self.recent = TimeWindowStats(
+            bucket_s=bucket_s,
+            buckets=buckets,
+            relative_accuracy=relative_accuracy,
+            clock=clock,
+        )
+        # Streamed calls only: TTFT and mean inter-token gap, same window size.
+        self.streams = 0
+        self.ttft_window: Deque[int] = deque(maxlen=window)
+        self.ttft_sketch = QuantileSketch(relative_accuracy=relative_accuracy)
+        self.itl_window: Deque[int] = deque(maxlen=window)
+        self.itl_sketch = QuantileSketch(relative_accuracy=relative_accuracy)
 
-    def record(self, allowed: bool, latency_ms: float, cost: float, queue_depth: float) -> None:
+    def record(
+        self,
+        allowed: bool,
+        latency_ms: float,
+        cost: float,
+        queue_depth: float,
+        ts: Optional[float] = None,
+        error: Optional[bool] = None,
+    ) -> None:
+        """
+        `allowed` feeds allow_rate; `error` (default: not allowed, as for SDK
+        events where only failed calls are not allowed) feeds error_rate.
+        Callers that record denials / sheds pass `error` explicitly.
+        """
         self.count += 1
         if allowed:
             self.allowed += 1
         self.total_cost += cost
         self.total_latency += latency_ms
         self.total_queue += queue_depth
-        self.window.append(latency_ms)
+        self._push_key(self.sketch.key(latency_ms))
+        self.recent.record(allowed if error is None else not error, latency_ms, cost, queue_depth, ts)
+
+    def record_stream(self, ttft_ms: float, itl_ms: Optional[float] = None) -> None:
+        """Record a streamed call's TTFT (and mean inter-token gap, if it had 2+ tokens)."""
+        self.streams += 1
+        _push(self.ttft_window, self.ttft_sketch, self.ttft_sketch.key(ttft_ms))
+        if itl_ms is not None:
+            _push(self.itl_window, self.itl_sketch, self.itl_sketch.key(itl_ms))
+
+    def _push_key(self, key: int) -> None:
+        window = self.window
+        sketch = self.sketch
+        if len(window) == window.maxlen:
+            sketch.remove_key(window[0])
+        window.append(key)
+        sketch.add_key(key)
+
+    def merge(self, other: "RollingStats", *, replay_window: bool = True) -> None:
+        """
+        Fold another worker's/shard's stats into this one.
 
-    def _p95(self) -> float:
-        if not self.window:
-            return 0.0
-        values = sorted(self.window)
-        idx = int(0.95 * (len(values) - 1))
-        return values[idx]
+        `replay_window=False` merges the sketches directly instead of replaying
+        the other window key by key: much cheaper, but the result is only good
+        for `snapshot()` (its window no longer matches its sketch).
+        """
+        if other.sketch.relative_accuracy != self.sketch.relative_accuracy:
+            raise ValueError("cannot merge RollingStats with different relative_accuracy")
+        self.count += other.count
+        self.allowed += other.allowed
+        self.total_cost += other.total_cost
+        self.total_latency += other.total_latency
+        self.total_queue += other.total_queue
+        self.streams += other.streams
+        if replay_window:
+            for key in other.window:
+                self._push_key(key)
+            for key in other.ttft_window:
+                _push(self.ttft_window, self.ttft_sketch, key)
+            for key in other.itl_window:
+                _push(self.itl_window, self.itl_sketch, key)
+        else:
+            self.sketch.merge(other.sketch)
+            self.ttft_sketch.merge(other.ttft_sketch)
+            self.itl_sketch.merge(other.itl_sketch)
+        self.recent.merge(other.recent)
+
+    def quantile(self, q: float) -> float:
+        return self.sketch.quantile(q)
 
     def snapshot(self) -> dict:
         if self.count == 0:
-            return {
+            out = {
                 "count": 0,
                 "allow_rate": 0.0,
                 "avg_latency_ms": 0.0,
+                "p50_latency_ms": 0.0,
                 "p95_latency_ms": 0.0,
+                "p99_latency_ms": 0.0,
+                "p999_latency_ms": 0.0,
                 "avg_cost": 0.0,
                 "avg_queue_depth": 0.0,
             }
-        return {
+            out.update(self.recent.snapshot())
+            out.update(self._stream_snapshot())
+            return out
+        p50, p95, p99, p999 = self.sketch.quantiles(DEFAULT_QUANTILES)
+        out = {
             "count": self.count,
             "allow_rate": self.allowed / self.count,
             "avg_latency_ms": self.total_latency / self.count,
-            "p95_latency_ms": self._p95(),
+            "p50_latency_ms": p50,
+            "p95_latency_ms": p95,
+            "p99_latency_ms": p99,
+            "p999_latency_ms": p999,
             "avg_cost": self.total_cost / self.count,
             "avg_queue_depth": self.total_queue / self.count,
         }
+        out.update(self.recent.snapshot())
+        out.update(self._stream_snapshot())
+        return out
+
+    def _stream_snapshot(self) -> dict:
+        ttft_p50, ttft_p95 = self.ttft_sketch.quantiles((0.5, 0.95))
+        itl_p50, itl_p95 = self.itl_sketch.quantiles((0.5, 0.95))
+        return {
+            "streams": self.streams,
+            "p50_ttft_ms": ttft_p50,
+            "p95_ttft_ms": ttft_p95,
+            "p50_itl_ms": itl_p50,
+            "p95_itl_ms": itl_p95,
+        }
+
+
+def _push(window: Deque[int], sketch: QuantileSketch, key: int) -> None:
+    """Append a sketch key to a bounded window, evicting the oldest from the sketch."""
+    if len(window) == window.maxlen:
+        sketch.remove_key(window[0])
+    window.append(key)
+    sketch.add_key(key)
+
+
+def merge_stats(stats: List[RollingStats], window: Optional[int] = None) -> RollingStats:
+    """Combine per-worker stats into a fresh RollingStats (inputs are not mutated)."""
+    size = window if window is not None else sum(s.window.maxlen or len(s.window) for s in stats) or 1024
+    if stats:
+        ref = stats[0].recent
+        out = RollingStats(window=size, bucket_s=ref.bucket_s, buckets=ref.buckets, clock=ref.clock)
+    else:
+        out = RollingStats(window=size)
+    for s in stats:
+        out.merge(s)
+    return out
@@ -0,0 +1,187 @@
+"""
+Thread-Sharded Metrics Collector
+
+Purpose
+- A MetricsCollector for threaded servers: recording never serializes
+  request threads behind one lock, and stats are never torn.
+
+How it works
+- A fixed set of shards (each a plain MetricsCollector plus its own lock).
+  Each thread is pinned to one shard on first use, round-robin, so with at
+  least as many shards as busy threads every thread writes to a private shard
+  and its lock is uncontended.
+- More threads than shards is still correct: threads that share a shard
+  serialize on that shard's lock only.
+- `snapshot()` folds every shard into one view (sketches merged directly, no
+  window replay); each shard is locked only while it is folded in.
+  Percentiles cover each shard's last `window` events.
+- Consumers passed in (`partitions`, `exporter`, `latency_model`) are one
+  instance shared by every shard, so a shard lock does not cover them; each
+  guards itself: PartitionedStats records under its own lock, and the
+  exporter's and latency model's offer() take a short lock of their own.
+
+Hard constraints for MVP
+- Same API as MetricsCollector; stdlib only.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from itertools import count
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .collector import MetricEvent, MetricsCollector, add_counters
+from .partitioned_stats import PartitionedStats
+from .rolling_stats import RollingStats
+
+
+class _Shard:
+    __slots__ = ("lock", "collector")
+
+    def __init__(
+        self,
+        max_events: int,
+        exporter: Optional[Any],
+        partitions: Optional[PartitionedStats],
+        latency_model: Optional[Any],
+    ) -> None:
+        self.lock = threading.Lock()
+        self.collector = MetricsCollector(
+            max_events=max_events, exporter=exporter, partitions=partitions, latency_model=latency_model
+        )
+
+
+class ShardedMetricsCollector:
+    def __init__(
+        self,
+        *,
+        shards: Optional[int] = None,
+        max_events: int = 1000,
+        exporter: Optional[Any] = None,
+        partitions: Optional[PartitionedStats] = None,
+        latency_model: Optional[Any] = None,
+    ) -> None:
+        n = int(shards) if shards else min(32, (os.cpu_count() or 1) * 2)
+        self.max_events = int(max_events)
+        # Shared by every shard; each locks internally (see the module docstring).
+        self.exporter = exporter
+        self.partitions = partitions
+        self.latency_model = latency_model
+        self._shards: List[_Shard] = [
+            _Shard(self.max_events, exporter, partitions, latency_model) for _ in range(max(1, n))
+        ]
+        self._next = count()
+        self._local = threading.local()
+
+    @property
+    def shards(self) -> int:
+        return len(self._shards)
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._shards[next(self._next) % len(self._shards)]
+            self._local.shard = shard
+        return shard
+
+    # -- recording (MetricsCollector API) -----------------------------------------
+
+    def record(self, outcome: Dict[str, str]) -> None:
+        shard = self._shard()
+        with shard.lock:
+            shard.collector.record(outcome)
+
+    def record_event(
+        self,
+        latency_ms: float,
+        tokens_in: int,
+        tokens_out: int,
+        error_type: Optional[str],
+        request_type: str,
+        model_id: str,
+        ts: float,
+        *,
+        queue_depth: float = 0.0,
+        cost_estimate: float = 0.0,
+        intent: str = "",
+        tier: str = "",
+        ttft_ms: Optional[float] = None,
+        itl_ms: Optional[float] = None,
+    ) -> None:
+        shard = self._shard()
+        with shard.lock:
+            shard.collector.record_event(
+                latency_ms,
+                tokens_in,
+                tokens_out,
+                error_type,
+                request_type,
+                model_id,
+                ts,
+                queue_depth=queue_depth,
+                cost_estimate=cost_estimate,
+                intent=intent,
+                tier=tier,
+                ttft_ms=ttft_ms,
+                itl_ms=itl_ms,
+            )
+
+    def record_events(self, rows: Iterable[Tuple]) -> int:
+        shard = self._shard()
+        with shard.lock:
+            return shard.collector.record_events(rows)
+
+    def incr(self, name: str, n: int = 1) -> None:
+        shard = self._shard()
+        with shard.lock:
+            shard.collector.incr(name, n)
+
+    # -- reading -----------------------------------------------------------------
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for shard in self._shards:
+            with shard.lock:
+                items = list(shard.collector.counters.items())
+            for name, n in items:
+                out[name] = out.get(name, 0) + n
+        return out
+
+    def merged_stats(self) -> RollingStats:
+        """All shards folded into one RollingStats (good for snapshot(), not for recording)."""
+        ref = self._shards[0].collector.stats
+        out = RollingStats(
+            window=1,
+            relative_accuracy=ref.sketch.relative_accuracy,
+            bucket_s=ref.recent.bucket_s,
+            buckets=ref.recent.buckets,
+            clock=ref.recent.clock,
+        )
+        for shard in self._shards:
+            with shard.lock:
+                if shard.collector.stats.count:
+                    out.merge(shard.collector.stats, replay_window=False)
+        return out
+
+    def snapshot(self) -> dict:
+        return add_counters(self.merged_stats().snapshot(), self.counters)
+
+    def events(self) -> List[MetricEvent]:
+        """Most recent `max_events` events across shards, oldest first."""
+        rows: List[MetricEvent] = []
+        for shard in self._shards:
+            with shard.lock:
+                rows.extend(shard.collector.events())
+        rows.sort(key=lambda e: e.ts)
+        return rows[-self.max_events :]
+
+    def last_event(self) -> Optional[MetricEvent]:
+        latest: Optional[MetricEvent] = None
+        for shard in self._shards:
+            with shard.lock:
+                event = shard.collector.last_event()
+            if event is not None and (latest is None or event.ts >= latest.ts):
+                latest = event
+        return latest
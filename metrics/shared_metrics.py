@@ -0,0 +1,381 @@
+"""
+Shared-Memory Metrics (multi-process)
+
+Purpose
+- One consistent view of load across a host running one SDK worker process
+  per core, with no IPC on the request path.
+
+Layout (all `multiprocessing.shared_memory` segments, named from one prefix)
+- One ring per worker: header (write_seq, capacity) + fixed-size records
+    (ts, latency_ms, cost, queue_depth, tokens_in, tokens_out, allowed, error).
+  Each ring has exactly one writer process, which fills slot `seq % capacity`
+  and then publishes `seq + 1`. Threads in that process serialize on the
+  ring's local lock; readers never lock.
+- One view segment: the aggregator's latest RollingStats snapshot, guarded by
+  a seqlock (version is odd while a publish is in progress).
+
+Flow
+- Workers use `SharedMetricsCollector` as their LatchClient `metrics`: events
+  are recorded locally as before and appended to the worker's ring;
+  `snapshot()` returns the host-wide view (falling back to local stats when
+  the view is missing or stale).
+- `MetricsAggregator` (usually in the parent) drains every ring into one
+  global RollingStats and republishes the view, on demand (`poll()`) or from
+  a background thread (`start()`).
+
+Hard constraints for MVP
+- Stdlib only. Readers detect torn reads (ring overrun, view mid-publish) and
+  drop / retry instead of locking; overrun records are counted as dropped.
+
+Non-goals
+- Not cross-host aggregation.
+"""
+
+from __future__ import annotations
+
+import os
+import secrets
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .collector import MetricsCollector, outcome_error
+from .partitioned_stats import PartitionedStats
+from .periodic import PeriodicTask
+from .rolling_stats import RollingStats
+
+_RING_HEADER = struct.Struct("<QQ")  # write_seq, capacity
+_RECORD = struct.Struct("<ddddiiBB6x")  # ts, latency_ms, cost, queue_depth, tokens_in, tokens_out, allowed, error
+_VIEW_HEADER = struct.Struct("<Qd")  # version, published_at
+# Snapshot keys published in the view, in a fixed order.
+VIEW_KEYS: Tuple[str, ...] = tuple(RollingStats(window=1).snapshot().keys())
+_VIEW_BODY = struct.Struct("<%dd" % len(VIEW_KEYS))
+
+
+def _create(name: str, size: int) -> shared_memory.SharedMemory:
+    return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+
+def _tracker_name(shm: shared_memory.SharedMemory) -> str:
+    """The name the resource tracker files a POSIX segment under."""
+    return "/" + shm.name
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]  # 3.13+
+    except TypeError:
+        pass
+    # Pre-3.13, attaching registers the segment with the resource tracker, and an
+    # unrelated process's tracker would unlink it when that process exits. Drop the
+    # registration; the owner re-registers right before it unlinks (see `_unlink`).
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == "posix":
+        resource_tracker.unregister(_tracker_name(shm), "shared_memory")
+    return shm
+
+
+def _unlink(shm: shared_memory.SharedMemory) -> None:
+    # An attached worker sharing our tracker may have dropped the registration;
+    # registering is idempotent, and unlink() unregisters it again.
+    if os.name == "posix":
+        resource_tracker.register(_tracker_name(shm), "shared_memory")
+    shm.unlink()
+
+
+class SharedRing:
+    """Single-writer-process ring of fixed-size metric records in shared memory."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self.shm = shm
+        self._owner = owner
+        self._buf = shm.buf
+        # The writer process may record from many threads; readers never take it.
+        self._write_lock = threading.Lock()
+        self.capacity = _RING_HEADER.unpack_from(self._buf, 0)[1]
+        self._seq = _RING_HEADER.unpack_from(self._buf, 0)[0]
+
+    @classmethod
+    def create(cls, name: str, capacity: int) -> "SharedRing":
+        capacity = max(1, int(capacity))
+        shm = _create(name, _RING_HEADER.size + capacity * _RECORD.size)
+        _RING_HEADER.pack_into(shm.buf, 0, 0, capacity)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedRing":
+        return cls(_attach(name), owner=False)
+
+    @property
+    def write_seq(self) -> int:
+        return _RING_HEADER.unpack_from(self._buf, 0)[0]
+
+    def append(
+        self,
+        ts: float,
+        latency_ms: float,
+        cost: float,
+        queue_depth: float,
+        tokens_in: int,
+        tokens_out: int,
+        allowed: bool,
+        error: bool,
+    ) -> None:
+        with self._write_lock:
+            seq = self._seq
+            offset = _RING_HEADER.size + (seq % self.capacity) * _RECORD.size
+            _RECORD.pack_into(
+                self._buf, offset, ts, latency_ms, cost, queue_depth, tokens_in, tokens_out, allowed, error
+            )
+            self._seq = seq + 1
+            # Publish after the record is written.
+            struct.pack_into("<Q", self._buf, 0, seq + 1)
+
+    def read_since(self, cursor: int) -> Tuple[List[Tuple], int, int]:
+        """(records after `cursor`, new cursor, records lost to overrun)."""
+        end = self.write_seq
+        start = max(cursor, end - self.capacity)
+        lost = start - cursor
+        buf, cap, size, base = self._buf, self.capacity, _RECORD.size, _RING_HEADER.size
+        rows = [_RECORD.unpack_from(buf, base + (seq % cap) * size) for seq in range(start, end)]
+        # Slots the writer lapped (or is writing) while we were copying may be torn: drop them.
+        overrun = self.write_seq - cap - start + 1
+        if overrun > 0:
+            rows = rows[overrun:]
+            lost += overrun
+        return rows, end, lost
+
+    def close(self) -> None:
+        self._buf = None  # type: ignore[assignment]
+        self.shm.close()
+        if self._owner:
+            _unlink(self.shm)
+
+
+class SharedView:
+    """Seqlock-guarded snapshot published by the aggregator, read by every worker."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self.shm = shm
+        self._owner = owner
+        self._buf = shm.buf
+
+    @classmethod
+    def create(cls, name: str) -> "SharedView":
+        shm = _create(name, _VIEW_HEADER.size + _VIEW_BODY.size)
+        _VIEW_HEADER.pack_into(shm.buf, 0, 0, 0.0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedView":
+        return cls(_attach(name), owner=False)
+
+    def publish(self, snapshot: Dict[str, float], published_at: Optional[float] = None) -> None:
+        buf = self._buf
+        version = _VIEW_HEADER.unpack_from(buf, 0)[0]
+        struct.pack_into("<Q", buf, 0, version + 1)  # odd: publish in progress
+        _VIEW_BODY.pack_into(buf, _VIEW_HEADER.size, *(float(snapshot.get(k, 0.0)) for k in VIEW_KEYS))
+        struct.pack_into("<d", buf, 8, time.time() if published_at is None else published_at)
+        struct.pack_into("<Q", buf, 0, version + 2)
+
+    def read(self, retries: int = 8) -> Optional[Tuple[float, Dict[str, float]]]:
+        """(published_at, snapshot), or None if nothing consistent was published yet."""
+        buf = self._buf
+        for _ in range(retries):
+            version, published_at = _VIEW_HEADER.unpack_from(buf, 0)
+            if version == 0:
+                return None
+            if version & 1:
+                continue
+            values = _VIEW_BODY.unpack_from(buf, _VIEW_HEADER.size)
+            if _VIEW_HEADER.unpack_from(buf, 0)[0] == version:
+                return published_at, dict(zip(VIEW_KEYS, values))
+        return None
+
+    def close(self) -> None:
+        self._buf = None  # type: ignore[assignment]
+        self.shm.close()
+        if self._owner:
+            _unlink(self.shm)
+
+
+def ring_name(prefix: str, worker: int) -> str:
+    return f"{prefix}_r{worker}"
+
+
+def view_name(prefix: str) -> str:
+    return f"{prefix}_v"
+
+
+class MetricsAggregator:
+    """Owns the shared segments; merges worker rings into one global RollingStats."""
+
+    def __init__(
+        self,
+        workers: int,
+        *,
+        prefix: Optional[str] = None,
+        capacity: int = 65536,
+        window: int = 1024,
+    ) -> None:
+        self.workers = max(1, int(workers))
+        self.prefix = prefix or f"latch_{os.getpid()}_{secrets.token_hex(4)}"
+        self.stats = RollingStats(window)
+        self.rings = [SharedRing.create(ring_name(self.prefix, i), capacity) for i in range(self.workers)]
+        self.view = SharedView.create(view_name(self.prefix))
+        self._cursors = [0] * self.workers
+        self._lock = threading.Lock()
+        self.merged = 0
+        self.dropped = 0
+        self._poller = PeriodicTask("latch-metrics-aggregator", self.poll)
+
+    def poll(self) -> int:
+        """Drain every ring into the global stats and republish the view. Returns records merged."""
+        with self._lock:
+            record = self.stats.record
+            n = 0
+            for i, ring in enumerate(self.rings):
+                rows, self._cursors[i], lost = ring.read_since(self._cursors[i])
+                self.dropped += lost
+                for ts, latency_ms, cost, queue_depth, _tin, _tout, allowed, error in rows:
+                    record(bool(allowed), latency_ms, cost, queue_depth, ts, bool(error))
+                n += len(rows)
+            self.merged += n
+            self.view.publish(self.stats.snapshot())
+            return n
+
+    def start(self, interval_s: float = 0.1) -> None:
+        self._poller.start(interval_s)
+
+    def stop(self) -> None:
+        # No timeout: close() unlinks the segments right after.
+        self._poller.stop(None)
+
+    def collector(self, worker: int, **kwargs: object) -> "SharedMetricsCollector":
+        """Collector for worker `worker` (in-process convenience; workers usually attach by prefix)."""
+        return SharedMetricsCollector(self.prefix, worker, **kwargs)  # type: ignore[arg-type]
+
+    def close(self) -> None:
+        """Stop polling and unlink every segment."""
+        self.stop()
+        for ring in self.rings:
+            ring.close()
+        self.view.close()
+
+
+class SharedMetricsCollector(MetricsCollector):
+    """MetricsCollector that also feeds a shared ring and reads the host-wide view."""
+
+    def __init__(
+        self,
+        prefix: str,
+        worker: int,
+        *,
+        max_events: int = 1000,
+        max_view_age_s: float = 5.0,
+        exporter: Optional[Any] = None,
+        partitions: Optional[PartitionedStats] = None,
+        latency_model: Optional[Any] = None,
+    ) -> None:
+        super().__init__(
+            max_events=max_events, exporter=exporter, partitions=partitions, latency_model=latency_model
+        )
+        self.worker = int(worker)
+        self.ring = SharedRing.attach(ring_name(prefix, worker))
+        self.view = SharedView.attach(view_name(prefix))
+        self.max_view_age_s = float(max_view_age_s)
+
+    def record(self, outcome: Dict[str, str]) -> None:
+        super().record(outcome)
+        self.ring.append(
+            time.time(),
+            float(outcome.get("latency_ms", "0")),
+            float(outcome.get("cost", "0")),
+            float(outcome.get("queue_depth", "0")),
+            0,
+            0,
+            outcome.get("allowed", "false") == "true",
+            outcome_error(outcome),
+        )
+
+    def record_event(
+        self,
+        latency_ms: float,
+        tokens_in: int,
+        tokens_out: int,
+        error_type: Optional[str],
+        request_type: str,
+        model_id: str,
+        ts: float,
+        *,
+        queue_depth: float = 0.0,
+        cost_estimate: float = 0.0,
+        intent: str = "",
+        tier: str = "",
+        ttft_ms: Optional[float] = None,
+        itl_ms: Optional[float] = None,
+    ) -> None:
+        super().record_event(
+            latency_ms,
+            tokens_in,
+            tokens_out,
+            error_type,
+            request_type,
+            model_id,
+            ts,
+            queue_depth=queue_depth,
+            cost_estimate=cost_estimate,
+            intent=intent,
+            tier=tier,
+            ttft_ms=ttft_ms,
+            itl_ms=itl_ms,
+        )
+        self.ring.append(
+            float(ts),
+            float(latency_ms),
+            float(cost_estimate),
+            float(queue_depth),
+            int(tokens_in),
+            int(tokens_out),
+            not (error_type or "").strip(),
+            bool((error_type or "").strip()),
+        )
+
+    def record_events(self, rows: Iterable[Tuple]) -> int:
+        rows = list(rows)
+        n = super().record_events(rows)
+        append = self.ring.append
+        for row in rows:
+            append(
+                float(row[6]),
+                float(row[0]),
+                float(row[8]) if len(row) > 8 else 0.0,
+                float(row[7]) if len(row) > 7 else 0.0,
+                int(row[1]),
+                int(row[2]),
+                not (row[3] or "").strip(),
+                bool((row[3] or "").strip()),
+            )
+        return n
+
+    def global_snapshot(self) -> Optional[Dict[str, float]]:
+        """Host-wide snapshot from the aggregator, or None when missing or stale."""
+        view = self.view.read()
+        if view is None:
+            return None
+        published_at, snapshot = view
+        if time.time() - published_at > self.max_view_age_s:
+            return None
+        return snapshot
+
+    def snapshot(self) -> dict:
+        shared = self.global_snapshot()
+        if shared is None:
+            return super().snapshot()
+        return self._with_counters(shared)
+
+    def close(self) -> None:
+        self.ring.close()
+        self.view.close()
@@ -19,11 +19,14 @@ Non-goals
 - Not dashboard logic.
 """
 
+import time
 from dataclasses import dataclass
-from typing import Any, List
+from typing import Any, Callable, Dict, Hashable, List, Optional
 
 from latch.types import Signals
 
+from .periodic import PeriodicTask
+
 
 @dataclass
 class Signal:
@@ -31,14 +34,24 @@ class Signal:
     value: float
 
 
+def _windowed(snapshot: dict, window_key: str, fallback_key: str) -> float:
+    """Prefer the wall-clock window value; fall back to the count window when it is empty."""
+    if snapshot.get("window_count", 0):
+        return float(snapshot.get(window_key, 0.0))
+    return float(snapshot.get(fallback_key, 0.0))
+
+
 def compute_signals(rolling_stats: Any) -> Signals:
     """Public API to convert rolling stats into a stable Signals object."""
     snapshot = rolling_stats.snapshot() if hasattr(rolling_stats, "snapshot") else rolling_stats
     return Signals(
-        p95_latency_ms=float(snapshot.get("p95_latency_ms", 0.0)),
+        p95_latency_ms=_windowed(snapshot, "window_p95_latency_ms", "p95_latency_ms"),
         error_rate=float(snapshot.get("error_rate", 0.0)),
-        cost_rate=float(snapshot.get("avg_cost", 0.0)),
-        queue_depth=float(snapshot.get("avg_queue_depth", 0.0)),
+        cost_rate=_windowed(snapshot, "window_avg_cost", "avg_cost"),
+        queue_depth=_windowed(snapshot, "window_avg_queue_depth", "avg_queue_depth"),
+        qps=float(snapshot.get("qps", 0.0)),
+        cost_per_sec=float(snapshot.get("cost_per_sec", 0.0)),
+        p50_latency_ms=_windowed(snapshot, "window_p50_latency_ms", "p50_latency_ms"),
     )
 
 
@@ -48,4 +61,104 @@ def derive_signals(snapshot: dict) -> List[Signal]:
         Signal("p95_latency_ms", float(snapshot.get("p95_latency_ms", 0.0))),
         Signal("avg_cost", float(snapshot.get("avg_cost", 0.0))),
         Signal("avg_queue_depth", float(snapshot.get("avg_queue_depth", 0.0))),
+        Signal("error_rate", float(snapshot.get("error_rate", 0.0))),
+        Signal("qps", float(snapshot.get("qps", 0.0))),
+        Signal("cost_per_sec", float(snapshot.get("cost_per_sec", 0.0))),
+        Signal("ewma_qps", float(snapshot.get("ewma_qps", 0.0))),
     ]
+
+
+class SignalsCache:
+    """
+    Precomputed Signals snapshot for the request path.
+
+    Readers take `cache.current` (one attribute read). The snapshot is rebuilt
+    after every `refresh_every` recorded events or once it is older than
+    `max_age_s`, whichever comes first; `start()` adds a background refresher so
+    the rebuild can also happen entirely off the request thread.
+
+    When the source has `partitions` (metrics.partitioned_stats), `for_key()`
+    returns that partition's Signals, kept fresh the same way per key, and
+    falls back to the global snapshot until the partition has
+    `min_key_samples` events.
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        *,
+        refresh_every: int = 64,
+        max_age_s: float = 1.0,
+        min_key_samples: int = 20,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._source = source
+        self.refresh_every = max(1, int(refresh_every))
+        self.max_age_s = float(max_age_s)
+        self._clock = clock
+        self.current = Signals()
+        self.refreshed_at = clock()
+        self.refreshes = 0
+        self._pending = 0
+        self.min_key_samples = int(min_key_samples)
+        self._keyed: Dict[Hashable, Signals] = {}
+        # key -> [events since refresh, refreshed_at]
+        self._key_state: Dict[Hashable, List[float]] = {}
+        # A torn read under concurrent writes fails that tick; the next one retries.
+        self._refresher = PeriodicTask("latch-signals-refresh", self.refresh)
+
+    @property
+    def staleness_s(self) -> float:
+        return self._clock() - self.refreshed_at
+
+    def refresh(self) -> Signals:
+        self.current = compute_signals(self._source)
+        self._pending = 0
+        self.refreshed_at = self._clock()
+        self.refreshes += 1
+        return self.current
+
+    def note_event(self, n: int = 1, key: Optional[Hashable] = None) -> None:
+        """Called after an event is recorded; refreshes when a staleness bound is hit."""
+        self._pending += n
+        now = self._clock()
+        if self._pending >= self.refresh_every or now - self.refreshed_at >= self.max_age_s:
+            self.refresh()
+        if key is None:
+            return
+        state = self._key_state.get(key)
+        if state is None:
+            state = self._key_state[key] = [0, now]
+        state[0] += n
+        # Refresh at least once early, so a fresh partition is used as soon as it is warm.
+        if state[0] >= self.refresh_every or now - state[1] >= self.max_age_s or key not in self._keyed:
+            self.refresh_key(key)
+
+    def for_key(self, key: Hashable) -> Signals:
+        """Signals for one partition (global ones while it is cold). One dict lookup."""
+        return self._keyed.get(key, self.current)
+
+    def refresh_key(self, key: Hashable) -> None:
+        partitions = getattr(self._source, "partitions", None)
+        stats = partitions.get(key) if partitions is not None else None
+        snapshot = None
+        if stats is not None and stats.count >= self.min_key_samples:
+            # Snapshot under the partitions' lock: other threads may be recording into it.
+            snapshot = partitions.snapshot(key)
+        if snapshot is None:
+            self._keyed.pop(key, None)
+        else:
+            self._keyed[key] = compute_signals(snapshot)
+        self._key_state[key] = [0, self._clock()]
+        if partitions is not None and len(self._key_state) > 2 * partitions.max_keys:
+            # Forget keys the partitions have already evicted.
+            for stale in [k for k in self._key_state if k not in partitions]:
+                del self._key_state[stale]
+                self._keyed.pop(stale, None)
+
+    def start(self, interval_s: Optional[float] = None) -> None:
+        """Refresh on a daemon thread every `interval_s` (defaults to `max_age_s`)."""
+        self._refresher.start(interval_s if interval_s is not None else self.max_age_s)
+
+    def stop(self) -> None:
+        self._refresher.stop()
@@ -0,0 +1,215 @@
+"""
+Quantile Sketch (DDSketch-style)
+
+Purpose
+- Answer p50/p95/p99/p999 over a stream of latencies without sorting.
+- Keep memory bounded regardless of how many samples were recorded.
+- Be mergeable, so per-worker / per-shard sketches can be combined.
+
+How it works
+- Values are mapped to logarithmic buckets: key = ceil(log_gamma(value)),
+  gamma = (1 + alpha) / (1 - alpha). Any value in a bucket is reported with
+  relative error <= alpha.
+- Buckets live in a dense list indexed from `offset`, so add/remove are O(1)
+  and a quantile query is a prefix sum plus a bisect over a few hundred ints.
+- When the key range exceeds `max_bins`, the lowest buckets are collapsed
+  (tail quantiles stay accurate; only the far low end loses resolution).
+
+Hard constraints for MVP
+- Stdlib only, deterministic.
+
+Non-goals
+- Not a general histogram/metrics library.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Sequence
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99, 0.999)
+
+
+class QuantileSketch:
+    def __init__(self, *, relative_accuracy: float = 0.01, max_bins: int = 2048, min_value: float = 1e-3) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = float(relative_accuracy)
+        self.max_bins = max(16, int(max_bins))
+        self.min_value = float(min_value)
+        self._gamma = (1.0 + self.relative_accuracy) / (1.0 - self.relative_accuracy)
+        self._inv_log_gamma = 1.0 / math.log(self._gamma)
+        self._bins: List[int] = []
+        self._offset = 0
+        self._cumulative: Optional[List[int]] = None
+        self.zero_count = 0
+        self.count = 0
+
+    # -- mapping -------------------------------------------------------------
+
+    def key(self, value: float) -> int:
+        """Bucket key for `value`; values below `min_value` map to the zero bucket."""
+        if value < self.min_value:
+            return _ZERO_KEY
+        return math.ceil(math.log(value) * self._inv_log_gamma)
+
+    def _value(self, key: int) -> float:
+        if key == _ZERO_KEY:
+            return 0.0
+        return 2.0 * self._gamma**key / (self._gamma + 1.0)
+
+    # -- mutation ------------------------------------------------------------
+
+    def add(self, value: float, n: int = 1) -> None:
+        self.add_key(self.key(value), n)
+
+    def add_key(self, key: int, n: int = 1) -> None:
+        self.count += n
+        self._cumulative = None
+        if key == _ZERO_KEY:
+            self.zero_count += n
+            return
+        bins = self._bins
+        if not bins:
+            self._bins = [n]
+            self._offset = key
+            return
+        idx = key - self._offset
+        if 0 <= idx < len(bins):
+            bins[idx] += n
+            return
+        self._extend(key)
+        idx = key - self._offset
+        if idx < 0:
+            # Collapsed into the lowest bucket.
+            idx = 0
+        self._bins[idx] += n
+
+    def remove(self, value: float, n: int = 1) -> None:
+        self.remove_key(self.key(value), n)
+
+    def remove_key(self, key: int, n: int = 1) -> None:
+        """Remove samples previously added under `key` (used by sliding windows)."""
+        self._cumulative = None
+        if key == _ZERO_KEY:
+            taken = min(n, self.zero_count)
+            self.zero_count -= taken
+            self.count -= taken
+            return
+        if not self._bins:
+            return
+        idx = max(0, key - self._offset)
+        if idx >= len(self._bins):
+            return
+        taken = min(n, self._bins[idx])
+        self._bins[idx] -= taken
+        self.count -= taken
+
+    def _extend(self, key: int) -> None:
+        lo = min(self._offset, key)
+        hi = max(self._offset + len(self._bins) - 1, key)
+        if key < self._offset:
+            self._bins[0:0] = [0] * (self._offset - key)
+            self._offset = key
+        else:
+            self._bins.extend([0] * (key - (self._offset + len(self._bins)) + 1))
+        if hi - lo + 1 > self.max_bins:
+            self._collapse(hi - self.max_bins + 1)
+
+    def _collapse(self, new_offset: int) -> None:
+        drop = new_offset - self._offset
+        if drop <= 0:
+            return
+        folded = sum(self._bins[: drop + 1])
+        self._bins = [folded] + self._bins[drop + 1 :]
+        self._offset = new_offset
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold `other` into this sketch. Both must share the same accuracy."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different relative_accuracy")
+        self.count += other.zero_count
+        self.zero_count += other.zero_count
+        offset = other._offset
+        for i, c in enumerate(other._bins):
+            if c:
+                self.add_key(offset + i, c)
+
+    def subtract(self, other: "QuantileSketch") -> None:
+        """Remove `other`'s samples (which must have been merged in earlier)."""
+        if other.zero_count:
+            self.remove_key(_ZERO_KEY, other.zero_count)
+        offset = other._offset
+        for i, c in enumerate(other._bins):
+            if c:
+                self.remove_key(offset + i, c)
+
+    def clear(self) -> None:
+        self._bins = []
+        self._cumulative = None
+        self._offset = 0
+        self.zero_count = 0
+        self.count = 0
+
+    def copy(self) -> "QuantileSketch":
+        out = QuantileSketch(
+            relative_accuracy=self.relative_accuracy,
+            max_bins=self.max_bins,
+            min_value=self.min_value,
+        )
+        out._bins = list(self._bins)
+        out._offset = self._offset
+        out.zero_count = self.zero_count
+        out.count = self.count
+        return out
+
+    # -- queries -------------------------------------------------------------
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles((q,))[0]
+
+    def quantiles(self, qs: Sequence[float] = DEFAULT_QUANTILES) -> List[float]:
+        """Answer several quantiles from one cumulative pass over the buckets."""
+        out = [0.0] * len(qs)
+        if self.count <= 0:
+            return out
+        cumulative = self._cumulative
+        if cumulative is None:
+            # Cached until the next add/remove, so repeated reads are O(len(qs)).
+            cumulative = self._cumulative = list(accumulate(self._bins))
+        if not cumulative:
+            return out
+        top = len(cumulative) - 1
+        for i, q in enumerate(qs):
+            rank = min(1.0, max(0.0, float(q))) * (self.count - 1) - self.zero_count
+            if rank < 0:
+                continue
+            idx = bisect_right(cumulative, rank)
+            out[i] = self._value(self._offset + min(idx, top))
+        return out
+
+    def summary(self, qs: Iterable[float] = DEFAULT_QUANTILES) -> Dict[str, float]:
+        qs = tuple(qs)
+        return {quantile_label(q): v for q, v in zip(qs, self.quantiles(qs))}
+
+
+def quantile_label(q: float) -> str:
+    """0.5 -> "p50", 0.95 -> "p95", 0.999 -> "p999"."""
+    digits = f"{q:.6f}".split(".")[1].rstrip("0")
+    return "p" + (digits.ljust(2, "0") if digits else "100")
+
+
+def merge_sketches(sketches: Iterable[QuantileSketch]) -> QuantileSketch:
+    it = iter(sketches)
+    first = next(it, None)
+    if first is None:
+        return QuantileSketch()
+    out = first.copy()
+    for s in it:
+        out.merge(s)
+    return out
+
+
+_ZERO_KEY = -(2**62)
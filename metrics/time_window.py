@@ -0,0 +1,228 @@
+"""
+Time-Bucketed Window (MVP)
+
+Purpose
+- Give the control loop rates over the last N seconds instead of lifetime totals:
+  - qps, error rate, cost/sec, avg cost per request, avg queue depth
+  - p50/p95/p99/p999 latency over the window
+  - EWMA-decayed versions of the rates (recent buckets weigh more)
+
+How it works
+- A ring of `buckets` fixed wall-clock buckets of `bucket_s` seconds each
+  (default 1s x 60). Each bucket holds counts, errors, cost, queue depth and a
+  latency sketch.
+- Window-wide totals and a window-wide sketch are maintained incrementally:
+  a bucket's contribution is subtracted when it expires. record() is O(1)
+  amortized; snapshot() is O(buckets) plus one sketch read.
+
+Hard constraints for MVP
+- Stdlib only, deterministic given the timestamps passed in.
+- Bounded memory: `buckets` sketches, independent of request rate.
+
+Non-goals
+- No time-series database integration; history older than the window is dropped.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, List, Optional
+
+from .sketch import DEFAULT_QUANTILES, QuantileSketch
+
+
+class _Bucket:
+    __slots__ = ("epoch", "count", "errors", "cost", "queue", "latency", "sketch")
+
+    def __init__(self, relative_accuracy: float) -> None:
+        self.epoch = -1
+        self.count = 0
+        self.errors = 0
+        self.cost = 0.0
+        self.queue = 0.0
+        self.latency = 0.0
+        self.sketch = QuantileSketch(relative_accuracy=relative_accuracy)
+
+    def reset(self, epoch: int) -> None:
+        self.epoch = epoch
+        self.count = 0
+        self.errors = 0
+        self.cost = 0.0
+        self.queue = 0.0
+        self.latency = 0.0
+        self.sketch.clear()
+
+
+class TimeWindowStats:
+    def __init__(
+        self,
+        *,
+        bucket_s: float = 1.0,
+        buckets: int = 60,
+        half_life_s: float = 10.0,
+        relative_accuracy: float = 0.01,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if bucket_s <= 0 or buckets <= 0:
+            raise ValueError("bucket_s and buckets must be positive")
+        self.bucket_s = float(bucket_s)
+        self.buckets = int(buckets)
+        self.half_life_s = float(half_life_s)
+        self.clock = clock
+        self._ring: List[_Bucket] = [_Bucket(relative_accuracy) for _ in range(self.buckets)]
+        self._head = -1  # newest epoch seen
+        self._first_ts: Optional[float] = None
+        self.late_dropped = 0
+
+        # Running totals over live buckets.
+        self._sketch = QuantileSketch(relative_accuracy=relative_accuracy)
+        self._count = 0
+        self._errors = 0
+        self._cost = 0.0
+        self._queue = 0.0
+
+        # Per-age decay weights, index = age in buckets.
+        decay = 0.5 ** (self.bucket_s / self.half_life_s) if self.half_life_s > 0 else 0.0
+        self._weights = [decay**age for age in range(self.buckets)]
+
+    @property
+    def window_s(self) -> float:
+        return self.bucket_s * self.buckets
+
+    def _expire(self, bucket: _Bucket) -> None:
+        if bucket.epoch < 0 or bucket.count == 0:
+            return
+        self._count -= bucket.count
+        self._errors -= bucket.errors
+        self._cost -= bucket.cost
+        self._queue -= bucket.queue
+        self._sketch.subtract(bucket.sketch)
+        if self._count == 0:
+            # Avoid carrying float drift into an empty window.
+            self._cost = 0.0
+            self._queue = 0.0
+
+    def _advance(self, epoch: int) -> None:
+        """Move the head to `epoch`, expiring every bucket that falls out of the window."""
+        if epoch <= self._head:
+            return
+        oldest_live = epoch - self.buckets + 1
+        start = max(self._head + 1, oldest_live)
+        for bucket in self._ring:
+            if 0 <= bucket.epoch < oldest_live:
+                self._expire(bucket)
+                bucket.epoch = -1
+        for e in range(start, epoch + 1):
+            self._ring[e % self.buckets].reset(e)
+        self._head = epoch
+
+    def record(
+        self,
+        ok: bool,
+        latency_ms: float,
+        cost: float,
+        queue_depth: float,
+        ts: Optional[float] = None,
+    ) -> None:
+        """`ok=False` counts toward error_rate (call failures only, not denials)."""
+        now = self.clock() if ts is None else float(ts)
+        epoch = int(now // self.bucket_s)
+        if epoch > self._head:
+            self._advance(epoch)
+        bucket = self._ring[epoch % self.buckets]
+        if bucket.epoch != epoch:
+            # Older than the window (or its slot was already reused).
+            self.late_dropped += 1
+            return
+        if self._first_ts is None or now < self._first_ts:
+            self._first_ts = now
+        key = bucket.sketch.key(latency_ms)
+        bucket.sketch.add_key(key)
+        self._sketch.add_key(key)
+        bucket.count += 1
+        bucket.latency += latency_ms
+        bucket.cost += cost
+        bucket.queue += queue_depth
+        self._count += 1
+        self._cost += cost
+        self._queue += queue_depth
+        if not ok:
+            bucket.errors += 1
+            self._errors += 1
+
+    def merge(self, other: "TimeWindowStats") -> None:
+        """Fold another window (same bucket geometry) into this one."""
+        if other.bucket_s != self.bucket_s or other.buckets != self.buckets:
+            raise ValueError("cannot merge TimeWindowStats with different bucket geometry")
+        if other._head > self._head:
+            self._advance(other._head)
+        for src in other._ring:
+            if src.epoch < 0 or src.count == 0:
+                continue
+            dst = self._ring[src.epoch % self.buckets]
+            if dst.epoch != src.epoch:
+                continue
+            dst.count += src.count
+            dst.errors += src.errors
+            dst.cost += src.cost
+            dst.queue += src.queue
+            dst.latency += src.latency
+            dst.sketch.merge(src.sketch)
+            self._sketch.merge(src.sketch)
+            self._count += src.count
+            self._errors += src.errors
+            self._cost += src.cost
+            self._queue += src.queue
+        if other._first_ts is not None and (self._first_ts is None or other._first_ts < self._first_ts):
+            self._first_ts = other._first_ts
+
+    def snapshot(self, now: Optional[float] = None) -> dict:
+        now = self.clock() if now is None else float(now)
+        epoch = int(now // self.bucket_s)
+        if epoch > self._head:
+            self._advance(epoch)
+
+        # Effective span: the full window, or less while the window is still filling.
+        window_start = (epoch - self.buckets + 1) * self.bucket_s
+        if self._first_ts is not None:
+            window_start = max(window_start, self._first_ts)
+        span_s = max(self.bucket_s, now - window_start)
+
+        count = self._count
+        p50, p95, p99, p999 = self._sketch.quantiles(DEFAULT_QUANTILES)
+
+        w_total = w_count = w_errors = w_cost = w_latency = 0.0
+        max_age = min(self.buckets, int(span_s // self.bucket_s) + 1)
+        weights = self._weights
+        for age in range(max_age):
+            w_total += weights[age]
+        for bucket in self._ring:
+            if bucket.epoch < 0 or bucket.count == 0:
+                continue
+            age = epoch - bucket.epoch
+            if age < 0 or age >= max_age:
+                continue
+            w = weights[age]
+            w_count += w * bucket.count
+            w_errors += w * bucket.errors
+            w_cost += w * bucket.cost
+            w_latency += w * bucket.latency
+        w_seconds = w_total * self.bucket_s
+
+        return {
+            "window_s": self.window_s,
+            "window_count": count,
+            "qps": count / span_s,
+            "error_rate": (self._errors / count) if count else 0.0,
+            "cost_per_sec": self._cost / span_s,
+            "window_avg_cost": (self._cost / count) if count else 0.0,
+            "window_avg_queue_depth": (self._queue / count) if count else 0.0,
+            "window_p50_latency_ms": p50,
+            "window_p95_latency_ms": p95,
+            "window_p99_latency_ms": p99,
+            "window_p999_latency_ms": p999,
+            "ewma_qps": (w_count / w_seconds) if w_seconds else 0.0,
+            "ewma_error_rate": (w_errors / w_count) if w_count else 0.0,
+            "ewma_latency_ms": (w_latency / w_count) if w_count else 0.0,
+            "ewma_cost_per_sec": (w_cost / w_seconds) if w_seconds else 0.0,
+        }
@@ -0,0 +1,220 @@
+"""
+Admission Control (MVP)
+
+Purpose
+- Keep the runtime inside its concurrency budget and shed load explicitly
+  instead of letting every request pile onto the backend.
+- Under overload, protect latency-priority and user traffic at the expense of
+  background traffic.
+
+Mechanics
+- Per-tier token buckets (rate + burst). An empty bucket rejects with
+  reason "rate_limited".
+- A concurrency cap. Requests over the cap wait in a bounded priority queue
+  ordered by (class, -intent priority, arrival):
+    class 0 = latency-priority (route_fast / escalate)
+    class 1 = user
+    class 2 = background (`is_background`)
+- When the queue is full, a newcomer that outranks the worst waiter evicts it
+  (reason "shed"); otherwise the newcomer is rejected (reason "queue_full").
+- A per-request `max_queue_depth` hint (from the Translator) rejects a request
+  early when the queue is already at least that deep.
+
+Hard constraints for MVP
+- Stdlib only; in-process; no distributed rate limiting.
+
+Non-goals
+- Not a GPU scheduler; only decides admit / wait / reject in front of the runtime.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+LATENCY_CLASS = 0
+USER_CLASS = 1
+BACKGROUND_CLASS = 2
+
+
+class TokenBucket:
+    """Thread-safe: refill and take happen under the bucket's own lock."""
+
+    def __init__(self, rate_per_s: float, burst: float, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate_per_s = float(rate_per_s)
+        self.burst = float(burst)
+        self._clock = clock
+        self._tokens = float(burst)
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def try_take(self, n: float = 1.0) -> bool:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate_per_s)
+            self._last = now
+            if self._tokens >= n:
+                self._tokens -= n
+                return True
+            return False
+
+
+@dataclass(frozen=True)
+class Admission:
+    admitted: bool
+    reason: str  # "admitted" | "queued" | "rate_limited" | "queue_full" | "shed" | "queue_timeout"
+    waited_ms: float = 0.0
+    queue_depth: int = 0
+
+
+class _Waiter:
+    __slots__ = ("state",)
+
+    def __init__(self) -> None:
+        self.state = "waiting"  # -> "granted" | "shed" | "timeout"
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        *,
+        concurrency_cap: int = 64,
+        max_queue_depth: int = 256,
+        tier_rates: Optional[Dict[str, Tuple[float, float]]] = None,
+        queue_timeout_s: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """`tier_rates` maps tier -> (requests/sec, burst); tiers not listed are unlimited."""
+        self.concurrency_cap = max(1, int(concurrency_cap))
+        self.max_queue_depth = max(0, int(max_queue_depth))
+        self.queue_timeout_s = queue_timeout_s
+        self._clock = clock
+        self._buckets: Dict[str, TokenBucket] = {
+            tier: TokenBucket(rate, burst, clock=clock) for tier, (rate, burst) in (tier_rates or {}).items()
+        }
+        self._cond = threading.Condition()
+        self._active = 0
+        self._queue: List[Tuple[Tuple[int, int], int, _Waiter]] = []
+        self._queued = 0
+        self._seq = itertools.count()
+        self.counters: Dict[str, int] = {
+            "admitted": 0,
+            "queued": 0,
+            "rate_limited": 0,
+            "queue_full": 0,
+            "shed": 0,
+            "queue_timeout": 0,
+        }
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    @staticmethod
+    def traffic_class(action: str, is_background: bool) -> int:
+        if is_background:
+            return BACKGROUND_CLASS
+        if action in ("route_fast", "escalate"):
+            return LATENCY_CLASS
+        return USER_CLASS
+
+    def acquire(
+        self,
+        *,
+        traffic_class: int,
+        priority: int = 0,
+        tier: str = "",
+        max_queue_depth: Optional[int] = None,
+        timeout_s: Optional[float] = None,
+    ) -> Admission:
+        """Admit, wait for a slot, or reject. Every admitted request must call `release()`."""
+        bucket = self._buckets.get(tier)
+        if bucket is not None and not bucket.try_take():
+            return self._reject("rate_limited")
+
+        start = self._clock()
+        rank = (int(traffic_class), -int(priority))
+        with self._cond:
+            if self._active < self.concurrency_cap and not self._queued:
+                self._active += 1
+                self.counters["admitted"] += 1
+                return Admission(True, "admitted", 0.0, 0)
+
+            limit = self.max_queue_depth if max_queue_depth is None else min(self.max_queue_depth, max_queue_depth)
+            if self._queued >= limit:
+                if self._queued < self.max_queue_depth or not self._evict_worse_than(rank):
+                    self.counters["queue_full"] += 1
+                    return Admission(False, "queue_full", 0.0, self._queued)
+
+            waiter = _Waiter()
+            heapq.heappush(self._queue, (rank, next(self._seq), waiter))
+            self._queued += 1
+            self.counters["queued"] += 1
+
+            timeout = self.queue_timeout_s if timeout_s is None else timeout_s
+            deadline = None if timeout is None else start + timeout
+            while waiter.state == "waiting":
+                remaining = None if deadline is None else deadline - self._clock()
+                if remaining is not None and remaining <= 0:
+                    waiter.state = "timeout"
+                    self._queued -= 1
+                    self.counters["queue_timeout"] += 1
+                    return Admission(False, "queue_timeout", (self._clock() - start) * 1000.0, self._queued)
+                self._cond.wait(remaining)
+
+            waited_ms = (self._clock() - start) * 1000.0
+            if waiter.state == "shed":
+                return Admission(False, "shed", waited_ms, self._queued)
+            return Admission(True, "queued", waited_ms, self._queued)
+
+    def set_concurrency_cap(self, cap: int) -> None:
+        """Resize the cap (feedback control); raising it admits waiters right away."""
+        with self._cond:
+            self.concurrency_cap = max(1, int(cap))
+            self._grant_waiters()
+
+    def release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._grant_waiters()
+
+    def _grant_waiters(self) -> None:
+        """Hand free slots to the best-ranked waiters. Caller holds the lock."""
+        while self._queue and self._active < self.concurrency_cap:
+            _rank, _seq, waiter = heapq.heappop(self._queue)
+            if waiter.state != "waiting":
+                continue  # shed or timed out; already uncounted
+            waiter.state = "granted"
+            self._queued -= 1
+            self._active += 1
+            self.counters["admitted"] += 1
+        self._cond.notify_all()
+
+    def _evict_worse_than(self, rank: Tuple[int, int]) -> bool:
+        """Shed the lowest-ranked waiter if it ranks below `rank`. Caller holds the lock."""
+        worst: Optional[Tuple[Tuple[int, int], int, _Waiter]] = None
+        for entry in self._queue:
+            if entry[2].state != "waiting":
+                continue
+            if worst is None or (entry[0], entry[1]) > (worst[0], worst[1]):
+                worst = entry
+        if worst is None or worst[0] <= rank:
+            return False
+        worst[2].state = "shed"
+        self._queued -= 1
+        self.counters["shed"] += 1
+        self._cond.notify_all()
+        return True
+
+    def _reject(self, reason: str) -> Admission:
+        with self._cond:
+            self.counters[reason] += 1
+            return Admission(False, reason, 0.0, self._queued)
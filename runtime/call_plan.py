@@ -0,0 +1,137 @@
+"""
+Call Plans (SDK hot path)
+
+Purpose
+- Do `inspect.signature` work once per model callable instead of once per call.
+- A plan records which SDK kwargs the callable accepts and how to pull
+  `tokens_out` out of its results (`reported()` reads other numeric fields).
+
+Caching
+- Plans are cached weakly on the callable (bound methods on their underlying
+  function), so dropping a model function also drops its plan.
+- Callables that cannot be weakly referenced are cached strongly in a small
+  bounded table.
+
+Hard constraints for MVP
+- Stdlib only; plan lookup is a dict hit on the hot path.
+
+Non-goals
+- Not a general RPC/dispatch layer.
+"""
+
+from __future__ import annotations
+
+import inspect
+import weakref
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+_MAX_STRONG_PLANS = 256
+
+
+def _tokens_from_dict(value: Any) -> int:
+    try:
+        return int(value.get("tokens_out", 0))
+    except Exception:
+        return 0
+
+
+def _tokens_from_attr(value: Any) -> int:
+    try:
+        return int(getattr(value, "tokens_out", 0))
+    except Exception:
+        return 0
+
+
+def _tokens_none(value: Any) -> int:
+    return 0
+
+
+def reported(value: Any, name: str) -> float:
+    """A numeric field (`cost`, `queue_depth`, ...) reported by a result dict or object, else 0.0."""
+    raw = value.get(name) if isinstance(value, dict) else getattr(value, name, None)
+    try:
+        return 0.0 if raw is None else float(raw)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class CallPlan:
+    __slots__ = ("introspected", "accepts_var_kw", "accepted", "_extractors")
+
+    def __init__(self, introspected: bool, accepts_var_kw: bool, accepted: FrozenSet[str]) -> None:
+        self.introspected = introspected
+        self.accepts_var_kw = accepts_var_kw
+        self.accepted = accepted
+        # Result type -> tokens_out extractor, learned from the first result of each type.
+        self._extractors: Dict[type, Callable[[Any], int]] = {}
+
+    @classmethod
+    def build(cls, fn: Callable[..., Any]) -> "CallPlan":
+        try:
+            params = inspect.signature(fn).parameters
+        except (TypeError, ValueError):
+            # Builtins/extension callables without a signature: call with the prompt only.
+            return cls(False, False, frozenset())
+        accepts_var_kw = any(p.kind == inspect.Parameter.VAR_KEYWORD for p in params.values())
+        accepted = frozenset(
+            name
+            for name, p in params.items()
+            if p.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+        )
+        return cls(True, accepts_var_kw, accepted)
+
+    def call(self, fn: Callable[..., Any], prompt_text: str, call_kwargs: Dict[str, Any]) -> Any:
+        if self.accepts_var_kw:
+            return fn(prompt_text, **call_kwargs)
+        if not self.introspected:
+            return fn(prompt_text)
+        accepted = self.accepted
+        return fn(prompt_text, **{k: v for k, v in call_kwargs.items() if k in accepted})
+
+    def tokens_out(self, value: Any) -> int:
+        if value is None:
+            return 0
+        kind = type(value)
+        extract = self._extractors.get(kind)
+        if extract is None:
+            if isinstance(value, dict):
+                extract = _tokens_from_dict
+            elif hasattr(value, "tokens_out"):
+                extract = _tokens_from_attr
+            else:
+                extract = _tokens_none
+            self._extractors[kind] = extract
+        return extract(value)
+
+
+_plans: "weakref.WeakKeyDictionary[Any, CallPlan]" = weakref.WeakKeyDictionary()
+_method_plans: "weakref.WeakKeyDictionary[Any, CallPlan]" = weakref.WeakKeyDictionary()
+_strong_plans: Dict[int, Tuple[Any, CallPlan]] = {}
+
+
+def get_call_plan(fn: Callable[..., Any]) -> CallPlan:
+    """Cached CallPlan for `fn` (built on first use)."""
+    if inspect.ismethod(fn):
+        # Bound methods are recreated on every attribute access; key on the function.
+        owner, table = fn.__func__, _method_plans
+    else:
+        owner, table = fn, _plans
+    try:
+        plan = table.get(owner)
+    except TypeError:
+        return _strong_plan(fn)
+    if plan is None:
+        plan = CallPlan.build(fn)
+        table[owner] = plan
+    return plan
+
+
+def _strong_plan(fn: Callable[..., Any]) -> CallPlan:
+    entry: Optional[Tuple[Any, CallPlan]] = _strong_plans.get(id(fn))
+    if entry is not None and entry[0] is fn:
+        return entry[1]
+    plan = CallPlan.build(fn)
+    if len(_strong_plans) >= _MAX_STRONG_PLANS:
+        _strong_plans.clear()
+    _strong_plans[id(fn)] = (fn, plan)
+    return plan
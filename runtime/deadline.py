@@ -0,0 +1,127 @@
+"""
+Deadlines (MVP)
+
+Purpose
+- Give every RequestSession a deadline (session start + the intent's
+  max_latency_ms) and spend it on purpose instead of checking the SLO after
+  the fact:
+  - before dispatch: an expired deadline sheds the call; a call whose
+    predicted latency exceeds the remaining budget is shed or downgraded.
+    With a warm latency model on the collector (control_plane/latency_model.py)
+    the prediction accounts for prompt size and max_tokens, and a downgrade
+    picks the largest max_tokens predicted to fit `headroom` of the budget.
+    Otherwise the prediction is the current p50 for its intent/tier/model and
+    max_tokens is scaled by the fraction of it that still fits (coarse: the
+    p50 does not know about token counts)
+  - at dispatch: `model_fn` gets the deadline if it takes a `deadline`
+    parameter and the remaining seconds if it takes `timeout` (never
+    through **kwargs, so pass-through wrappers are unaffected)
+  - during the call: async calls are cancelled at the deadline; sync calls
+    cannot be interrupted and rely on the `timeout` they were given
+- Shedding raises DeadlineExceeded (a TimeoutError).
+
+Probing
+- Shed calls record no latency, so shedding on stale signals could go on
+  forever. Every `probe_every`-th predicted miss is let through to keep the
+  signals fresh.
+
+Hard constraints for MVP
+- Monotonic clock; in-process; stdlib only.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# Outcomes of a pre-dispatch check.
+ON_TIME = "on_time"
+SHED = "shed"
+DOWNGRADE = "downgrade"
+
+
+class DeadlineExceeded(TimeoutError):
+    def __init__(self, reason: str, remaining_ms: float, predicted_ms: float = 0.0) -> None:
+        super().__init__(f"deadline {reason}: {remaining_ms:.1f} ms left, predicted {predicted_ms:.1f} ms")
+        self.reason = reason  # "expired" | "predicted_miss" | "timeout"
+        self.remaining_ms = remaining_ms
+        self.predicted_ms = predicted_ms
+
+
+class Deadline:
+    __slots__ = ("at", "_clock")
+
+    def __init__(self, at: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.at = at
+        self._clock = clock
+
+    @classmethod
+    def after_ms(cls, budget_ms: float, clock: Callable[[], float] = time.monotonic) -> "Deadline":
+        return cls(clock() + budget_ms / 1000.0, clock)
+
+    def remaining_ms(self) -> float:
+        return (self.at - self._clock()) * 1000.0
+
+    def timeout_s(self) -> float:
+        """Remaining seconds, never negative (for timeout= parameters)."""
+        return max(0.0, self.at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self.at
+
+
+@dataclass(frozen=True)
+class DeadlineConfig:
+    on_predicted_miss: str = SHED  # SHED | DOWNGRADE
+    probe_every: int = 20
+    min_tokens: int = 16  # downgrade floor for max_tokens
+    headroom: float = 0.8  # downgrade aims at this fraction of the remaining budget
+
+
+class DeadlineGuard:
+    """Pre-dispatch deadline checks, shared by all sessions of a client."""
+
+    def __init__(self, config: Optional[DeadlineConfig] = None, *, metrics: Optional[object] = None) -> None:
+        self.config = config or DeadlineConfig()
+        if self.config.on_predicted_miss not in (SHED, DOWNGRADE):
+            raise ValueError(f"unknown on_predicted_miss {self.config.on_predicted_miss!r}")
+        self.metrics = metrics
+        self._misses = 0
+
+    def check(self, deadline: Deadline, predicted_ms: float) -> str:
+        """ON_TIME, DOWNGRADE, or raise DeadlineExceeded."""
+        remaining = deadline.remaining_ms()
+        if remaining <= 0.0:
+            self._incr("deadline_expired")
+            raise DeadlineExceeded("expired", remaining, predicted_ms)
+        if predicted_ms <= remaining:
+            return ON_TIME
+        self._misses += 1
+        if self.config.probe_every > 0 and self._misses % self.config.probe_every == 0:
+            self._incr("deadline_probe")
+            return ON_TIME
+        if self.config.on_predicted_miss == DOWNGRADE:
+            self._incr("deadline_downgraded")
+            return DOWNGRADE
+        self._incr("deadline_shed")
+        raise DeadlineExceeded("predicted_miss", remaining, predicted_ms)
+
+    def downgrade_tokens(
+        self, max_tokens: int, deadline: Deadline, predicted_ms: float, fit_tokens: Optional[int] = None
+    ) -> int:
+        """
+        `fit_tokens` (from a latency model) if given, else max_tokens scaled by
+        the fraction of the predicted latency that still fits.
+        """
+        floor = min(self.config.min_tokens, max_tokens)
+        if fit_tokens is not None:
+            return max(floor, min(max_tokens, fit_tokens))
+        budget = max(0.0, deadline.remaining_ms()) * self.config.headroom
+        fraction = budget / predicted_ms if predicted_ms > 0 else 1.0
+        return max(floor, int(max_tokens * min(1.0, fraction)))
+
+    def _incr(self, name: str) -> None:
+        if self.metrics is not None:
+            self.metrics.incr(name)
@@ -7,27 +7,159 @@ It calls decision_engine BEFORE invoking the model runtime.
 MUST:
 - attach request context (type, tier, prompt size)
 - apply actions returned by decision_engine
+- enforce admission control (concurrency cap, bounded priority queue,
+  per-tier rate limits) and return explicit reject outcomes when shedding
+- optionally coalesce identical in-flight prompts and serve repeats from a
+  TTL/LRU response cache (skipped when the request carries cache="false")
+- optionally hedge backend calls of requests carrying hedge="true"
+  (see runtime.hedging)
+- optionally enforce deadlines: queueing is bounded by the request's
+  deadline_ms (else max_latency_ms) and the backend gets what is left
 
 MUST NOT:
 - handle auth, tenants, billing
 - implement distributed tracing
 """
 
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from metrics.signals import SignalsCache
+
+from .admission import Admission, AdmissionController
 from .fake_llmd import FakeLLMD
+from .hedging import Hedger
 from .request_context import RequestContext
+from .response_cache import ResponseCache, SingleFlight, cache_key
 
 
 class RuntimeGateway:
-    def __init__(self) -> None:
-        self.llmd = FakeLLMD()
+    def __init__(
+        self,
+        *,
+        admission: Optional[AdmissionController] = None,
+        backend: Optional[Any] = None,
+        response_cache: Optional[ResponseCache] = None,
+        coalesce: bool = False,
+        metrics: Optional[Any] = None,
+        hedger: Optional[Hedger] = None,
+        deadlines: bool = False,
+    ) -> None:
+        """
+        `backend` is anything with `execute(request) -> response` (default FakeLLMD;
+        see runtime.simulator.SimulatedLLMD for a load-aware one).
+        `metrics` (a MetricsCollector) receives cache_hit / cache_miss / coalesced counters.
+        `hedger` re-issues slow backend calls of hedge="true" requests after the
+        p95 latency in `metrics` (no metrics: no hedging); the response's
+        "hedge" field says which call won. Hedging runs the backend from
+        several threads at once, so it must be thread-safe.
+        `deadlines`: a request cannot wait in the admission queue past its
+        deadline (rejected as "queue_timeout"); admitted requests are sent on
+        with the remaining budget as "deadline_ms".
+        """
+        self.llmd = backend if backend is not None else FakeLLMD()
+        self.admission = admission if admission is not None else AdmissionController()
+        self.response_cache = response_cache
+        self.singleflight = SingleFlight() if coalesce or response_cache is not None else None
+        self.metrics = metrics
+        self.hedger = hedger
+        self._signals = SignalsCache(metrics) if hedger is not None and metrics is not None else None
+        self.deadlines = deadlines
 
     def dispatch(self, request: Dict[str, str], context: RequestContext) -> Dict[str, str]:
+        key = self._cache_key(request)
+        if key is None:
+            return self._dispatch(request, context)
+
+        if self.response_cache is not None:
+            hit, cached = self.response_cache.lookup(key)
+            self._incr("cache_hit" if hit else "cache_miss")
+            if hit:
+                return {**cached, "cache": "hit"}
+        response, shared = self.singleflight.do(key, lambda: self._dispatch(request, context))
+        if shared:
+            self._incr("coalesced")
+            return {**response, "cache": "coalesced"}
+        if self.response_cache is not None and response.get("status") == "ok":
+            self.response_cache.put(key, response)
+        return {**response, "cache": "miss"}
+
+    def _cache_key(self, request: Dict[str, str]) -> Optional[Hashable]:
+        if self.singleflight is None or request.get("cache") == "false" or "prompt" not in request:
+            return None
+        return cache_key(
+            request["prompt"],
+            request.get("model_id", request.get("mode", "")),
+            request.get("max_tokens", ""),
+        )
+
+    def _incr(self, name: str) -> None:
+        if self.metrics is not None:
+            self.metrics.incr(name)
+
+    def _dispatch(self, request: Dict[str, str], context: RequestContext) -> Dict[str, str]:
         enriched = dict(request)
         enriched["prompt_tokens"] = str(context.prompt_tokens)
         enriched["tier"] = context.tier
         enriched["is_background"] = "true" if context.is_background else "false"
-        return self.llmd.execute(enriched)
+
+        hint = request.get("max_queue_depth")
+        budget_ms = self._deadline_budget_ms(request)
+        ticket = self.admission.acquire(
+            traffic_class=AdmissionController.traffic_class(request.get("action", ""), context.is_background),
+            priority=int(request.get("priority", "0") or 0),
+            tier=context.tier,
+            max_queue_depth=int(hint) if hint else None,
+            timeout_s=self._queue_timeout_s(budget_ms),
+        )
+        if not ticket.admitted:
+            return _rejected(enriched, ticket)
+        if budget_ms is not None:
+            enriched["deadline_ms"] = f"{budget_ms - ticket.waited_ms:.1f}"
+        try:
+            if self._signals is not None and request.get("hedge") == "true":
+                self._signals.note_event()
+                p95_ms = self._signals.current.p95_latency_ms
+                hedged = self.hedger.call(lambda: self.llmd.execute(enriched), p95_ms)
+                response = dict(hedged.value)
+                response["hedge"] = hedged.winner if hedged.hedged else "none"
+            else:
+                response = self.llmd.execute(enriched)
+        finally:
+            self.admission.release()
+        response["admission"] = ticket.reason
+        response["admission_wait_ms"] = f"{ticket.waited_ms:.1f}"
+        return response
+
+    def _deadline_budget_ms(self, request: Dict[str, str]) -> Optional[float]:
+        if not self.deadlines:
+            return None
+        raw = request.get("deadline_ms") or request.get("max_latency_ms")
+        try:
+            return float(raw) if raw else None
+        except ValueError:
+            return None
+
+    def _queue_timeout_s(self, budget_ms: Optional[float]) -> Optional[float]:
+        configured = self.admission.queue_timeout_s
+        if budget_ms is None:
+            return configured
+        budget_s = max(0.0, budget_ms / 1000.0)
+        return budget_s if configured is None else min(configured, budget_s)
+
+
+def _rejected(request: Dict[str, str], ticket: Admission) -> Dict[str, str]:
+    return {
+        "status": "rejected",
+        "reason": ticket.reason,
+        "echo": request.get("intent", "unknown"),
+        "action": request.get("action", "none"),
+        "latency_ms": f"{ticket.waited_ms:.1f}",
+        "queue_depth": str(ticket.queue_depth),
+        "batch_size": "0",
+        "cost": "0.0000",
+        "admission": ticket.reason,
+        "admission_wait_ms": f"{ticket.waited_ms:.1f}",
+    }
 
 
 def request_wrapper(
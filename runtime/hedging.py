@@ -0,0 +1,232 @@
+"""
+Hedged Requests (MVP)
+
+Purpose
+- Cut tail latency caused by occasional slow backend calls: if the primary
+  call has not returned after an adaptive delay, issue one backup call and
+  take whichever finishes first.
+
+Delay
+- The caller passes the model's current p95 latency from its
+  MetricsCollector (`p95_ms`; the SDK reads it from the signals snapshot for
+  the call's (intent, tier, model), the gateway from its collector). It is
+  clamped to [`min_delay_ms`, `max_delay_ms`]; None or 0 (no data yet)
+  means no hedging. The hedger keeps no latency history of its own.
+
+Budget
+- Every eligible call earns `budget` hedge credits (capped at `burst`); a
+  hedge spends one. Over any long run hedges stay below
+  budget * calls + burst (budget=0.05 -> at most ~5% extra load).
+- Sync and async take the credit at the same point: when the call starts.
+  A call that may be hedged reserves one credit up front; it is refunded
+  if the primary beats the delay. A call that starts without credit is
+  never hedged (counted as hedge_no_budget if it outlives the delay).
+
+Losers
+- Sync (`call`): the primary runs inline on the caller's thread whenever no
+  hedge can follow it (no delay yet, or no credit). Otherwise it runs on a
+  small thread pool, so the caller can return as soon as either attempt
+  wins. The losing attempt is cancelled if it has not started, otherwise it
+  finishes in the background and its result is dropped.
+- Async (`acall`): attempts are tasks; the loser is cancelled.
+- Streams: an attempt is done once it returns, so a streamed result wins as
+  soon as its stream exists; streams are never hedged mid-stream.
+
+Enablement
+- Per intent: only intents with the "hedge" constraint are hedged
+  (SDK `call_model`, and the gateway via the Translator's hedge hint).
+
+Metrics (counters on the given collector)
+- hedge_eligible, hedge_issued, hedge_won (backup finished first),
+  hedge_no_budget.
+
+Hard constraints for MVP
+- Stdlib only; in-process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+HEDGE_CONSTRAINT = "hedge"
+
+
+class HedgeResult(NamedTuple):
+    value: Any
+    hedged: bool  # a backup call was issued
+    winner: str  # "primary" | "hedge"
+
+
+class Hedger:
+    def __init__(
+        self,
+        *,
+        budget: float = 0.05,
+        burst: float = 10.0,
+        min_delay_ms: float = 1.0,
+        max_delay_ms: float = 10_000.0,
+        max_workers: int = 32,
+        metrics: Optional[Any] = None,
+    ) -> None:
+        self.budget = float(budget)
+        self.burst = float(burst)
+        self.min_delay_ms = float(min_delay_ms)
+        self.max_delay_ms = float(max_delay_ms)
+        self.max_workers = int(max_workers)
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._credit = float(burst)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.counters: Dict[str, int] = {"hedge_eligible": 0, "hedge_issued": 0, "hedge_won": 0, "hedge_no_budget": 0}
+
+    # -- delay / budget ------------------------------------------------------------
+
+    def delay_ms(self, p95_ms: Optional[float]) -> Optional[float]:
+        """Hedge delay for a model whose current p95 is `p95_ms` (None: don't hedge)."""
+        if not p95_ms or p95_ms <= 0.0:
+            return None
+        return min(self.max_delay_ms, max(self.min_delay_ms, float(p95_ms)))
+
+    def _reserve(self) -> bool:
+        """Count an eligible call, earn its share of budget and try to reserve one hedge."""
+        self._incr("hedge_eligible")
+        with self._lock:
+            self._credit = min(self.burst, self._credit + self.budget)
+            if self._credit >= 1.0:
+                self._credit -= 1.0
+                return True
+            return False
+
+    def _earn_credit(self, n: float) -> None:
+        with self._lock:
+            self._credit = min(self.burst, self._credit + n)
+
+    def _incr(self, name: str) -> None:
+        # Sync calls bump counters from many caller threads at once.
+        with self._lock:
+            self.counters[name] += 1
+        if self.metrics is not None:
+            self.metrics.incr(name)
+
+    # -- sync ----------------------------------------------------------------------
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="latch-hedge")
+        return self._pool
+
+    def call(self, fn: Callable[[], Any], p95_ms: Optional[float]) -> HedgeResult:
+        """Run `fn`, hedging it once after the p95-based delay (if any, and within budget)."""
+        delay = self.delay_ms(p95_ms)
+        if delay is None:
+            return HedgeResult(fn(), False, "primary")
+        if not self._reserve():
+            # No hedge can follow, so there is nothing to race: run inline.
+            start = time.perf_counter()
+            value = fn()
+            if (time.perf_counter() - start) * 1000.0 > delay:
+                self._incr("hedge_no_budget")
+            return HedgeResult(value, False, "primary")
+        pool = self._executor()
+        primary = pool.submit(fn)
+        done, _ = wait((primary,), timeout=delay / 1000.0)
+        if done:
+            self._earn_credit(1.0)
+            return HedgeResult(primary.result(), False, "primary")
+        self._incr("hedge_issued")
+        backup = pool.submit(fn)
+        return self._first_ok(primary, backup)
+
+    def _first_ok(self, primary: Future, backup: Future) -> HedgeResult:
+        pending = {primary, backup}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Prefer the primary on a tie.
+            for fut in sorted(done, key=lambda f: f is not primary):
+                exc = fut.exception()
+                if exc is None:
+                    for other in pending:
+                        other.cancel()
+                    if fut is backup:
+                        self._incr("hedge_won")
+                    return HedgeResult(fut.result(), True, "primary" if fut is primary else "hedge")
+                if fut is primary or error is None:
+                    error = exc
+        assert error is not None
+        raise error
+
+    # -- async ---------------------------------------------------------------------
+
+    async def acall(self, make_call: Callable[[], Any], p95_ms: Optional[float]) -> HedgeResult:
+        """
+        Async variant: `make_call()` starts one attempt and returns an awaitable
+        (a plain value is returned as is, unhedged). The loser is cancelled.
+        """
+        first = make_call()
+        if not inspect.isawaitable(first):
+            return HedgeResult(first, False, "primary")
+        delay = self.delay_ms(p95_ms)
+        if delay is None:
+            return HedgeResult(await first, False, "primary")
+        reserved = self._reserve()
+        start = time.perf_counter()
+        primary = asyncio.ensure_future(first)
+        if not reserved:
+            value = await primary
+            if (time.perf_counter() - start) * 1000.0 > delay:
+                self._incr("hedge_no_budget")
+            return HedgeResult(value, False, "primary")
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay / 1000.0)
+            if done:
+                self._earn_credit(1.0)
+                return HedgeResult(primary.result(), False, "primary")
+            self._incr("hedge_issued")
+            backup = asyncio.ensure_future(make_call())
+        except BaseException:
+            primary.cancel()
+            raise
+        return await self._afirst_ok(primary, backup)
+
+    async def _afirst_ok(self, primary: "asyncio.Future[Any]", backup: "asyncio.Future[Any]") -> HedgeResult:
+        pending = {primary, backup}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for fut in sorted(done, key=lambda f: f is not primary):
+                    exc = fut.exception()
+                    if exc is None:
+                        if fut is backup:
+                            self._incr("hedge_won")
+                        return HedgeResult(fut.result(), True, "primary" if fut is primary else "hedge")
+                    if fut is primary or error is None:
+                        error = exc
+        finally:
+            for fut in pending:
+                fut.cancel()
+        assert error is not None
+        raise error
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            counters = dict(self.counters)
+        eligible = counters["hedge_eligible"]
+        return {
+            **counters,
+            "hedge_rate": counters["hedge_issued"] / eligible if eligible else 0.0,
+            "hedge_win_rate": counters["hedge_won"] / max(1, counters["hedge_issued"]),
+        }
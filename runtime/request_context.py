@@ -15,15 +15,16 @@ from typing import Any, Dict, Optional
 from uuid import uuid4
 
 from latch.types import RequestContext
+from runtime.tokenizer import Tokenizer, default_tokenizer
 
 __all__ = ["RequestContext", "build_request_context", "estimate_prompt_tokens"]
 
 
-def estimate_prompt_tokens(prompt_text: str) -> int:
-    """Very lightweight token estimate for MVP (approx 4 chars per token)."""
+def estimate_prompt_tokens(prompt_text: str, tokenizer: Optional[Tokenizer] = None) -> int:
+    """Token count for `prompt_text` (cached heuristic tokenizer unless one is given)."""
     if not prompt_text:
         return 0
-    return max(1, len(prompt_text) // 4)
+    return (tokenizer or default_tokenizer()).count(prompt_text)
 
 
 def build_request_context(
@@ -31,6 +32,9 @@ def build_request_context(
     tier: str,
     prompt_text: str,
     metadata: Optional[Dict[str, Any]] = None,
+    *,
+    prompt_tokens: Optional[int] = None,
+    tokenizer: Optional[Tokenizer] = None,
 ) -> RequestContext:
     """
     Construct a RequestContext from minimal SDK inputs.
@@ -38,15 +42,23 @@ def build_request_context(
     Notes
     - `request_type` is normalized to "user" or "background".
     - `user_id` and `trace_id` are best-effort and can be supplied via metadata.
+    - `prompt_tokens` precedence: metadata, then the argument (a count the
+      caller already has), then `tokenizer`.
     """
     meta: Dict[str, Any] = dict(metadata or {})
     normalized = (request_type or "user").strip().lower()
     is_background = normalized == "background"
 
     user_id = str(meta.pop("user_id", "anonymous"))
-    trace_id = str(meta.pop("trace_id", uuid4().hex))
+    # Defaults are computed only when missing (uuid4 is not free on the hot path).
+    trace_id = meta.pop("trace_id", None)
+    trace_id = uuid4().hex if trace_id is None else str(trace_id)
 
-    prompt_tokens = int(meta.pop("prompt_tokens", estimate_prompt_tokens(prompt_text)))
+    override = meta.pop("prompt_tokens", None)
+    if override is not None:
+        prompt_tokens = int(override)
+    elif prompt_tokens is None:
+        prompt_tokens = estimate_prompt_tokens(prompt_text, tokenizer)
 
     # Keep RequestContext.metadata as str->str for now. Non-strings are coerced.
     str_meta: Dict[str, str] = {str(k): str(v) for k, v in meta.items()}
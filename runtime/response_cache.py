@@ -0,0 +1,189 @@
+"""
+Response Cache + Request Coalescing (MVP)
+
+Purpose
+- Identical prompts hitting the runtime at the same time should pay for one
+  model call, not N (singleflight).
+- Identical prompts seen recently can be answered from a bounded TTL/LRU
+  cache.
+
+Keys
+- blake2b(prompt) + model_id + effective max_tokens (+ a digest of any extra
+  call kwargs, since those can change the output).
+
+Opt-out
+- Intents with the "no_cache" constraint bypass both layers.
+
+Hard constraints for MVP
+- In-memory, per process, stdlib only.
+- Bounded: `max_entries` with LRU eviction; entries expire after `ttl_s`.
+
+Non-goals
+- Not a semantic cache; keys are exact.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+NO_CACHE_CONSTRAINT = "no_cache"
+
+
+def cache_key(prompt_text: str, model_id: str, max_tokens: Any, extra: Optional[Dict[str, Any]] = None) -> Tuple:
+    digest = hashlib.blake2b(prompt_text.encode("utf-8"), digest_size=16).digest()
+    if extra:
+        extra_digest = hashlib.blake2b(repr(sorted(extra.items())).encode("utf-8"), digest_size=8).digest()
+        return (digest, model_id, max_tokens, extra_digest)
+    return (digest, model_id, max_tokens)
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        ttl_s: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_s = float(ttl_s)
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """(hit, value); expired entries count as misses and are dropped."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_s, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+# Result handed to async followers when the leader was cancelled: retry.
+_LEADER_CANCELLED = object()
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error", "followers")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._async_flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run `fn` once per in-flight key. Returns (value, shared); shared=True for followers."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.followers += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight()
+                leader = True
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, True
+        try:
+            flight.value = fn()
+            return flight.value, False
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        asyncio variant of `do`; must be used from a single event loop.
+
+        If the leader is cancelled, its followers are not: they retry, and the
+        first one to get there runs the call for the rest.
+        """
+        while True:
+            future = self._async_flights.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            value = await asyncio.shield(future)
+            if value is not _LEADER_CANCELLED:
+                return value, True
+            self.coalesced -= 1
+        future = asyncio.get_running_loop().create_future()
+        self._async_flights[key] = future
+        try:
+            value = await fn()
+        except asyncio.CancelledError:
+            future.set_result(_LEADER_CANCELLED)
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Followers re-raise; mark it retrieved so an unawaited future is not logged.
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value, False
+        finally:
+            self._async_flights.pop(key, None)
@@ -12,23 +12,57 @@ It must NOT:
 
 from __future__ import annotations
 
+import asyncio
 import inspect
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 from uuid import uuid4
 
-from control_plane.policy_engine import decide_policy
+from control_plane.feedback_loop import FeedbackController
+from control_plane.intent_registry import IntentRegistry
+from control_plane.policy_engine import PolicyEngine, default_engine
+from control_plane.router import AUTO_MODEL, ModelRouter
 from latch.types import Intent, Policy, Signals
 from metrics.collector import MetricsCollector
+from metrics.signals import SignalsCache
+from runtime.call_plan import CallPlan, get_call_plan, reported
+from runtime.deadline import DOWNGRADE, Deadline, DeadlineConfig, DeadlineExceeded, DeadlineGuard
+from runtime.hedging import HEDGE_CONSTRAINT, Hedger
 from runtime.request_context import RequestContext, build_request_context
+from runtime.response_cache import NO_CACHE_CONSTRAINT, ResponseCache, SingleFlight, cache_key
+from runtime.streaming import AsyncTokenStream, TokenStream, is_stream
+from runtime.tokenizer import Tokenizer, as_cached
 
 
 @dataclass
 class ModelCallResult:
+    """
+    For streamed calls `value` is a TokenStream / AsyncTokenStream; latency_ms,
+    tokens_out and ttft_ms are filled in when the stream ends.
+    """
+
+    value: Any
+    latency_ms: float
+    tokens_out: int
+    ttft_ms: Optional[float] = None
+
+
+@dataclass
+class BatchItemResult:
     value: Any
     latency_ms: float
     tokens_out: int
+    error: Optional[BaseException] = None
+    ts: float = 0.0  # wall-clock completion time (0.0 for items shed before dispatch)
+    queue_depth: float = 0.0
+    cost: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
 class RequestSession:
@@ -39,13 +73,29 @@ class RequestSession:
         request_type: str,
         tier: str,
         metadata: Optional[Dict[str, Any]],
-        intent: Optional[Intent],
+        intent: Union[Intent, str, None],
+        deadline: Optional[Deadline] = None,
     ) -> None:
         self._client = client
         self._request_type = request_type
         self._tier = tier
         self._metadata: Dict[str, Any] = dict(metadata or {})
+        # One registry snapshot per session: a reload mid-request never mixes configs.
+        self._policy_engine: PolicyEngine = client.policy_engine
+        if client.intents is not None:
+            snapshot = client.intents.snapshot
+            self._policy_engine = snapshot.engine
+            if isinstance(intent, str):
+                name, intent = intent, snapshot.get(intent)
+                if intent is None:
+                    raise KeyError(f"unknown intent {name!r}")
+        elif isinstance(intent, str):
+            raise TypeError("intent names need a client built with intents=IntentRegistry(...)")
         self._intent = intent or client.intent
+        # Only with client deadlines on: an upstream deadline, else start + max_latency_ms.
+        self.deadline: Optional[Deadline] = None
+        if client.deadlines is not None:
+            self.deadline = deadline or Deadline.after_ms(self._intent.max_latency_ms)
 
         # Keep identifiers stable across multiple model calls in the same session.
         self._metadata.setdefault("user_id", self._metadata.get("user_id", "anonymous"))
@@ -53,6 +103,9 @@ class RequestSession:
 
         self.last_context: Optional[RequestContext] = None
         self.last_policy: Optional[Policy] = None
+        # Last counted prompt: a follow-up turn that extends it only counts the new suffix.
+        self._counted_prompt: Optional[str] = None
+        self._counted_tokens = 0
 
     def __enter__(self) -> "RequestSession":
         return self
@@ -60,20 +113,42 @@ class RequestSession:
     def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
         return None
 
-    def before_model_call(self, prompt_text: str) -> Tuple[RequestContext, Policy]:
-        context = build_request_context(
+    def count_prompt_tokens(self, prompt_text: str) -> int:
+        """Token count for this session's next prompt (incremental over the last one)."""
+        tokens = self._client.tokenizer.count_incremental(prompt_text, self._counted_prompt, self._counted_tokens)
+        self._counted_prompt = prompt_text
+        self._counted_tokens = tokens
+        return tokens
+
+    def _prompt_tokens(self, prompt_text: str) -> Optional[int]:
+        # An explicit metadata["prompt_tokens"] wins inside build_request_context.
+        if "prompt_tokens" in self._metadata or not prompt_text:
+            return None
+        return self.count_prompt_tokens(prompt_text)
+
+    def before_model_call(self, prompt_text: str, model_id: str = "unknown") -> Tuple[RequestContext, Policy]:
+        context = self._build_context(prompt_text)
+        return context, self._policy_for(context, model_id)
+
+    def _build_context(self, prompt_text: str) -> RequestContext:
+        return build_request_context(
             self._request_type,
             self._tier,
             prompt_text,
             metadata=self._metadata,
+            prompt_tokens=self._prompt_tokens(prompt_text),
         )
 
-        # Phase 1: stubbed signals (all zeros) to keep the hot-path shape.
-        policy = decide_policy(self._intent, Signals(), context)
+    def _policy_for(self, context: RequestContext, model_id: str) -> Policy:
+        # Precomputed snapshot; refreshed after recording, never computed here.
+        signals = self._client.signals_for((self._intent.name, self._tier, model_id))
+        policy = self._policy_engine.evaluate(self._intent, signals, context, model_id)
+        if self._client.controller is not None:
+            policy = self._client.controller.apply(policy)
 
         self.last_context = context
         self.last_policy = policy
-        return context, policy
+        return policy
 
     def after_model_call(
         self,
@@ -83,6 +158,8 @@ class RequestSession:
         tokens_out: int,
         error_type: Optional[str],
         model_id: str,
+        ttft_ms: Optional[float] = None,
+        itl_ms: Optional[float] = None,
     ) -> None:
         self._client.metrics.record_event(
             latency_ms,
@@ -92,7 +169,154 @@ class RequestSession:
             request_type=context.request_type,
             model_id=model_id,
             ts=time.time(),
+            intent=self._intent.name,
+            tier=self._tier,
+            ttft_ms=ttft_ms,
+            itl_ms=itl_ms,
+        )
+        self._client.note_event(1, (self._intent.name, self._tier, model_id))
+        self._client.feed_controller()
+
+    def _prepare_call(
+        self,
+        prompt_text: str,
+        model_id: str,
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+    ) -> Tuple[RequestContext, Dict[str, Any]]:
+        context = self._build_context(prompt_text)
+        # Route first, so the policy and the deadline check see the model that will run.
+        router = self._client.router
+        if model_id == AUTO_MODEL and router is not None:
+            cap = self._policy_engine.config.default_max_tokens if max_tokens is None else max(0, int(max_tokens))
+            model_id = router.route(self._intent, context.prompt_tokens, cap).model_id
+        policy = self._policy_for(context, model_id)
+
+        # Phase 1 placeholder enforcement: cap max_tokens using the policy output.
+        policy_cap = max(0, int(policy.max_tokens))
+        requested = policy_cap if max_tokens is None else int(max_tokens)
+        effective_max_tokens = min(max(0, requested), policy_cap)
+        if self.deadline is not None:
+            effective_max_tokens = self._check_deadline(model_id, context.prompt_tokens, effective_max_tokens)
+        call_kwargs: Dict[str, Any] = {"model": model_id, "max_tokens": effective_max_tokens, **kwargs}
+        return context, call_kwargs
+
+    def _finish_call(
+        self,
+        context: RequestContext,
+        start: float,
+        value: Any,
+        error_type: Optional[str],
+        model_id: str,
+        plan: CallPlan,
+        max_tokens: Optional[int] = None,
+    ) -> ModelCallResult:
+        if error_type is None and is_stream(value):
+            return self._stream_result(context, start, value, model_id, max_tokens)
+        latency_ms = (time.perf_counter() - start) * 1000.0
+
+        # Best-effort tokens_out extraction (strategy cached on the plan per result type).
+        tokens_out = plan.tokens_out(value)
+        self._record_call(context, latency_ms, tokens_out, error_type, model_id)
+        return ModelCallResult(value=value, latency_ms=latency_ms, tokens_out=tokens_out)
+
+    def _stream_result(
+        self,
+        context: RequestContext,
+        start: float,
+        source: Any,
+        model_id: str,
+        max_tokens: Optional[int],
+    ) -> ModelCallResult:
+        """Wrap a streamed result; the call is recorded when the stream ends."""
+        result = ModelCallResult(value=None, latency_ms=0.0, tokens_out=0)
+
+        def on_done(
+            latency_ms: float,
+            tokens_out: int,
+            ttft_ms: Optional[float],
+            itl_ms: Optional[float],
+            error_type: Optional[str],
+            truncated: bool,
+        ) -> None:
+            result.latency_ms = latency_ms
+            result.tokens_out = tokens_out
+            result.ttft_ms = ttft_ms
+            if truncated:
+                self._client.metrics.incr("stream_truncated")
+            self._record_call(context, latency_ms, tokens_out, error_type, model_id, ttft_ms, itl_ms)
+
+        wrap = TokenStream if isinstance(source, Iterator) else AsyncTokenStream
+        result.value = wrap(source, start=start, max_tokens=max_tokens, on_done=on_done)
+        return result
+
+    def _record_call(
+        self,
+        context: RequestContext,
+        latency_ms: float,
+        tokens_out: int,
+        error_type: Optional[str],
+        model_id: str,
+        ttft_ms: Optional[float] = None,
+        itl_ms: Optional[float] = None,
+    ) -> None:
+        self.after_model_call(
+            context=context,
+            latency_ms=latency_ms,
+            tokens_out=tokens_out,
+            error_type=error_type,
+            model_id=model_id,
+            ttft_ms=ttft_ms,
+            itl_ms=itl_ms,
         )
+        if self._client.router is not None:
+            self._client.router.observe(
+                model_id,
+                prompt_tokens=context.prompt_tokens,
+                tokens_out=tokens_out,
+                latency_ms=latency_ms,
+                error=error_type is not None,
+            )
+
+    def _check_deadline(self, model_id: str, prompt_tokens: int, max_tokens: int) -> int:
+        """Shed (raise DeadlineExceeded) or downgrade a call predicted to miss the deadline."""
+        guard = self._client.deadlines
+        latency_model = self._client.latency_model
+        predicted = None
+        if latency_model is not None:
+            predicted = latency_model.predict(model_id, prompt_tokens, max_tokens)
+        if predicted is None:
+            predicted = self._client.signals_for((self._intent.name, self._tier, model_id)).p50_latency_ms
+        if guard.check(self.deadline, predicted) != DOWNGRADE:
+            return max_tokens
+        fit = None
+        if latency_model is not None:
+            budget = max(0.0, self.deadline.remaining_ms()) * guard.config.headroom
+            fit = latency_model.max_tokens_for(model_id, budget, prompt_tokens)
+        return guard.downgrade_tokens(max_tokens, self.deadline, predicted, fit)
+
+    def _deadline_kwargs(self, plan: CallPlan, call_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Hand the deadline to model_fns that declare `deadline` / `timeout` parameters."""
+        deadline = self.deadline
+        if deadline is None or not plan.accepted:
+            return call_kwargs
+        extra: Dict[str, Any] = {}
+        if "deadline" in plan.accepted and "deadline" not in call_kwargs:
+            extra["deadline"] = deadline
+        if "timeout" in plan.accepted and "timeout" not in call_kwargs:
+            extra["timeout"] = deadline.timeout_s()
+        return {**call_kwargs, **extra} if extra else call_kwargs
+
+    async def _until_deadline(self, awaitable: Any) -> Any:
+        deadline = self.deadline
+        if deadline is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, deadline.timeout_s())
+        except asyncio.TimeoutError:
+            if not deadline.expired:
+                raise
+            raise DeadlineExceeded("timeout", deadline.remaining_ms()) from None
 
     def call_model(
         self,
@@ -103,60 +327,516 @@ class RequestSession:
         max_tokens: Optional[int] = None,
         **kwargs: Any,
     ) -> ModelCallResult:
-        context, policy = self.before_model_call(prompt_text)
+        context, call_kwargs = self._prepare_call(prompt_text, model_id, max_tokens, kwargs)
+        model_id = call_kwargs["model"]
+        plan = get_call_plan(model_fn)
+        key = self._cache_key(prompt_text, model_id, call_kwargs, kwargs)
+        if key is None:
+            return self._invoke(context, model_fn, plan, prompt_text, call_kwargs, model_id)
 
-        # Phase 1 placeholder enforcement: cap max_tokens using the policy output.
-        policy_cap = max(0, int(policy.max_tokens))
-        requested = policy_cap if max_tokens is None else int(max_tokens)
-        effective_max_tokens = min(max(0, requested), policy_cap)
+        start = time.perf_counter()
+        cached = self._cache_lookup(key, start)
+        if cached is not None:
+            return cached
+        result, shared = self._client.singleflight.do(
+            key, lambda: self._invoke(context, model_fn, plan, prompt_text, call_kwargs, model_id)
+        )
+        if shared and is_stream(result.value):
+            # A stream can only be consumed once: followers make their own call.
+            return self._invoke(context, model_fn, plan, prompt_text, call_kwargs, model_id)
+        return self._after_flight(key, result, shared, start)
 
-        start_ts = time.time()
+    def _invoke(
+        self,
+        context: RequestContext,
+        model_fn: Callable[..., Any],
+        plan: CallPlan,
+        prompt_text: str,
+        call_kwargs: Dict[str, Any],
+        model_id: str,
+    ) -> ModelCallResult:
         start = time.perf_counter()
         error_type: Optional[str] = None
         value: Any = None
-        tokens_out = 0
         try:
-            call_kwargs: Dict[str, Any] = {"model": model_id, "max_tokens": effective_max_tokens, **kwargs}
+            hedger = self._hedger()
+            fn_kwargs = self._deadline_kwargs(plan, call_kwargs)
+            if hedger is None:
+                value = plan.call(model_fn, prompt_text, fn_kwargs)
+            else:
+                value = hedger.call(lambda: plan.call(model_fn, prompt_text, fn_kwargs), self._p95_ms(model_id)).value
+        except Exception as exc:
+            error_type = type(exc).__name__
+            raise
+        finally:
+            result = self._finish_call(
+                context, start, value, error_type, model_id, plan, call_kwargs.get("max_tokens")
+            )
+        return result
 
-            # Avoid "retry on TypeError" because it can swallow real TypeErrors from inside model_fn.
-            # Instead, filter kwargs based on the callable signature when available.
-            try:
-                sig = inspect.signature(model_fn)
-                params = sig.parameters
-                accepts_var_kw = any(p.kind == inspect.Parameter.VAR_KEYWORD for p in params.values())
-                filtered = call_kwargs if accepts_var_kw else {k: v for k, v in call_kwargs.items() if k in params}
-                value = model_fn(prompt_text, **filtered)
-            except (TypeError, ValueError):
-                # Signature introspection can fail for builtins/extension callables; fall back to minimal call.
-                value = model_fn(prompt_text)
+    async def acall_model(
+        self,
+        prompt_text: str,
+        *,
+        model_fn: Callable[..., Any],
+        model_id: str = "unknown",
+        max_tokens: Optional[int] = None,
+        **kwargs: Any,
+    ) -> ModelCallResult:
+        """
+        Async variant of `call_model`.
+
+        Coroutine functions (or callables returning an awaitable) are awaited
+        directly on the running loop; plain callables are called inline. Metric
+        recording is in-memory and O(1), so it never blocks the loop.
+        """
+        context, call_kwargs = self._prepare_call(prompt_text, model_id, max_tokens, kwargs)
+        model_id = call_kwargs["model"]
+        plan = get_call_plan(model_fn)
+        key = self._cache_key(prompt_text, model_id, call_kwargs, kwargs)
+        if key is None:
+            return await self._ainvoke(context, model_fn, plan, prompt_text, call_kwargs, model_id)
+
+        start = time.perf_counter()
+        cached = self._cache_lookup(key, start)
+        if cached is not None:
+            return cached
+        result, shared = await self._client.singleflight.ado(
+            key, lambda: self._ainvoke(context, model_fn, plan, prompt_text, call_kwargs, model_id)
+        )
+        if shared and is_stream(result.value):
+            return await self._ainvoke(context, model_fn, plan, prompt_text, call_kwargs, model_id)
+        return self._after_flight(key, result, shared, start)
+
+    async def _ainvoke(
+        self,
+        context: RequestContext,
+        model_fn: Callable[..., Any],
+        plan: CallPlan,
+        prompt_text: str,
+        call_kwargs: Dict[str, Any],
+        model_id: str,
+    ) -> ModelCallResult:
+        start = time.perf_counter()
+        error_type: Optional[str] = None
+        value: Any = None
+        try:
+            hedger = self._hedger()
+            fn_kwargs = self._deadline_kwargs(plan, call_kwargs)
+            if hedger is None:
+                value = plan.call(model_fn, prompt_text, fn_kwargs)
+                if inspect.isawaitable(value):
+                    value = await self._until_deadline(value)
+            else:
+                hedged = await self._until_deadline(
+                    hedger.acall(lambda: plan.call(model_fn, prompt_text, fn_kwargs), self._p95_ms(model_id))
+                )
+                value = hedged.value
+        except asyncio.CancelledError:
+            error_type = "CancelledError"
+            raise
         except Exception as exc:
             error_type = type(exc).__name__
             raise
         finally:
+            result = self._finish_call(
+                context, start, value, error_type, model_id, plan, call_kwargs.get("max_tokens")
+            )
+        return result
+
+    def _hedger(self) -> Optional[Hedger]:
+        hedger = self._client.hedger
+        if hedger is None or HEDGE_CONSTRAINT not in self._intent.constraints:
+            return None
+        return hedger
+
+    def _p95_ms(self, model_id: str) -> float:
+        """The collector's current p95 for this model (hedge delay); 0.0 until it has data."""
+        return self._client.signals_for((self._intent.name, self._tier, model_id)).p95_latency_ms
+
+    # -- response cache / coalescing -----------------------------------------
+
+    def _cache_key(
+        self,
+        prompt_text: str,
+        model_id: str,
+        call_kwargs: Dict[str, Any],
+        extra: Dict[str, Any],
+    ) -> Optional[Tuple]:
+        """Cache/coalescing key, or None when both are off for this call."""
+        if self._client.singleflight is None or NO_CACHE_CONSTRAINT in self._intent.constraints:
+            return None
+        return cache_key(prompt_text, model_id, call_kwargs["max_tokens"], extra)
+
+    def _cache_lookup(self, key: Tuple, start: float) -> Optional[ModelCallResult]:
+        cache = self._client.response_cache
+        if cache is None:
+            return None
+        hit, cached = cache.lookup(key)
+        if not hit:
+            self._client.metrics.incr("cache_miss")
+            return None
+        self._client.metrics.incr("cache_hit")
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        return ModelCallResult(value=cached.value, latency_ms=latency_ms, tokens_out=cached.tokens_out)
+
+    def _after_flight(self, key: Tuple, result: ModelCallResult, shared: bool, start: float) -> ModelCallResult:
+        if shared:
+            # Follower: the leader already recorded the model event.
+            self._client.metrics.incr("coalesced")
             latency_ms = (time.perf_counter() - start) * 1000.0
+            return ModelCallResult(value=result.value, latency_ms=latency_ms, tokens_out=result.tokens_out)
+        if self._client.response_cache is not None and not is_stream(result.value):
+            self._client.response_cache.put(key, result)
+        return result
 
-            # Best-effort tokens_out extraction.
-            if isinstance(value, dict):
+    def call_model_batch(
+        self,
+        prompts: Sequence[str],
+        *,
+        model_fn: Optional[Callable[..., Any]] = None,
+        batch_fn: Optional[Callable[..., Sequence[Any]]] = None,
+        model_id: str = "unknown",
+        max_tokens: Optional[int] = None,
+        max_workers: int = 8,
+        **kwargs: Any,
+    ) -> List[BatchItemResult]:
+        """
+        Run many prompts through the same request path in one go.
+
+        - Contexts and policies are built up front against one signals snapshot.
+        - `batch_fn(prompts, model=..., max_tokens=[...], **kwargs)` is called once
+          when given; otherwise `model_fn` runs per prompt on a bounded thread pool.
+        - Deadlines apply per item: an item predicted to miss is shed or downgraded
+          before dispatch, pooled items that expire while queued are not run, and
+          `deadline` / `timeout` are passed to model_fns that accept them.
+        - Pooled items are hedged like `call_model` calls (batch_fn calls are not).
+        - Batches opt out of the response cache / coalescing and of routing
+          (AUTO_MODEL is rejected).
+        - Each item is recorded with its own completion time, and the `cost` /
+          `queue_depth` its result reports (pooled items default to the number of
+          items queued ahead of them). Metrics go out in a single bulk append.
+        - Results come back in input order; failures are per item (`error`), not raised.
+        """
+        if (model_fn is None) == (batch_fn is None):
+            raise ValueError("pass exactly one of model_fn or batch_fn")
+        if model_id == AUTO_MODEL:
+            raise ValueError("batches need an explicit model_id (routing is per call_model)")
+        prompts = list(prompts)
+        if not prompts:
+            return []
+
+        key = (self._intent.name, self._tier, model_id)
+        signals = self._client.signals_for(key)
+        contexts: List[RequestContext] = []
+        caps: List[int] = []
+        shed: Dict[int, DeadlineExceeded] = {}
+        policy: Optional[Policy] = None
+        for i, prompt_text in enumerate(prompts):
+            context = build_request_context(
+                self._request_type,
+                self._tier,
+                prompt_text,
+                metadata=self._metadata,
+                tokenizer=self._client.tokenizer,
+            )
+            policy = self._policy_engine.evaluate(self._intent, signals, context, model_id)
+            if self._client.controller is not None:
+                policy = self._client.controller.apply(policy)
+            policy_cap = max(0, int(policy.max_tokens))
+            requested = policy_cap if max_tokens is None else int(max_tokens)
+            cap = min(max(0, requested), policy_cap)
+            if self.deadline is not None:
                 try:
-                    tokens_out = int(value.get("tokens_out", 0))
-                except Exception:
-                    tokens_out = 0
+                    cap = self._check_deadline(model_id, context.prompt_tokens, cap)
+                except DeadlineExceeded as exc:
+                    shed[i] = exc
+            contexts.append(context)
+            caps.append(cap)
+        self.last_context = contexts[-1]
+        self.last_policy = policy
 
-            self.after_model_call(
-                context=context,
-                latency_ms=latency_ms,
-                tokens_out=tokens_out,
-                error_type=error_type,
-                model_id=model_id,
+        todo = [i for i in range(len(prompts)) if i not in shed]
+        if batch_fn is not None:
+            done = self._run_batch_fn(batch_fn, prompts, caps, todo, model_id, kwargs)
+        else:
+            done = self._run_pooled(model_fn, prompts, caps, todo, model_id, kwargs, max_workers)
+
+        self._client.metrics.record_events(
+            (
+                r.latency_ms,
+                contexts[i].prompt_tokens,
+                r.tokens_out,
+                None if r.error is None else type(r.error).__name__,
+                contexts[i].request_type,
+                model_id,
+                r.ts,
+                r.queue_depth,
+                r.cost,
+                self._intent.name,
+                self._tier,
             )
+            for i, r in zip(todo, done)
+        )
+        router = self._client.router
+        if router is not None:
+            for i, r in zip(todo, done):
+                router.observe(
+                    model_id,
+                    prompt_tokens=contexts[i].prompt_tokens,
+                    tokens_out=r.tokens_out,
+                    latency_ms=r.latency_ms,
+                    error=r.error is not None,
+                )
+        self._client.note_event(len(done), key)
+        self._client.feed_controller()
 
-        return ModelCallResult(value=value, latency_ms=latency_ms, tokens_out=tokens_out)
+        results: List[Optional[BatchItemResult]] = [None] * len(prompts)
+        for i, r in zip(todo, done):
+            results[i] = r
+        for i, exc in shed.items():
+            results[i] = BatchItemResult(None, 0.0, 0, exc)
+        return results  # type: ignore[return-value]
+
+    def _run_pooled(
+        self,
+        model_fn: Callable[..., Any],
+        prompts: List[str],
+        caps: List[int],
+        todo: List[int],
+        model_id: str,
+        kwargs: Dict[str, Any],
+        max_workers: int,
+    ) -> List[BatchItemResult]:
+        plan = get_call_plan(model_fn)
+        hedger = self._hedger()
+        p95_ms = self._p95_ms(model_id)
+        deadline = self.deadline
+        workers = max(1, min(int(max_workers), len(todo)))
+
+        def run_one(n: int) -> BatchItemResult:
+            i = todo[n]
+            queued_ahead = float(max(0, n - workers))
+            start = time.perf_counter()
+            try:
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceeded("expired", deadline.remaining_ms())
+                fn_kwargs = self._deadline_kwargs(plan, {"model": model_id, "max_tokens": caps[i], **kwargs})
+                if hedger is None:
+                    value = plan.call(model_fn, prompts[i], fn_kwargs)
+                else:
+                    value = hedger.call(lambda: plan.call(model_fn, prompts[i], fn_kwargs), p95_ms).value
+            except Exception as exc:
+                latency_ms = (time.perf_counter() - start) * 1000.0
+                return BatchItemResult(None, latency_ms, 0, exc, time.time(), queued_ahead)
+            latency_ms = (time.perf_counter() - start) * 1000.0
+            return BatchItemResult(
+                value,
+                latency_ms,
+                plan.tokens_out(value),
+                None,
+                time.time(),
+                reported(value, "queue_depth") or queued_ahead,
+                reported(value, "cost"),
+            )
+
+        if workers == 1:
+            return [run_one(n) for n in range(len(todo))]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="latch-batch") as pool:
+            return list(pool.map(run_one, range(len(todo))))
+
+    def _run_batch_fn(
+        self,
+        batch_fn: Callable[..., Sequence[Any]],
+        prompts: List[str],
+        caps: List[int],
+        todo: List[int],
+        model_id: str,
+        kwargs: Dict[str, Any],
+    ) -> List[BatchItemResult]:
+        if not todo:
+            return []
+        plan = get_call_plan(batch_fn)
+        call_kwargs = {"model": model_id, "max_tokens": [caps[i] for i in todo], **kwargs}
+        start = time.perf_counter()
+        try:
+            values = list(plan.call(batch_fn, [prompts[i] for i in todo], self._deadline_kwargs(plan, call_kwargs)))
+            if len(values) != len(todo):
+                raise ValueError(f"batch_fn returned {len(values)} results for {len(todo)} prompts")
+        except Exception as exc:
+            latency_ms = (time.perf_counter() - start) * 1000.0
+            ts = time.time()
+            return [BatchItemResult(None, latency_ms, 0, exc, ts) for _ in todo]
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        # One provider call: every item completes at the same moment.
+        ts = time.time()
+        return [
+            BatchItemResult(v, latency_ms, plan.tokens_out(v), None, ts, reported(v, "queue_depth"), reported(v, "cost"))
+            for v in values
+        ]
+
+
+class AsyncRequestSession(RequestSession):
+    """RequestSession whose `call_model` is the awaitable `acall_model`."""
+
+    async def __aenter__(self) -> "AsyncRequestSession":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        return None
+
+    async def call_model(  # type: ignore[override]
+        self,
+        prompt_text: str,
+        *,
+        model_fn: Callable[..., Any],
+        model_id: str = "unknown",
+        max_tokens: Optional[int] = None,
+        **kwargs: Any,
+    ) -> ModelCallResult:
+        return await self.acall_model(
+            prompt_text,
+            model_fn=model_fn,
+            model_id=model_id,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
 
 
 class LatchClient:
-    def __init__(self, *, intent: Optional[Intent] = None, metrics: Optional[MetricsCollector] = None) -> None:
+    def __init__(
+        self,
+        *,
+        intent: Optional[Intent] = None,
+        metrics: Optional[MetricsCollector] = None,
+        signals_refresh_every: int = 64,
+        signals_max_age_s: float = 1.0,
+        signals_refresh_interval_s: Optional[float] = None,
+        response_cache: Optional[ResponseCache] = None,
+        coalesce: bool = False,
+        tokenizer: Optional[Tokenizer] = None,
+        controller: Optional[FeedbackController] = None,
+        router: Optional[ModelRouter] = None,
+        hedger: Optional[Hedger] = None,
+        deadlines: Optional[DeadlineConfig] = None,
+        intents: Optional[IntentRegistry] = None,
+    ) -> None:
+        """
+        Staleness bounds for the cached Signals used by policy decisions:
+        - `signals_refresh_every`: rebuild after this many recorded events
+        - `signals_max_age_s`: rebuild on the next event once older than this
+        - `signals_refresh_interval_s`: if set, also rebuild on a background thread
+
+        Duplicate suppression (skipped for intents with the "no_cache" constraint):
+        - `response_cache`: answer repeated (prompt, model, max_tokens) calls from cache
+        - `coalesce`: concurrent identical calls share one model call (implied by a cache)
+
+        `tokenizer` counts prompt tokens (see runtime.tokenizer); it is put
+        behind an LRU cache. Default: the shared cached heuristic tokenizer.
+
+        `controller` (control_plane.feedback_loop.FeedbackController) caps
+        every policy's max_tokens / mode and is stepped on each signals refresh.
+
+        A `metrics` collector built with `partitions=PartitionedStats(...)`
+        makes policies see per-(intent, tier, model_id) signals (global ones
+        until a partition is warm).
+        A collector built with `latency_model=LatencyModel(...)` gives this
+        client a PolicyEngine that caps max_tokens by predicted latency, and
+        deadline checks use the same predictions.
+
+        `router` (control_plane.router.ModelRouter) picks the model for calls
+        made with model_id="auto" and learns from every call's outcome.
+
+        `hedger` (runtime.hedging.Hedger) re-issues slow `call_model` calls of
+        intents with the "hedge" constraint once, after the model's p95
+        latency in `metrics`, within a hedge budget.
+
+        `deadlines` (runtime.deadline.DeadlineConfig) gives each session a
+        deadline of intent.max_latency_ms (or `request(deadline=...)`): calls
+        predicted to miss it are shed or downgraded before dispatch, model_fns
+        with `deadline` / `timeout` parameters receive it, and async calls are
+        cancelled when it passes.
+
+        `intents` (control_plane.intent_registry.IntentRegistry) lets
+        `request(intent="name")` look intents up by name and makes policy
+        decisions use the registry's current rules; edits to the YAML configs
+        apply to sessions started after the reload.
+        """
         self.intent = intent or Intent(name="default")
         self.metrics = metrics or MetricsCollector()
+        self.signals = SignalsCache(
+            self.metrics,
+            refresh_every=signals_refresh_every,
+            max_age_s=signals_max_age_s,
+        )
+        if signals_refresh_interval_s is not None:
+            self.signals.start(signals_refresh_interval_s)
+        self.tokenizer = as_cached(tokenizer)
+        self.controller = controller
+        self.router = router
+        self.hedger = hedger
+        self.deadlines = DeadlineGuard(deadlines, metrics=self.metrics) if deadlines is not None else None
+        self.intents = intents
+        self.partitioned = getattr(self.metrics, "partitions", None) is not None
+        self.latency_model = getattr(self.metrics, "latency_model", None)
+        # The shared default engine has no latency model: give this client its own.
+        self.policy_engine = default_engine()
+        if self.latency_model is not None:
+            self.policy_engine = PolicyEngine(self.policy_engine.config, latency_model=self.latency_model)
+        self._controller_refreshes = self.signals.refreshes
+        self.response_cache = response_cache
+        self.singleflight: Optional[SingleFlight] = (
+            SingleFlight() if coalesce or response_cache is not None else None
+        )
+
+    def close(self) -> None:
+        self.signals.stop()
+
+    def signals_for(self, key: Tuple[str, str, str]) -> Signals:
+        return self.signals.for_key(key) if self.partitioned else self.signals.current
+
+    def note_event(self, n: int, key: Tuple[str, str, str]) -> None:
+        self.signals.note_event(n, key if self.partitioned else None)
+
+    def feed_controller(self) -> None:
+        """Step the feedback controller once per new signals snapshot."""
+        if self.controller is None or self.signals.refreshes == self._controller_refreshes:
+            return
+        self._controller_refreshes = self.signals.refreshes
+        self.controller.update(self.signals.current)
+
+    def map(
+        self,
+        prompts: Sequence[str],
+        *,
+        model_fn: Optional[Callable[..., Any]] = None,
+        batch_fn: Optional[Callable[..., Sequence[Any]]] = None,
+        model_id: str = "unknown",
+        max_tokens: Optional[int] = None,
+        max_workers: int = 8,
+        request_type: str = "background",
+        tier: str = "free",
+        metadata: Optional[Dict[str, Any]] = None,
+        intent: Union[Intent, str, None] = None,
+        **kwargs: Any,
+    ) -> List[BatchItemResult]:
+        """Fan out `prompts` through one session (see RequestSession.call_model_batch)."""
+        session = RequestSession(
+            client=self,
+            request_type=request_type,
+            tier=tier,
+            metadata=metadata,
+            intent=intent,
+        )
+        return session.call_model_batch(
+            prompts,
+            model_fn=model_fn,
+            batch_fn=batch_fn,
+            model_id=model_id,
+            max_tokens=max_tokens,
+            max_workers=max_workers,
+            **kwargs,
+        )
 
     def request(
         self,
@@ -164,7 +844,8 @@ class LatchClient:
         request_type: str = "user",
         tier: str = "free",
         metadata: Optional[Dict[str, Any]] = None,
-        intent: Optional[Intent] = None,
+        intent: Union[Intent, str, None] = None,
+        deadline: Optional[Deadline] = None,
     ) -> RequestSession:
         return RequestSession(
             client=self,
@@ -172,4 +853,27 @@ class LatchClient:
             tier=tier,
             metadata=metadata,
             intent=intent,
+            deadline=deadline,
+        )
+
+
+class AsyncLatchClient(LatchClient):
+    """LatchClient for asyncio servers: `request()` returns an AsyncRequestSession."""
+
+    def request(  # type: ignore[override]
+        self,
+        *,
+        request_type: str = "user",
+        tier: str = "free",
+        metadata: Optional[Dict[str, Any]] = None,
+        intent: Union[Intent, str, None] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> AsyncRequestSession:
+        return AsyncRequestSession(
+            client=self,
+            request_type=request_type,
+            tier=tier,
+            metadata=metadata,
+            intent=intent,
+            deadline=deadline,
         )
@@ -0,0 +1,462 @@
+"""
+Discrete-Event Queueing Simulator (MVP Simulation)
+
+Purpose
+- A load-aware stand-in for `FakeLLMD`: latency, queue depth and batch size
+  come from simulated replica state, so the control loop can be driven into
+  (and out of) real overload.
+- Runs in virtual time; a million requests simulate in seconds.
+
+Model
+- N replicas, each with its own FIFO of batches. Requests are dispatched to
+  the replica where they would start earliest (ties: fewer queued, lower index).
+- Batches are mode-homogeneous and hold up to `max_batch_size` requests. Only
+  the newest not-yet-started batch on a replica accepts joiners; a batch's
+  membership is final once it starts (or once a newer batch queues behind it).
+- Service time per batch (prefill/decode cost model):
+    overhead + prefill_ms_per_token * sum(prompt_tokens)
+             + max(tokens_out) * (decode_step_ms + decode_step_ms_per_seq * (batch - 1))
+  scaled by the runtime mode ("fast" 0.7x, "cheap" 1.2x, like FakeLLMD).
+- Optional autoscaling: when queued requests per live replica exceed
+  `scale_up_queue_depth`, one more replica comes online after
+  `scale_up_delay_ms`; replicas idle for `scale_down_idle_ms` are retired.
+
+Determinism
+- All randomness (sampled tokens_out, gateway inter-arrival gaps) comes from
+  one `random.Random(seed)`.
+
+Closed loop
+- `run_closed_loop()` drives the simulator through load phases in virtual
+  time with a FeedbackController-style controller (or static caps): every
+  tick the p95 of completed requests is fed to the controller, whose token
+  cap bounds sampled outputs and whose concurrency cap sheds arrivals.
+
+Results
+- `run()` yields exact results, once each batch's membership is final.
+- `submit()` / `execute()` answer at placement time; a later request joining
+  the same open batch can lengthen it, and earlier answers are not revised.
+
+Non-goals
+- Not a performance-accurate GPU model (no KV-cache pressure, no preemption).
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from latch.types import Signals
+
+_MODE_SPEED = {"fast": 0.7, "cheap": 1.2}
+
+
+@dataclass(frozen=True)
+class SimConfig:
+    replicas: int = 4
+    max_batch_size: int = 16
+    batch_overhead_ms: float = 5.0
+    prefill_ms_per_token: float = 0.02
+    decode_step_ms: float = 2.0
+    decode_step_ms_per_seq: float = 0.1
+    default_tokens_out: int = 32
+    # Autoscaling (off unless max_replicas > replicas).
+    min_replicas: Optional[int] = None
+    max_replicas: Optional[int] = None
+    scale_up_queue_depth: float = 16.0
+    scale_up_delay_ms: float = 30_000.0
+    scale_down_idle_ms: float = 60_000.0
+
+
+class SimResult(NamedTuple):
+    seq: int
+    arrival_ms: float
+    start_ms: float
+    finish_ms: float
+    replica: int
+    queue_depth: int  # requests waiting on the replica when this one arrived
+    batch_size: int
+    prompt_tokens: int
+    tokens_out: int
+    mode: str
+    cost: float
+
+    @property
+    def latency_ms(self) -> float:
+        return self.finish_ms - self.arrival_ms
+
+    @property
+    def queue_ms(self) -> float:
+        return self.start_ms - self.arrival_ms
+
+
+class _Batch:
+    __slots__ = ("mode", "start_ms", "members", "prompt_sum", "max_out", "service_ms")
+
+    def __init__(self, mode: str, start_ms: float) -> None:
+        self.mode = mode
+        self.start_ms = start_ms
+        # (seq, arrival_ms, prompt_tokens, tokens_out, queue_depth)
+        self.members: List[Tuple[int, float, int, int, int]] = []
+        self.prompt_sum = 0
+        self.max_out = 0
+        self.service_ms = 0.0
+
+
+class _Replica:
+    __slots__ = ("index", "ready_ms", "free_ms", "batches", "queued", "retired")
+
+    def __init__(self, index: int, ready_ms: float) -> None:
+        self.index = index
+        self.ready_ms = ready_ms
+        self.free_ms = ready_ms  # finish time of the last started batch
+        self.batches: Deque[_Batch] = deque()  # started-or-not, in start order
+        self.queued = 0  # requests in batches that have not started yet
+        self.retired = False
+
+    def tail_ms(self) -> float:
+        """When the replica drains everything already placed on it."""
+        if self.batches:
+            last = self.batches[-1]
+            return last.start_ms + last.service_ms
+        return self.free_ms
+
+
+class QueueSimulator:
+    def __init__(self, config: Optional[SimConfig] = None, *, seed: int = 0) -> None:
+        self.config = config or SimConfig()
+        self.rng = random.Random(seed)
+        self.now_ms = 0.0
+        self._seq = 0
+        self._replicas: List[_Replica] = [_Replica(i, 0.0) for i in range(max(1, self.config.replicas))]
+        self.completed = 0
+        self.scale_ups = 0
+        self.scale_downs = 0
+
+    # -- public API ------------------------------------------------------------
+
+    @property
+    def replicas(self) -> int:
+        return sum(1 for r in self._replicas if not r.retired)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(r.queued for r in self._replicas)
+
+    def sample_tokens_out(self, cap: Optional[int] = None) -> int:
+        """Seeded output length, geometric-ish around `default_tokens_out`."""
+        n = max(1, int(self.rng.expovariate(1.0 / max(1, self.config.default_tokens_out))) + 1)
+        return min(n, cap) if cap else n
+
+    def submit(
+        self,
+        arrival_ms: float,
+        prompt_tokens: int,
+        tokens_out: Optional[int] = None,
+        mode: str = "balanced",
+    ) -> SimResult:
+        """Place one request (arrivals must be non-decreasing) and return its placement-time result."""
+        batch, replica = self._place(arrival_ms, prompt_tokens, tokens_out, mode, None)
+        return self._result(batch, replica, batch.members[-1])
+
+    def run(self, arrivals: Iterable[Sequence]) -> Iterator[SimResult]:
+        """
+        Simulate `(arrival_ms, prompt_tokens[, tokens_out[, mode]])` rows in
+        arrival order; yields exact results as batches become final.
+        """
+        final: List[Tuple[_Batch, _Replica]] = []
+        for row in arrivals:
+            n = len(row)
+            self._place(
+                float(row[0]),
+                int(row[1]),
+                int(row[2]) if n > 2 and row[2] is not None else None,
+                str(row[3]) if n > 3 else "balanced",
+                final,
+            )
+            if final:
+                for batch, replica in final:
+                    yield from self._batch_results(batch, replica)
+                final.clear()
+        for replica in self._replicas:
+            while replica.batches:
+                batch = replica.batches.popleft()
+                replica.queued -= len(batch.members)
+                self.completed += len(batch.members)
+                yield from self._batch_results(batch, replica)
+
+    # -- internals -------------------------------------------------------------
+
+    def _place(
+        self,
+        arrival_ms: float,
+        prompt_tokens: int,
+        tokens_out: Optional[int],
+        mode: str,
+        final: Optional[List[Tuple[_Batch, _Replica]]],
+    ) -> Tuple[_Batch, _Replica]:
+        t = max(arrival_ms, self.now_ms)
+        self.now_ms = t
+        self._advance(t, final)
+        if self.config.max_replicas is not None:
+            self._autoscale(t)
+        if tokens_out is None:
+            tokens_out = self.sample_tokens_out()
+
+        cap = self.config.max_batch_size
+        best: Optional[_Replica] = None
+        best_start = float("inf")
+        best_queued = 0
+        join_best = False
+        for replica in self._replicas:
+            if replica.retired or replica.ready_ms > t:
+                continue
+            joinable = False
+            if replica.batches:
+                last = replica.batches[-1]
+                if last.start_ms >= t and last.mode == mode and len(last.members) < cap:
+                    start, joinable = last.start_ms, True
+                else:
+                    start = last.start_ms + last.service_ms
+            else:
+                start = replica.free_ms
+            if start < t:
+                start = t
+            # Strict comparisons keep the lowest index on ties.
+            if start < best_start or (start == best_start and replica.queued < best_queued):
+                best, best_start, best_queued, join_best = replica, start, replica.queued, joinable
+        if best is None:
+            # Every replica is still warming up: wait for the first one.
+            best = min((r for r in self._replicas if not r.retired), key=lambda r: (r.ready_ms, r.index))
+            join_best = False
+
+        queue_depth = best.queued
+        if join_best:
+            batch = best.batches[-1]
+        else:
+            batch = _Batch(mode, max(t, best.tail_ms()))
+            best.batches.append(batch)
+        self._seq += 1
+        batch.members.append((self._seq, arrival_ms, int(prompt_tokens), int(tokens_out), queue_depth))
+        batch.prompt_sum += int(prompt_tokens)
+        batch.max_out = max(batch.max_out, int(tokens_out))
+        batch.service_ms = self._service_ms(batch)
+        best.queued += 1
+        return batch, best
+
+    def _advance(self, t: float, final: Optional[List[Tuple[_Batch, _Replica]]]) -> None:
+        """Start every batch whose start time has passed (membership becomes final)."""
+        for replica in self._replicas:
+            batches = replica.batches
+            while batches and batches[0].start_ms < t:
+                batch = batches.popleft()
+                replica.queued -= len(batch.members)
+                replica.free_ms = batch.start_ms + batch.service_ms
+                self.completed += len(batch.members)
+                if final is not None:
+                    final.append((batch, replica))
+
+    def _autoscale(self, t: float) -> None:
+        cfg = self.config
+        live = [r for r in self._replicas if not r.retired]
+        ready = [r for r in live if r.ready_ms <= t]
+        warming = len(ready) < len(live)
+        if (
+            not warming
+            and len(live) < int(cfg.max_replicas or 0)
+            and self.queue_depth > cfg.scale_up_queue_depth * max(1, len(ready))
+        ):
+            self._replicas.append(_Replica(len(self._replicas), t + cfg.scale_up_delay_ms))
+            self.scale_ups += 1
+            return
+        floor = max(1, cfg.min_replicas if cfg.min_replicas is not None else cfg.replicas)
+        if len(ready) > floor:
+            for replica in reversed(ready):
+                if not replica.batches and replica.free_ms + cfg.scale_down_idle_ms <= t:
+                    replica.retired = True
+                    self.scale_downs += 1
+                    break
+
+    def _service_ms(self, batch: _Batch) -> float:
+        cfg = self.config
+        step_ms = cfg.decode_step_ms + cfg.decode_step_ms_per_seq * (len(batch.members) - 1)
+        service = cfg.batch_overhead_ms + cfg.prefill_ms_per_token * batch.prompt_sum + batch.max_out * step_ms
+        return service * _MODE_SPEED.get(batch.mode, 1.0)
+
+    def _result(self, batch: _Batch, replica: _Replica, member: Tuple[int, float, int, int, int]) -> SimResult:
+        seq, arrival_ms, prompt_tokens, tokens_out, queue_depth = member
+        return SimResult(
+            seq=seq,
+            arrival_ms=arrival_ms,
+            start_ms=batch.start_ms,
+            finish_ms=batch.start_ms + batch.service_ms,
+            replica=replica.index,
+            queue_depth=queue_depth,
+            batch_size=len(batch.members),
+            prompt_tokens=prompt_tokens,
+            tokens_out=tokens_out,
+            mode=batch.mode,
+            cost=(prompt_tokens / 1000.0) * (0.002 if batch.mode == "cheap" else 0.004),
+        )
+
+    def _batch_results(self, batch: _Batch, replica: _Replica) -> Iterator[SimResult]:
+        for member in batch.members:
+            yield self._result(batch, replica, member)
+
+
+class SimulatedLLMD:
+    """
+    Drop-in `FakeLLMD` replacement backed by a QueueSimulator.
+
+    Requests arrive open-loop in virtual time: `arrival_ms` from the request if
+    present, otherwise a seeded exponential gap at `arrival_rate_per_s`.
+    `execute` is serialized, so a hedging gateway may call it from several
+    threads (QueueSimulator itself is single-threaded).
+    """
+
+    def __init__(
+        self,
+        config: Optional[SimConfig] = None,
+        *,
+        seed: int = 0,
+        arrival_rate_per_s: float = 50.0,
+    ) -> None:
+        self.sim = QueueSimulator(config, seed=seed)
+        self.arrival_rate_per_s = float(arrival_rate_per_s)
+        self._clock_ms = 0.0
+        self._lock = threading.Lock()
+
+    def execute(self, request: Dict[str, str]) -> Dict[str, str]:
+        cap = request.get("max_tokens")
+        tokens_out = request.get("tokens_out")
+        with self._lock:
+            if request.get("arrival_ms"):
+                self._clock_ms = max(self._clock_ms, float(request["arrival_ms"]))
+            elif self.arrival_rate_per_s > 0:
+                self._clock_ms += self.sim.rng.expovariate(self.arrival_rate_per_s) * 1000.0
+            result = self.sim.submit(
+                self._clock_ms,
+                int(request.get("prompt_tokens", "256")),
+                int(tokens_out) if tokens_out else self.sim.sample_tokens_out(int(cap) if cap else None),
+                request.get("mode", "balanced"),
+            )
+        return {
+            "status": "ok",
+            "echo": request.get("intent", "unknown"),
+            "action": request.get("action", "none"),
+            "latency_ms": f"{result.latency_ms:.1f}",
+            "queue_depth": str(result.queue_depth),
+            "batch_size": str(result.batch_size),
+            "cost": f"{result.cost:.4f}",
+            "replica": str(result.replica),
+            "tokens_out": str(result.tokens_out),
+        }
+
+
+# -- closed loop -------------------------------------------------------------------
+
+
+class ControlWindow(NamedTuple):
+    t_s: float
+    phase: int
+    p95_ms: float
+    max_tokens: int
+    concurrency_cap: int  # 0 = no cap (static run)
+    mode: str
+    shed: int  # arrivals shed so far
+
+
+class ClosedLoopRun(NamedTuple):
+    windows: List[ControlWindow]
+    transitions: int  # recommended mode changes
+    shed: int
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def run_closed_loop(
+    controller: Optional[Any],
+    phases: Sequence[Tuple[float, float]],
+    *,
+    config: Optional[SimConfig] = None,
+    seed: int = 0,
+    tick_ms: float = 1000.0,
+    static_max_tokens: int = 512,
+    prompt_tokens: Tuple[int, int] = (128, 1024),
+) -> ClosedLoopRun:
+    """
+    Poisson arrivals through `phases` ((duration_s, arrivals/s) pairs). With
+    `controller` None, every request gets `static_max_tokens` and nothing is
+    shed. Otherwise `controller.update(Signals, now=...)` runs every tick and
+    its `max_tokens` / `concurrency_cap` / `mode` are applied and recorded.
+    """
+    sim = QueueSimulator(config, seed=seed)
+    rng = random.Random(seed)
+    inflight: List[float] = []  # finish_ms of admitted requests
+    completions: List[Tuple[float, float]] = []  # (finish_ms, latency_ms)
+    windows: List[ControlWindow] = []
+    transitions = 0
+    shed = 0
+    t_ms = 0.0
+    next_tick = tick_ms
+    phase_end = 0.0
+
+    for phase, (duration_s, rate) in enumerate(phases):
+        phase_end += duration_s * 1000.0
+        while True:
+            t_ms += rng.expovariate(rate) * 1000.0
+            while next_tick <= min(t_ms, phase_end):
+                done: List[float] = []
+                while completions and completions[0][0] <= next_tick:
+                    done.append(heapq.heappop(completions)[1])
+                p95 = _pct(done, 0.95)
+                mode = "static"
+                if controller is not None:
+                    feedback = controller.update(Signals(p95_latency_ms=p95), now=next_tick / 1000.0)
+                    transitions += feedback.recommended_mode is not None
+                    mode = controller.mode
+                windows.append(
+                    ControlWindow(
+                        next_tick / 1000.0,
+                        phase,
+                        p95,
+                        controller.max_tokens if controller is not None else static_max_tokens,
+                        controller.concurrency_cap if controller is not None else 0,
+                        mode,
+                        shed,
+                    )
+                )
+                next_tick += tick_ms
+            if t_ms > phase_end:
+                t_ms = phase_end
+                break
+            while inflight and inflight[0] <= t_ms:
+                heapq.heappop(inflight)
+            if controller is not None and len(inflight) >= controller.concurrency_cap:
+                shed += 1
+                continue
+            cap = controller.max_tokens if controller is not None else static_max_tokens
+            result = sim.submit(t_ms, rng.randint(*prompt_tokens), sim.sample_tokens_out(cap))
+            heapq.heappush(inflight, result.finish_ms)
+            heapq.heappush(completions, (result.finish_ms, result.latency_ms))
+    return ClosedLoopRun(windows, transitions, shed)
+
+
+def direction_changes(values: Sequence[int]) -> int:
+    """How often a series turns around (up -> down or down -> up); flat steps are ignored."""
+    changes, last = 0, 0
+    for a, b in zip(values, values[1:]):
+        step = (b > a) - (b < a)
+        if step and last and step != last:
+            changes += 1
+        if step:
+            last = step
+    return changes
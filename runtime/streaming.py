@@ -0,0 +1,194 @@
+"""
+Streaming Model Results (MVP)
+
+Purpose
+- Let `call_model` pass generator / async-iterator results straight through
+  to the caller (no buffering) while measuring what users feel:
+  - ttft_ms: call start -> first chunk
+  - itl_ms: mean gap between consecutive chunks
+  - tokens_out: chunks yielded (one chunk = one token, as providers stream)
+- Enforce the policy's max_tokens mid-stream: the chunk that reaches the
+  cap is the last one handed out; the source is closed right after it,
+  without pulling another chunk. That counts as truncated
+  ("stream_truncated") unless the chunk carries the source's own finish
+  signal (a `finish_reason` key / attribute other than "length"), i.e. the
+  source said it was done anyway. A source that ends before the cap is a
+  normal finish.
+
+Recording
+- Metrics are recorded once, when the stream is exhausted, raises, is
+  truncated, or is closed by the caller (`close()` / `aclose()` / `with`).
+  A stream that is abandoned without being closed is never recorded.
+
+Hard constraints for MVP
+- Per-chunk work is a counter bump and a clock read; stdlib only.
+
+Non-goals
+- No re-chunking, detokenization or buffering of the stream.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncIterator, Iterator
+from typing import Any, Callable, Optional
+
+# on_done(latency_ms, tokens_out, ttft_ms, itl_ms, error_type, truncated)
+OnDone = Callable[[float, int, Optional[float], Optional[float], Optional[str], bool], None]
+
+
+def _finished(chunk: Any) -> bool:
+    """The chunk says the source ended on its own (not by hitting a length cap)."""
+    reason = chunk.get("finish_reason") if isinstance(chunk, dict) else getattr(chunk, "finish_reason", None)
+    return reason is not None and reason != "length"
+
+
+def is_stream(value: Any) -> bool:
+    """True for results `call_model` should stream (iterators, async iterators)."""
+    return isinstance(value, (Iterator, AsyncIterator)) and not isinstance(value, (str, bytes, dict))
+
+
+class _StreamState:
+    __slots__ = ("start", "max_tokens", "on_done", "tokens", "first", "last", "done")
+
+    def __init__(self, start: float, max_tokens: Optional[int], on_done: OnDone) -> None:
+        self.start = start
+        self.max_tokens = max_tokens
+        self.on_done = on_done
+        self.tokens = 0
+        self.first = 0.0
+        self.last = 0.0
+        self.done = False
+
+    def tick(self) -> None:
+        now = time.perf_counter()
+        if self.tokens == 0:
+            self.first = now
+        self.last = now
+        self.tokens += 1
+
+    @property
+    def capped(self) -> bool:
+        return self.max_tokens is not None and self.tokens >= self.max_tokens
+
+    def finish(self, error_type: Optional[str] = None, truncated: bool = False) -> None:
+        if self.done:
+            return
+        self.done = True
+        n = self.tokens
+        ttft_ms = (self.first - self.start) * 1000.0 if n else None
+        itl_ms = (self.last - self.first) * 1000.0 / (n - 1) if n > 1 else None
+        latency_ms = (time.perf_counter() - self.start) * 1000.0
+        self.on_done(latency_ms, n, ttft_ms, itl_ms, error_type, truncated)
+
+
+class TokenStream:
+    """Pass-through wrapper for a sync iterator result."""
+
+    def __init__(self, source: Iterator[Any], *, start: float, max_tokens: Optional[int], on_done: OnDone) -> None:
+        self._source = source
+        self._state = _StreamState(start, max_tokens, on_done)
+
+    @property
+    def tokens_out(self) -> int:
+        return self._state.tokens
+
+    def __iter__(self) -> "TokenStream":
+        return self
+
+    def __next__(self) -> Any:
+        state = self._state
+        if state.done:
+            raise StopIteration
+        if state.capped:  # max_tokens=0
+            self._close_source()
+            state.finish(truncated=True)
+            raise StopIteration
+        try:
+            chunk = next(self._source)
+        except StopIteration:
+            state.finish()
+            raise
+        except Exception as exc:
+            state.finish(type(exc).__name__)
+            raise
+        state.tick()
+        if state.capped:
+            # Last chunk allowed: cut the source off now instead of pulling past the cap.
+            self._close_source()
+            state.finish(truncated=not _finished(chunk))
+        return chunk
+
+    def _close_source(self) -> None:
+        close = getattr(self._source, "close", None)
+        if close is not None:
+            close()
+
+    def close(self) -> None:
+        """Stop early: close the source and record what was streamed so far."""
+        if not self._state.done:
+            self._close_source()
+            self._state.finish()
+
+    def __enter__(self) -> "TokenStream":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+
+class AsyncTokenStream:
+    """Pass-through wrapper for an async iterator result."""
+
+    def __init__(
+        self, source: AsyncIterator[Any], *, start: float, max_tokens: Optional[int], on_done: OnDone
+    ) -> None:
+        self._source = source
+        self._state = _StreamState(start, max_tokens, on_done)
+
+    @property
+    def tokens_out(self) -> int:
+        return self._state.tokens
+
+    def __aiter__(self) -> "AsyncTokenStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        state = self._state
+        if state.done:
+            raise StopAsyncIteration
+        if state.capped:  # max_tokens=0
+            await self._close_source()
+            state.finish(truncated=True)
+            raise StopAsyncIteration
+        try:
+            chunk = await self._source.__anext__()
+        except StopAsyncIteration:
+            state.finish()
+            raise
+        except BaseException as exc:
+            state.finish(type(exc).__name__)
+            raise
+        state.tick()
+        if state.capped:
+            # Last chunk allowed: cut the source off now instead of pulling past the cap.
+            await self._close_source()
+            state.finish(truncated=not _finished(chunk))
+        return chunk
+
+    async def _close_source(self) -> None:
+        aclose = getattr(self._source, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    async def aclose(self) -> None:
+        """Stop early: close the source and record what was streamed so far."""
+        if not self._state.done:
+            await self._close_source()
+            self._state.finish()
+
+    async def __aenter__(self) -> "AsyncTokenStream":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        await self.aclose()
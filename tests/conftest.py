@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# `latch` first: it wires up control_plane/runtime/metrics in import order.
+import latch  # noqa: E402,F401
@@ -0,0 +1,43 @@
+import threading
+
+from runtime.admission import AdmissionController, TokenBucket
+
+
+def test_token_bucket_never_overdraws_under_contention():
+    clock = lambda: 0.0  # no refill: exactly `burst` takes can succeed
+    bucket = TokenBucket(1.0, 500, clock=clock)
+    taken = [0] * 8
+    barrier = threading.Barrier(len(taken))
+
+    def worker(slot: int) -> None:
+        barrier.wait()
+        for _ in range(1000):
+            if bucket.try_take():
+                taken[slot] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(taken))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(taken) == 500
+
+
+def test_rate_limited_tier_admits_exactly_burst():
+    admission = AdmissionController(concurrency_cap=10_000, tier_rates={"free": (0.0, 50)}, clock=lambda: 0.0)
+    results = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+        for _ in range(20):
+            a = admission.acquire(traffic_class=1, tier="free")
+            with lock:
+                results.append(a.reason)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results.count("admitted") == 50
+    assert admission.counters["rate_limited"] == 160 - 50
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from latch import AsyncLatchClient, Intent
+
+
+async def _model(prompt, *, model, max_tokens):
+    await asyncio.sleep(0.001)
+    return {"tokens_out": 7, "cost": 0.01}
+
+
+def test_acall_model_records_one_event_per_awaited_call():
+    client = AsyncLatchClient(intent=Intent(name="chat"))
+
+    async def main():
+        session = client.request(tier="pro")
+        return await asyncio.gather(*(session.call_model(f"q{i}", model_fn=_model, model_id="m") for i in range(20)))
+
+    results = asyncio.run(main())
+    assert all(r.tokens_out == 7 for r in results)
+    rows = list(client.metrics.store.rows())
+    assert len(rows) == 20
+    assert {row[6] for row in rows} == {"m"}
+    assert all(row[1] >= 1.0 for row in rows)  # latency includes the awaited sleep
+    assert client.metrics.snapshot()["count"] == 20
+
+
+def test_acall_model_runs_plain_callables_inline():
+    client = AsyncLatchClient()
+
+    async def main():
+        return await client.request().call_model("q", model_fn=lambda p, model, max_tokens: {"tokens_out": 2})
+
+    assert asyncio.run(main()).tokens_out == 2
+    assert len(client.metrics.store) == 1
+
+
+def test_acall_model_records_the_error_type_and_reraises():
+    client = AsyncLatchClient()
+
+    async def broken(prompt, *, model, max_tokens):
+        raise TimeoutError("backend")
+
+    async def main():
+        await client.request().call_model("q", model_fn=broken, model_id="m")
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(main())
+    assert client.metrics.last_event().error_type == "TimeoutError"
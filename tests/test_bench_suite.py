@@ -0,0 +1,19 @@
+from benchmarks.suite import CALIBRATION, compare
+
+BASELINE = {"decide_policy": 0.4, "record_event": 6.0, CALIBRATION: 25.0}
+
+
+def test_jitter_under_the_noise_floor_is_not_a_regression():
+    # +75% on a sub-microsecond case is still only 0.3 us.
+    current = {"decide_policy": 0.7, "record_event": 6.5, CALIBRATION: 25.0}
+    assert compare(current, BASELINE, 30.0) == []
+
+
+def test_slowdown_past_percentage_and_floor_fails():
+    current = {"decide_policy": 0.4, "record_event": 12.0, CALIBRATION: 25.0}
+    assert compare(current, BASELINE, 30.0) == ["record_event"]
+
+
+def test_baseline_spread_widens_the_floor():
+    current = {"decide_policy": 0.4, "record_event": 12.0, CALIBRATION: 25.0}
+    assert compare(current, BASELINE, 30.0, {"record_event": 7.0}) == []
@@ -0,0 +1,62 @@
+import time
+
+from latch import LatchClient
+from runtime.deadline import Deadline, DeadlineConfig, DeadlineExceeded
+
+
+def _model(prompt, model=None, max_tokens=None):
+    return {"text": prompt, "tokens_out": 3, "cost": 0.25, "queue_depth": 2}
+
+
+def test_pooled_items_record_cost_queue_depth_and_own_ts():
+    client = LatchClient()
+
+    def slow(prompt, model=None, max_tokens=None):
+        time.sleep(0.01)
+        return {"tokens_out": 1, "cost": 0.5}
+
+    results = client.map(["a", "b", "c", "d"], model_fn=slow, model_id="m", max_workers=2)
+    assert all(r.ok for r in results)
+    rows = list(client.metrics.store.rows())
+    assert [row[8] for row in rows] == [0.5] * 4
+    # No reported queue depth: items 2 and 3 waited behind the two workers.
+    assert sorted(row[7] for row in rows) == [0.0, 0.0, 0.0, 1.0]
+    assert len({row[0] for row in rows}) == 4
+
+
+def test_batch_fn_reports_cost_and_queue_depth():
+    client = LatchClient()
+    results = client.map(["a", "b"], batch_fn=lambda ps, model=None, max_tokens=None: [_model(p) for p in ps],
+                         model_id="m")
+    assert [r.cost for r in results] == [0.25, 0.25]
+    rows = list(client.metrics.store.rows())
+    assert [(row[7], row[8]) for row in rows] == [(2.0, 0.25), (2.0, 0.25)]
+
+
+def test_expired_deadline_sheds_items_without_calling_the_model():
+    client = LatchClient(deadlines=DeadlineConfig())
+    calls = []
+
+    def model(prompt, model=None, max_tokens=None):
+        calls.append(prompt)
+        return _model(prompt)
+
+    session = client.request(deadline=Deadline.after_ms(-1.0))
+    results = session.call_model_batch(["a", "b"], model_fn=model, model_id="m")
+    assert not calls
+    assert all(isinstance(r.error, DeadlineExceeded) for r in results)
+    assert len(client.metrics.store) == 0
+
+
+def test_deadline_is_passed_to_model_fns_that_accept_it():
+    client = LatchClient(deadlines=DeadlineConfig())
+    seen = []
+
+    def model(prompt, model=None, max_tokens=None, timeout=None):
+        seen.append(timeout)
+        return _model(prompt)
+
+    session = client.request(deadline=Deadline.after_ms(60_000.0))
+    results = session.call_model_batch(["a", "b", "c"], model_fn=model, model_id="m")
+    assert all(r.ok for r in results)
+    assert len(seen) == 3 and all(t is not None and 0 < t <= 60.0 for t in seen)
@@ -0,0 +1,96 @@
+import pytest
+
+from latch import Intent, LatchClient
+from latch.types import Signals
+from metrics.collector import MetricsCollector
+from runtime.deadline import DOWNGRADE, ON_TIME, SHED, Deadline, DeadlineConfig, DeadlineExceeded, DeadlineGuard
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _deadline(budget_ms: float):
+    clock = _Clock()
+    return Deadline.after_ms(budget_ms, clock), clock
+
+
+def test_predicted_miss_is_shed():
+    metrics = MetricsCollector()
+    guard = DeadlineGuard(DeadlineConfig(on_predicted_miss=SHED), metrics=metrics)
+    deadline, _ = _deadline(500.0)
+    assert guard.check(deadline, 400.0) == ON_TIME
+    with pytest.raises(DeadlineExceeded) as info:
+        guard.check(deadline, 800.0)
+    assert info.value.reason == "predicted_miss"
+    assert (info.value.remaining_ms, info.value.predicted_ms) == (500.0, 800.0)
+    assert metrics.counters == {"deadline_shed": 1}
+
+
+def test_expired_deadline_is_shed_whatever_the_prediction():
+    guard = DeadlineGuard(DeadlineConfig(on_predicted_miss=DOWNGRADE))
+    deadline, clock = _deadline(500.0)
+    clock.now += 0.5
+    with pytest.raises(DeadlineExceeded) as info:
+        guard.check(deadline, 0.0)
+    assert info.value.reason == "expired"
+
+
+def test_every_nth_predicted_miss_is_let_through_as_a_probe():
+    guard = DeadlineGuard(DeadlineConfig(probe_every=5))
+    deadline, _ = _deadline(100.0)
+    outcomes = []
+    for _ in range(10):
+        try:
+            outcomes.append(guard.check(deadline, 1000.0))
+        except DeadlineExceeded:
+            outcomes.append(SHED)
+    assert outcomes == [SHED] * 4 + [ON_TIME] + [SHED] * 4 + [ON_TIME]
+
+
+def test_downgrade_scales_max_tokens_to_the_remaining_budget():
+    guard = DeadlineGuard(DeadlineConfig(on_predicted_miss=DOWNGRADE, headroom=0.8, min_tokens=16))
+    deadline, _ = _deadline(500.0)
+    assert guard.check(deadline, 1000.0) == DOWNGRADE
+    # 0.8 * 500 ms of a predicted 1000 ms fits 40% of the tokens.
+    assert guard.downgrade_tokens(512, deadline, 1000.0) == 204
+    assert guard.downgrade_tokens(512, deadline, 1_000_000.0) == 16  # floor
+    assert guard.downgrade_tokens(8, deadline, 1_000_000.0) == 8  # floor never raises the cap
+    assert guard.downgrade_tokens(512, deadline, 1000.0, fit_tokens=300) == 300  # latency model fit wins
+    assert guard.downgrade_tokens(512, deadline, 1000.0, fit_tokens=4096) == 512
+
+
+def _slow_client(config: DeadlineConfig, monkeypatch) -> LatchClient:
+    client = LatchClient(deadlines=config)
+    monkeypatch.setattr(client, "signals_for", lambda key: Signals(p50_latency_ms=4000.0))
+    return client
+
+
+def test_call_model_sheds_a_call_predicted_to_miss(monkeypatch):
+    client = _slow_client(DeadlineConfig(on_predicted_miss=SHED), monkeypatch)
+    calls = []
+    session = client.request(intent=Intent(name="chat", max_latency_ms=1000))
+    with pytest.raises(DeadlineExceeded):
+        session.call_model("q", model_fn=lambda p, **kw: calls.append(kw), model_id="m")
+    assert calls == []
+    assert client.metrics.counters["deadline_shed"] == 1
+
+
+def test_call_model_downgrades_max_tokens_and_passes_the_timeout(monkeypatch):
+    client = _slow_client(DeadlineConfig(on_predicted_miss=DOWNGRADE), monkeypatch)
+    seen = {}
+
+    def model_fn(prompt, *, model, max_tokens, timeout):
+        seen.update(max_tokens=max_tokens, timeout=timeout)
+        return {"tokens_out": max_tokens}
+
+    session = client.request(intent=Intent(name="chat", max_latency_ms=1000))
+    session.call_model("q", model_fn=model_fn, model_id="m", max_tokens=400)
+    # About 0.8 * 1000 ms of a predicted 4000 ms: a fifth of the requested tokens.
+    assert 16 <= seen["max_tokens"] <= 80
+    assert 0.0 < seen["timeout"] <= 1.0
+    assert client.metrics.counters["deadline_downgraded"] == 1
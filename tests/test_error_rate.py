@@ -0,0 +1,52 @@
+from metrics.collector import MetricsCollector
+from metrics.rolling_stats import RollingStats
+
+
+def _outcome(allowed: bool, action: str = "allow", error_type: str = "") -> dict:
+    return {
+        "allowed": "true" if allowed else "false",
+        "action": action,
+        "latency_ms": "10",
+        "cost": "0.001",
+        "queue_depth": "1",
+        "error_type": error_type,
+    }
+
+
+def test_denials_and_sheds_are_not_errors():
+    metrics = MetricsCollector()
+    metrics.record(_outcome(True))
+    metrics.record(_outcome(False, action="deny"))
+    metrics.record(_outcome(False, action="shed"))
+    metrics.record(_outcome(True))
+    snap = metrics.snapshot()
+    assert snap["error_rate"] == 0.0
+    assert snap["allow_rate"] == 0.5
+    assert snap["denied"] == 1
+    assert snap["shed"] == 1
+
+
+def test_outcome_error_type_feeds_error_rate():
+    metrics = MetricsCollector()
+    for _ in range(3):
+        metrics.record(_outcome(True))
+    metrics.record(_outcome(True, error_type="Timeout"))
+    assert metrics.snapshot()["error_rate"] == 0.25
+
+
+def test_sdk_events_count_failed_calls_as_errors():
+    metrics = MetricsCollector()
+    for _ in range(3):
+        metrics.record_event(10.0, 5, 5, None, "user", "m", 1.0)
+    metrics.record_event(10.0, 5, 0, "RuntimeError", "user", "m", 1.0)
+    snap = metrics.stats.recent.snapshot(now=1.0)
+    assert snap["error_rate"] == 0.25
+
+
+def test_rolling_stats_error_defaults_to_not_allowed():
+    stats = RollingStats()
+    stats.record(False, 10.0, 0.0, 0.0, ts=1.0)
+    stats.record(False, 10.0, 0.0, 0.0, ts=1.0, error=False)
+    stats.record(True, 10.0, 0.0, 0.0, ts=1.0)
+    stats.record(True, 10.0, 0.0, 0.0, ts=1.0)
+    assert stats.recent.snapshot(now=1.0)["error_rate"] == 0.25
@@ -0,0 +1,63 @@
+import pytest
+
+from metrics import event_store
+from metrics.collector import MetricsCollector
+from metrics.event_store import ColumnarEventStore
+
+
+@pytest.fixture(params=["numpy", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(event_store, "np", None)
+    return request.param
+
+
+def _append(store: ColumnarEventStore, ts: float, latency_ms: float, model_id: str = "m") -> None:
+    store.append(ts, latency_ms, 1, 1, "", "user", model_id, 0.0, 0.0)
+
+
+def test_time_range_bisects_while_ordered(backend):
+    store = ColumnarEventStore(capacity=16)
+    for i in range(10):
+        _append(store, float(i), float(i))
+    assert store.ordered
+    assert store.time_range(3.0, 7.0) == (3, 7)
+    assert store.percentiles((0.0, 1.0), t0=3.0, t1=7.0) == [3.0, 6.0]
+
+
+def test_out_of_order_appends_are_not_missed(backend):
+    store = ColumnarEventStore(capacity=16)
+    for ts in (1.0, 2.0, 5.0, 3.0, 4.0, 9.0, 0.5):
+        _append(store, ts, ts * 10, "a" if ts < 4 else "b")
+    assert not store.ordered
+    # Every row with 2 <= ts < 5, wherever it landed in the ring.
+    assert sorted(store.percentiles((0.0, 0.5, 1.0), t0=2.0, t1=5.0)) == [20.0, 30.0, 40.0]
+    groups = store.group_by_model(t0=2.0, t1=5.0)
+    assert groups["a"]["count"] == 2 and groups["b"]["count"] == 1
+    assert store.percentiles((0.0,), t0=100.0) == [0.0]
+
+
+def test_order_is_restored_once_the_inversion_is_evicted(backend):
+    store = ColumnarEventStore(capacity=4)
+    for ts in (5.0, 1.0, 2.0, 3.0):
+        _append(store, ts, ts)
+    assert not store.ordered
+    _append(store, 4.0, 4.0)  # evicts 5.0; 1 <= 2 <= 3 <= 4 again
+    assert store.ordered
+    assert store.time_range(2.0, 4.0) == (1, 3)
+
+
+def test_record_event_and_record_events_store_identical_rows():
+    one, bulk = MetricsCollector(), MetricsCollector()
+    one.record_event(12.0, 3, 4, " Timeout ", "user", "m", 1.0, queue_depth=2.0, cost_estimate=0.5,
+                     intent="chat", tier="pro", ttft_ms=3.0, itl_ms=1.5)
+    one.record_event(8.0, 1, 2, None, "", "", 2.0)
+    bulk.record_events([
+        (12.0, 3, 4, " Timeout ", "user", "m", 1.0, 2.0, 0.5, "chat", "pro", 3.0, 1.5),
+        (8.0, 1, 2, None, "", "", 2.0),
+    ])
+    assert one.events() == bulk.events()
+    assert one.stats.streams == bulk.stats.streams == 1
+    assert one.snapshot()["p50_itl_ms"] == bulk.snapshot()["p50_itl_ms"]
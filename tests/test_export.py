@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from metrics.collector import MetricsCollector
+from metrics.export import DROP_OLDEST, SAMPLE, ExportSink, MetricsExporter
+
+
+class _SlowSink(ExportSink):
+    def __init__(self, delay_s: float = 0.02) -> None:
+        self.delay_s = delay_s
+        self.events = 0
+        self.threads = set()
+        self.closed = False
+
+    def write_batch(self, events) -> None:
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay_s)
+        self.events += len(events)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _StuckSink(_SlowSink):
+    def __init__(self) -> None:
+        super().__init__(0.0)
+        self.release = threading.Event()
+        self.entered = threading.Event()
+
+    def write_batch(self, events) -> None:
+        self.entered.set()
+        self.release.wait(5.0)
+        super().write_batch(events)
+
+
+def _row(i: int) -> tuple:
+    return (float(i), 10.0, 1, 1, "", "user", "m", 0.0, 0.0, 0.0, 0.0)
+
+
+def test_slow_sink_never_blocks_recording():
+    for policy in (DROP_OLDEST, SAMPLE):
+        sink = _SlowSink()
+        exporter = MetricsExporter(sink, max_queue=500, batch_size=100, flush_interval_s=0.01, policy=policy)
+        metrics = MetricsCollector(exporter=exporter)
+        n = 20_000
+        start = time.perf_counter()
+        for i in range(n):
+            metrics.record_event(10.0, 1, 1, None, "user", "m", float(i))
+        elapsed = time.perf_counter() - start
+        exporter.close()
+        # 20k records against a sink taking 20 ms per 100-event batch would need
+        # ~4 s if recording waited on it.
+        assert elapsed < 2.0
+        assert exporter.dropped + exporter.sampled_out > 0
+        assert exporter.exported == sink.events
+        if policy == SAMPLE:
+            assert exporter.exported + exporter.dropped + exporter.sampled_out == n
+        assert sink.closed
+
+
+def test_close_does_not_hang_or_race_a_stuck_sink():
+    sink = _StuckSink()
+    exporter = MetricsExporter(sink, batch_size=1, flush_interval_s=0.01)
+    exporter.offer(_row(0))
+    assert sink.entered.wait(2.0)
+    for i in range(1, 10):
+        exporter.offer(_row(i))
+
+    start = time.perf_counter()
+    exporter.close(timeout_s=0.1)
+    assert time.perf_counter() - start < 1.0
+    assert exporter.close_timeouts == 1
+    assert not sink.closed
+    assert exporter.queue_depth == 9  # not drained on the caller thread
+
+    sink.release.set()
+    exporter.close()
+    assert sink.closed
+    assert sink.events == 10
+    assert sink.threads == {"latch-metrics-export"}
+
+
+def test_sink_without_write_batch_fails_at_construction():
+    class Incomplete(ExportSink):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
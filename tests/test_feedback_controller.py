@@ -0,0 +1,63 @@
+import pytest
+
+from control_plane.feedback_loop import ControllerConfig, FeedbackController
+from latch.types import Signals
+from runtime.simulator import SimConfig, direction_changes, run_closed_loop
+
+TARGET_MS = 2000.0
+SETTLE_S = 20.0
+# steady -> spike -> steady: (duration_s, arrivals/s)
+PHASES = ((60.0, 20.0), (60.0, 90.0), (60.0, 20.0))
+SIM = SimConfig(replicas=4, max_batch_size=16, default_tokens_out=192)
+
+
+def simulate(controller):
+    return run_closed_loop(controller, PHASES, config=SIM, seed=11, static_max_tokens=512)
+
+
+def _settled(windows, phase):
+    start_s = sum(d for d, _ in PHASES[:phase])
+    return [w for w in windows if w.phase == phase and w.t_s - start_s > SETTLE_S]
+
+
+def _within_target(windows, phase):
+    settled = _settled(windows, phase)
+    return sum(w.p95_ms <= TARGET_MS * 1.25 for w in settled) / len(settled)
+
+
+@pytest.fixture(scope="module")
+def controlled():
+    return simulate(FeedbackController(TARGET_MS, ControllerConfig()))
+
+
+@pytest.mark.parametrize("phase", range(len(PHASES)))
+def test_p95_converges_in_every_phase(controlled, phase):
+    assert _within_target(controlled.windows, phase) >= 0.9
+
+
+def test_static_caps_miss_the_target_during_the_spike():
+    assert _within_target(simulate(None).windows, 1) < 0.9
+
+
+def test_controller_stays_stable_through_the_spike(controlled):
+    windows = controlled.windows
+    assert controlled.transitions <= 4
+    spike_caps = [w.max_tokens for w in _settled(windows, 1)]
+    assert direction_changes(spike_caps) <= len(spike_caps) // 4
+    assert "degraded" in [w.mode for w in windows if w.phase == 1]
+    assert [w.mode for w in windows if w.phase == 2][-1] == "normal"
+
+
+def test_controller_backs_off_then_recovers():
+    controller = FeedbackController(1000.0, ControllerConfig())
+    start = controller.max_tokens
+    t = 0.0
+    for _ in range(30):
+        t += 1.0
+        controller.update(Signals(p95_latency_ms=3000.0), now=t)
+    assert controller.max_tokens < start
+    low = controller.max_tokens
+    for _ in range(120):
+        t += 1.0
+        controller.update(Signals(p95_latency_ms=200.0), now=t)
+    assert controller.max_tokens > low
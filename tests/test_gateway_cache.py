@@ -0,0 +1,25 @@
+from control_plane.config import load_intents
+from demo.demo_agent import DemoAgent
+from demo.traffic_simulator import generate_traffic, prompt_for
+from runtime.response_cache import ResponseCache
+
+
+def test_demo_path_hits_the_gateway_cache_for_repeated_prompts():
+    agent = DemoAgent(response_cache=ResponseCache())
+    intent, context = next(iter(generate_traffic()))
+    first = agent.handle(intent, context, True, "summarize this")
+    second = agent.handle(intent, context, True, "summarize this")
+    other = agent.handle(intent, context, True, "summarize that")
+    assert [first["cache"], second["cache"], other["cache"]] == ["miss", "hit", "miss"]
+    assert agent.metrics.counters["cache_hit"] == 1
+
+
+def test_translator_carries_prompt_and_policy_cap():
+    agent = DemoAgent()
+    intent = load_intents()["summarize"]
+    _, context = next(iter(generate_traffic()))
+    request = agent.translator.translate(
+        intent, agent._baseline_decision(), prompt=prompt_for(intent, context), max_tokens=256
+    )
+    assert request["prompt"] == prompt_for(intent, context)
+    assert request["max_tokens"] == "256"
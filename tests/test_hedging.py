@@ -0,0 +1,119 @@
+import asyncio
+import sys
+import threading
+import time
+
+from latch import Intent, LatchClient
+from runtime.hedging import HEDGE_CONSTRAINT, Hedger
+
+
+def test_unhedgeable_calls_run_on_the_caller_thread():
+    hedger = Hedger(burst=0.0, budget=0.0)
+    seen = []
+    result = hedger.call(lambda: seen.append(threading.current_thread()) or "ok", 5.0)
+    assert result.value == "ok" and not result.hedged
+    assert seen == [threading.current_thread()]
+    assert hedger._pool is None
+    hedger.close()
+
+
+def test_slow_unhedgeable_call_counts_no_budget():
+    hedger = Hedger(burst=0.0, budget=0.0, min_delay_ms=1.0, max_delay_ms=1.0)
+    hedger.call(lambda: time.sleep(0.01), 5.0)
+    assert hedger.counters["hedge_no_budget"] == 1
+    assert hedger.counters["hedge_issued"] == 0
+
+
+def test_fast_primary_refunds_its_reserved_credit():
+    hedger = Hedger(burst=1.0, budget=0.0, max_delay_ms=1_000.0)
+    for _ in range(5):
+        hedger.call(lambda: "ok", 5.0)
+    assert hedger._credit == 1.0
+    hedger.close()
+
+
+def test_backup_wins_when_primary_stalls():
+    hedger = Hedger(min_delay_ms=5.0, max_delay_ms=5.0)
+    calls = []
+    lock = threading.Lock()
+
+    def fn() -> str:
+        with lock:
+            calls.append(None)
+            first = len(calls) == 1
+        time.sleep(0.5 if first else 0.001)
+        return "primary" if first else "backup"
+
+    start = time.perf_counter()
+    result = hedger.call(fn, 5.0)
+    assert time.perf_counter() - start < 0.4
+    assert result.hedged and result.winner == "hedge" and result.value == "backup"
+    assert hedger.counters["hedge_won"] == 1
+    hedger.close()
+
+
+def test_counters_are_exact_under_concurrent_callers():
+    hedger = Hedger(burst=0.0, budget=0.0)
+    per_thread = 500
+    threads = [
+        threading.Thread(target=lambda: [hedger.call(lambda: None, 5.0) for _ in range(per_thread)])
+        for _ in range(8)
+    ]
+    old = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(old)
+    assert hedger.counters["hedge_eligible"] == 8 * per_thread
+
+
+def test_no_delay_no_hedging():
+    hedger = Hedger()
+    assert hedger.call(lambda: "ok", None) == ("ok", False, "primary")
+    assert hedger.call(lambda: "ok", 0.0) == ("ok", False, "primary")
+    assert hedger.counters["hedge_eligible"] == 0
+
+
+def test_sync_and_async_spend_the_same_budget():
+    # Every primary outlives the 1 ms delay: all hedging is limited by the budget.
+    n, budget, burst = 60, 0.1, 2.0
+
+    sync = Hedger(budget=budget, burst=burst, min_delay_ms=1.0, max_delay_ms=1.0)
+    for _ in range(n):
+        sync.call(lambda: time.sleep(0.01), 1.0)
+    sync.close()
+
+    async def slow():
+        await asyncio.sleep(0.01)
+
+    async def run(hedger):
+        for _ in range(n):
+            await hedger.acall(slow, 1.0)
+
+    asyn = Hedger(budget=budget, burst=burst, min_delay_ms=1.0, max_delay_ms=1.0)
+    asyncio.run(run(asyn))
+
+    for hedger in (sync, asyn):
+        assert hedger.counters["hedge_eligible"] == n
+        assert hedger.counters["hedge_issued"] <= budget * n + burst
+        assert hedger.counters["hedge_issued"] + hedger.counters["hedge_no_budget"] == n
+    assert sync.counters["hedge_issued"] == asyn.counters["hedge_issued"]
+
+
+def test_sdk_hedge_delay_comes_from_the_collector_p95():
+    hedger = Hedger()
+    client = LatchClient(intent=Intent(name="chat", constraints=[HEDGE_CONSTRAINT]), hedger=hedger)
+    session = client.request()
+    model = lambda prompt, *, model, max_tokens: {"tokens_out": 1}  # noqa: E731
+    session.call_model("q", model_fn=model, model_id="m")
+    # No p95 in the collector yet: the first call is not even eligible.
+    assert hedger.counters["hedge_eligible"] == 0
+    client.signals.refresh()
+    assert client.metrics.snapshot()["p95_latency_ms"] > 0
+    session.call_model("q", model_fn=model, model_id="m")
+    assert hedger.counters["hedge_eligible"] == 1
+    hedger.close()
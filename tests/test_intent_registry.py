@@ -0,0 +1,50 @@
+import shutil
+import time
+
+from control_plane.config import DEFAULT_INTENTS_PATH, DEFAULT_POLICIES_PATH
+from control_plane.intent_registry import IntentRegistry
+from metrics.collector import MetricsCollector
+
+
+def _registry(tmp_path):
+    intents_path = tmp_path / "default_intents.yaml"
+    policies_path = tmp_path / "policies.yaml"
+    shutil.copyfile(DEFAULT_INTENTS_PATH, intents_path)
+    shutil.copyfile(DEFAULT_POLICIES_PATH, policies_path)
+    metrics = MetricsCollector()
+    return IntentRegistry(intents_path, policies_path, metrics=metrics), metrics
+
+
+def test_missing_file_counts_one_failure_until_it_comes_back(tmp_path):
+    registry, metrics = _registry(tmp_path)
+    text = registry.intents_path.read_text(encoding="utf-8")
+    registry.intents_path.unlink()
+    for _ in range(5):
+        assert not registry.check()
+    assert metrics.counters["intent_registry_reload_failed"] == 1
+    assert isinstance(registry.last_error, OSError)
+
+    registry.intents_path.write_text(text, encoding="utf-8")
+    assert registry.check()
+    assert registry.last_error is None
+    assert registry.snapshot.version == 2
+
+    registry.intents_path.unlink()
+    assert not registry.check()
+    assert metrics.counters["intent_registry_reload_failed"] == 2
+
+
+def test_watcher_thread_picks_up_edits_and_stops(tmp_path):
+    registry, metrics = _registry(tmp_path)
+    registry.start(0.01)
+    try:
+        text = registry.intents_path.read_text(encoding="utf-8")
+        registry.intents_path.write_text(text + "\n", encoding="utf-8")
+        for _ in range(200):
+            if registry.snapshot.version > 1:
+                break
+            time.sleep(0.01)
+    finally:
+        registry.stop()
+    assert registry.snapshot.version == 2
+    assert metrics.counters["intent_registry_reload"] == 1
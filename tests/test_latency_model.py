@@ -0,0 +1,67 @@
+import random
+
+from control_plane.latency_model import LatencyModel
+from latch import Intent, LatchClient
+from metrics.collector import MetricsCollector
+
+TRUTH = (20.0, 0.02, 0.5, 3.0)
+
+
+def _feed(model, rng, w, n):
+    for _ in range(n):
+        prompt, out, queue = rng.randint(50, 4000), rng.randint(1, 800), float(rng.randint(0, 8))
+        latency = w[0] + w[1] * prompt + w[2] * out + w[3] * queue + rng.gauss(0.0, 2.0)
+        model.observe("m", prompt_tokens=prompt, tokens_out=out, queue_depth=queue, latency_ms=latency)
+    model.update()
+
+
+def test_rls_converges_to_the_synthetic_coefficients():
+    model = LatencyModel(interval_s=None)
+    rng = random.Random(7)
+    _feed(model, rng, TRUTH, 10)
+    assert model.predict("m", 100, 100) is None  # not warm yet
+    _feed(model, rng, TRUTH, 3000)
+    coefs, n = model.coefficients("m")
+    assert n == 3010
+    for got, want, tol in zip(coefs, TRUTH, (1.0, 0.001, 0.01, 0.2)):
+        assert abs(got - want) <= tol
+    assert abs(model.predict("m", 1000, 200) - (20 + 20 + 100)) < 2.0
+
+
+def test_forgetting_tracks_a_drifted_per_token_cost():
+    model = LatencyModel(interval_s=None)
+    rng = random.Random(11)
+    _feed(model, rng, TRUTH, 2000)
+    _feed(model, rng, (TRUTH[0], TRUTH[1], 1.0, TRUTH[3]), 1500)
+    assert abs(model.coefficients("m")[0][2] - 1.0) < 0.02
+
+
+def test_max_tokens_for_inverts_the_prediction():
+    model = LatencyModel(interval_s=None)
+    _feed(model, random.Random(3), TRUTH, 2000)
+    fit = model.max_tokens_for("m", 300.0, 1000)
+    assert abs(model.predict("m", 1000, fit) - 300.0) < 2.0
+    assert model.max_tokens_for("m", 10.0, 1000) == 0
+
+
+def test_offer_never_fits_on_the_callers_thread():
+    model = LatencyModel(interval_s=60.0)
+    for _ in range(1000):
+        model.observe("m", prompt_tokens=100, tokens_out=10, latency_ms=5.0)
+    # Queued only; the first offer started the background updater.
+    assert model.updates == 0
+    assert model._updater.running
+    model.stop()
+    assert model.updates == 1000
+    assert not model._updater.running
+
+
+def test_client_policies_use_the_collectors_latency_model():
+    model = LatencyModel(interval_s=None)
+    _feed(model, random.Random(5), (30.0, 0.05, 0.45, 0.0), 500)
+    client = LatchClient(metrics=MetricsCollector(latency_model=model))
+    assert client.policy_engine.latency_model is model
+    session = client.request(tier="pro", intent=Intent(name="chat", max_latency_ms=300))
+    _, policy = session.before_model_call("x " * 3000, model_id="m")
+    assert policy.notes == "predicted_latency"
+    assert model.predict("m", session.last_context.prompt_tokens, policy.max_tokens) <= 300.0
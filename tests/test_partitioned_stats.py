@@ -0,0 +1,58 @@
+import sys
+import threading
+
+from metrics.collector import MetricsCollector
+from metrics.partitioned_stats import PartitionedStats
+
+KEY = ("summarize", "pro", "m")
+
+
+def _hammer(target, threads: int = 8) -> None:
+    barrier = threading.Barrier(threads)
+
+    def run(slot: int) -> None:
+        barrier.wait()
+        for i in range(3000):
+            target(slot, i)
+
+    workers = [threading.Thread(target=run, args=(n,)) for n in range(threads)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # force interleaving inside record()
+    try:
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_shared_partition_sketch_matches_window_under_concurrency():
+    partitions = PartitionedStats(window=64)
+
+    def record(slot: int, i: int) -> None:
+        partitions.record(KEY, True, float(i % 500), 0.0, 0.0, ts=1.0)
+        partitions.record_stream(KEY, float(i % 50), 1.0)
+
+    _hammer(record)
+    stats = partitions.get(KEY)
+    assert stats.count == 8 * 3000
+    assert stats.sketch.count == len(stats.window) == 64
+    assert stats.ttft_sketch.count == len(stats.ttft_window)
+    assert partitions.snapshot(KEY)["count"] == 8 * 3000
+
+
+def test_collectors_sharing_partitions_keep_them_consistent():
+    partitions = PartitionedStats(window=64)
+    collectors = [MetricsCollector(partitions=partitions) for _ in range(8)]
+
+    def record(slot: int, i: int) -> None:
+        collectors[slot].record_event(
+            float(i % 500), 10, 5, None, "user", "m", 1.0, intent="summarize", tier="pro", ttft_ms=2.0, itl_ms=1.0
+        )
+
+    _hammer(record)
+    stats = partitions.get(KEY)
+    assert stats.count == 8 * 3000
+    assert stats.sketch.count == len(stats.window)
+    assert stats.ttft_sketch.count == len(stats.ttft_window)
@@ -0,0 +1,57 @@
+import threading
+import time
+
+from metrics.periodic import PeriodicTask
+
+
+def _wait_for(predicate, timeout_s=2.0):
+    deadline = time.monotonic() + timeout_s
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return predicate()
+
+
+def test_ticks_until_stopped_and_survives_errors():
+    calls = []
+
+    def fn():
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError("first tick fails")
+
+    task = PeriodicTask("latch-test", fn)
+    task.start(0.001)
+    assert task.running
+    assert _wait_for(lambda: len(calls) >= 3)
+    assert task.stop()
+    assert not task.running and task.errors == 1
+    n = len(calls)
+    time.sleep(0.01)
+    assert len(calls) == n
+
+
+def test_wake_runs_the_next_tick_early():
+    ticked = threading.Event()
+    task = PeriodicTask("latch-test", ticked.set)
+    task.start(60.0)
+    task.wake()
+    assert ticked.wait(2.0)
+    assert task.stop()
+
+
+def test_stop_timeout_keeps_the_thread_for_a_later_stop():
+    release = threading.Event()
+    entered = threading.Event()
+
+    def fn():
+        entered.set()
+        release.wait(5.0)
+
+    task = PeriodicTask("latch-test", fn)
+    task.start(0.001)
+    assert entered.wait(2.0)
+    assert not task.stop(0.01)
+    assert task.running
+    release.set()
+    assert task.stop()
+    assert not task.running
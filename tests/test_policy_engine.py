@@ -0,0 +1,78 @@
+from control_plane.config import PolicyConfig
+from control_plane.policy_engine import PolicyEngine
+from latch.types import Intent, Policy, RequestContext, Signals
+
+
+def reference_policy(intent: Intent, signals: Signals, ctx: RequestContext) -> Policy:
+    """The original hand-written rule chain the compiled engine must reproduce."""
+    if "deny" in intent.constraints:
+        return Policy("degraded", "throughput", 0, "explicit_deny")
+    if signals.error_rate > 0.05 or signals.queue_depth > 8:
+        return Policy("degraded", "throughput", 128, "system_hot")
+    if signals.p95_latency_ms > intent.max_latency_ms:
+        return Policy("degraded", "latency", 256, "latency_hot")
+    if signals.cost_rate > intent.max_cost:
+        return Policy("degraded", "throughput", 192, "cost_hot")
+    if intent.max_latency_ms <= 400 or intent.priority >= 8:
+        return Policy("normal", "latency", max(256, ctx.prompt_tokens // 2), "latency_priority")
+    if ctx.tier == "free":
+        return Policy("normal", "throughput", 256, "free_tier")
+    return Policy("normal", "throughput", 512, "default")
+
+
+INTENTS = [
+    Intent(name="summarize", priority=1, max_latency_ms=800, max_cost=0.004),
+    Intent(name="classify", priority=2, max_latency_ms=400, max_cost=0.003),
+    Intent(name="urgent", priority=9, max_latency_ms=2000, max_cost=0.01),
+    Intent(name="chat", priority=5, max_latency_ms=1200, max_cost=0.01),
+    Intent(name="blocked", constraints=["deny"]),
+]
+SIGNALS = [
+    Signals(),
+    Signals(p95_latency_ms=900.0),
+    Signals(queue_depth=9.0),
+    Signals(error_rate=0.1),
+    Signals(cost_rate=0.005),
+]
+
+
+def _ctx(i: int = 0, prompt_tokens: int = 0, tier: str = "pro") -> RequestContext:
+    return RequestContext(user_id="u", trace_id=str(i), prompt_tokens=prompt_tokens, tier=tier, is_background=False)
+
+
+def test_compiled_engine_matches_the_reference_rules():
+    engine = PolicyEngine(PolicyConfig())
+    for i in range(3000):
+        intent = INTENTS[i % len(INTENTS)]
+        signals = SIGNALS[(i // 7) % len(SIGNALS)]
+        ctx = _ctx(i, (i * 97) % 3000, "free" if i % 3 else "pro")
+        assert engine.evaluate(intent, signals, ctx) == reference_policy(intent, signals, ctx)
+
+
+def test_latency_priority_cap_uses_the_exact_prompt_size():
+    engine = PolicyEngine(PolicyConfig())
+    urgent = INTENTS[2]
+    assert engine.evaluate(urgent, Signals(), _ctx(prompt_tokens=1001)).max_tokens == 500
+    assert engine.evaluate(urgent, Signals(), _ctx(prompt_tokens=1003)).max_tokens == 501
+    assert engine.evaluate(urgent, Signals(), _ctx(prompt_tokens=10)).max_tokens == 256
+
+
+def test_memo_is_bounded_and_hits_return_the_same_instance():
+    engine = PolicyEngine(PolicyConfig(), memo_size=8)
+    chat = INTENTS[3]
+    first = engine.evaluate(chat, Signals(), _ctx(tier="pro"))
+    assert engine.evaluate(chat, Signals(), _ctx(tier="pro")) is first
+    for latency in range(1000, 1100):
+        engine.evaluate(Intent(name="x", max_latency_ms=latency), Signals(), _ctx())
+    assert len(engine._memo) <= 8
+
+
+def test_identical_outputs_are_interned_and_the_table_is_bounded():
+    engine = PolicyEngine(PolicyConfig(), memo_size=16)
+    urgent = INTENTS[2]
+    a = engine.evaluate(urgent, Signals(), _ctx(prompt_tokens=2000))
+    b = engine.evaluate(urgent, Signals(), _ctx(prompt_tokens=2001))
+    assert a is b
+    for tokens in range(600, 5000):
+        engine.evaluate(urgent, Signals(), _ctx(prompt_tokens=tokens))
+    assert len(engine._interned) <= 16
@@ -0,0 +1,67 @@
+from control_plane.router import AUTO_MODEL, ModelRouter, ModelSpec
+from latch import Intent, LatchClient
+from runtime.deadline import DeadlineConfig
+
+CHEAP = ModelSpec("cheap", cost_per_1k_tokens=0.5, prior_ms_per_token=2.0, mode="cheap")
+FAST = ModelSpec("fast", cost_per_1k_tokens=5.0, prior_ms_per_token=0.2, mode="fast")
+
+
+def _router(**kwargs):
+    return ModelRouter([FAST, CHEAP], **kwargs)
+
+
+def test_routes_to_the_cheapest_model_that_fits_the_latency_budget():
+    router = _router()
+    loose = router.route(Intent(name="batch", max_latency_ms=5000, max_cost=10.0), 500, 500)
+    assert (loose.model_id, loose.reason, loose.action) == ("cheap", "cheapest_feasible", "route_economy")
+    # 1000 tokens * 2 ms/token does not fit 0.8 * 1000 ms; the fast model does.
+    tight = router.route(Intent(name="chat", max_latency_ms=1000, max_cost=10.0), 500, 500)
+    assert (tight.model_id, tight.reason) == ("fast", "cheapest_feasible")
+
+
+def test_falls_back_to_the_fastest_model_when_nothing_fits():
+    route = _router().route(Intent(name="chat", max_latency_ms=10, max_cost=10.0), 500, 500)
+    assert (route.model_id, route.reason) == ("fast", "fastest")
+
+
+def test_observed_latency_replaces_the_prior():
+    router = _router()
+    intent = Intent(name="batch", max_latency_ms=5000, max_cost=10.0)
+    assert router.route(intent, 500, 500).model_id == "cheap"
+    for _ in range(10):
+        router.observe("cheap", prompt_tokens=500, tokens_out=500, latency_ms=20_000.0)
+    assert router.route(intent, 500, 500).model_id == "fast"
+
+
+def test_explores_a_model_it_stopped_choosing():
+    router = _router(explore_after=10)
+    intent = Intent(name="batch", max_latency_ms=5000, max_cost=10.0)
+    routes = [router.route(intent, 500, 500) for _ in range(30)]
+    explored = [r for r in routes if r.reason == "explore"]
+    assert explored and all(r.model_id == "fast" for r in explored)
+    assert sum(r.model_id == "cheap" for r in routes) > len(routes) // 2
+    assert router.counters["explore"] == len(explored)
+
+
+def test_auto_model_is_routed_before_policy_and_deadline_checks(monkeypatch):
+    client = LatchClient(router=_router(), deadlines=DeadlineConfig())
+    seen = []
+    signals_for = client.signals_for
+
+    def spy(key):
+        seen.append(key[2])
+        return signals_for(key)
+
+    monkeypatch.setattr(client, "signals_for", spy)
+    calls = []
+
+    def model_fn(prompt, *, model, max_tokens):
+        calls.append(model)
+        return {"tokens_out": 3}
+
+    intent = Intent(name="batch", max_latency_ms=5000, max_cost=10.0)
+    client.request(intent=intent).call_model("hello", model_fn=model_fn, model_id=AUTO_MODEL)
+    assert calls == ["cheap"]
+    # The policy lookup and the deadline prediction both ran against the routed model.
+    assert seen[:2] == ["cheap", "cheap"]
+    assert AUTO_MODEL not in seen
@@ -0,0 +1,94 @@
+import sys
+import threading
+
+from control_plane.latency_model import LatencyModel
+from metrics.export import SAMPLE, ExportSink, MetricsExporter
+from metrics.partitioned_stats import PartitionedStats
+from metrics.sharded_collector import ShardedMetricsCollector
+
+THREADS = 8
+PER_THREAD = 2000
+TOTAL = THREADS * PER_THREAD
+
+
+class _NullSink(ExportSink):
+    def write_batch(self, events):
+        pass
+
+
+def _run_threads(fn) -> None:
+    barrier = threading.Barrier(THREADS)
+
+    def run(slot: int) -> None:
+        barrier.wait()
+        for i in range(PER_THREAD):
+            fn(slot, i)
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(THREADS)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_concurrent_recording_loses_nothing_across_shards_and_shared_consumers():
+    partitions = PartitionedStats(window=64)
+    exporter = MetricsExporter(_NullSink(), max_queue=TOTAL // 4, policy=SAMPLE, start=False)
+    model = LatencyModel(interval_s=None)
+    metrics = ShardedMetricsCollector(shards=4, partitions=partitions, exporter=exporter, latency_model=model)
+
+    def record(slot: int, i: int) -> None:
+        metrics.record_event(
+            10.0 + i % 100, 100, 20, None, "user", f"m{slot % 2}", 1.0,
+            intent="summarize", tier="pro", ttft_ms=5.0, itl_ms=1.0,
+        )
+        metrics.incr("calls")
+
+    _run_threads(record)
+
+    snap = metrics.snapshot()
+    assert snap["count"] == TOTAL
+    assert snap["streams"] == TOTAL
+    assert metrics.counters["calls"] == TOTAL
+    for model_id in ("m0", "m1"):
+        stats = partitions.get(("summarize", "pro", model_id))
+        assert stats.count == TOTAL // 2
+        assert stats.sketch.count == len(stats.window)
+        assert stats.ttft_sketch.count == len(stats.ttft_window)
+    # Every offer is accounted for exactly once, and the sample policy never overfills the queue.
+    assert exporter.queue_depth + exporter.dropped + exporter.sampled_out == TOTAL
+    assert exporter.queue_depth <= exporter.max_queue
+    model.update()
+    assert model.updates == TOTAL
+
+
+def test_snapshot_while_recording_is_never_torn():
+    metrics = ShardedMetricsCollector(shards=2, partitions=PartitionedStats(window=32))
+    errors = []
+    done = threading.Event()
+
+    def reader() -> None:
+        try:
+            while not done.is_set():
+                snap = metrics.snapshot()
+                assert snap["count"] <= TOTAL
+                metrics.partitions.snapshot(("summarize", "pro", "m"))
+        except BaseException as exc:
+            errors.append(exc)
+
+    t = threading.Thread(target=reader)
+    t.start()
+    try:
+        _run_threads(
+            lambda slot, i: metrics.record_event(5.0, 1, 1, None, "user", "m", 1.0, intent="summarize", tier="pro")
+        )
+    finally:
+        done.set()
+        t.join()
+    assert not errors
+    assert metrics.snapshot()["count"] == TOTAL
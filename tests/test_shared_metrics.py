@@ -0,0 +1,66 @@
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from metrics.partitioned_stats import PartitionedStats
+from metrics.shared_metrics import MetricsAggregator, SharedRing, ring_name
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def aggregator():
+    agg = MetricsAggregator(2, capacity=4096)
+    yield agg
+    agg.close()
+
+
+def test_collector_keeps_optional_consumers(aggregator):
+    partitions = PartitionedStats()
+    collector = aggregator.collector(0, partitions=partitions)
+    collector.record_event(12.0, 1, 2, None, "user", "m", 1.0, intent="chat", tier="pro")
+    assert collector.partitions is partitions
+    assert partitions.get(("chat", "pro", "m")).count == 1
+    collector.close()
+
+
+def test_threads_in_one_worker_never_lose_ring_records(aggregator):
+    collector = aggregator.collector(1)
+    per_thread = 400
+    old = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [
+            threading.Thread(
+                target=lambda: [collector.record_event(5.0, 1, 1, None, "user", "m", 1.0) for _ in range(per_thread)]
+            )
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(old)
+    assert collector.ring.write_seq == 8 * per_thread
+    assert aggregator.poll() == 8 * per_thread
+    assert aggregator.dropped == 0
+    collector.close()
+
+
+def test_unrelated_process_attaching_does_not_unlink_the_ring(aggregator):
+    name = ring_name(aggregator.prefix, 0)
+    code = (
+        "import sys; sys.path.insert(0, %r); import latch;"
+        "from metrics.shared_metrics import SharedRing;"
+        "ring = SharedRing.attach(%r); ring.append(1.0, 2.0, 0.0, 0.0, 1, 1, True, False); ring.close()"
+    ) % (str(ROOT), name)
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=30)
+    assert proc.returncode == 0, proc.stderr
+    assert "leaked" not in proc.stderr and "Traceback" not in proc.stderr
+    ring = SharedRing.attach(name)
+    assert ring.write_seq == 1
+    ring.close()
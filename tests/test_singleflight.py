@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from runtime.response_cache import SingleFlight
+
+
+def test_followers_survive_a_cancelled_leader():
+    flight = SingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(None)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        leader = asyncio.ensure_future(flight.ado("k", slow))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(flight.ado("k", slow)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    results = asyncio.run(main())
+    # One follower re-ran the call; the other two shared its result.
+    assert len(calls) == 2
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    assert {value for value, _ in results} == {2}
+    assert flight.coalesced == 2
+
+
+def test_cancelled_follower_does_not_cancel_the_leader():
+    flight = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.ado("k", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.ado("k", slow))
+        await asyncio.sleep(0.005)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        return await leader
+
+    assert asyncio.run(main()) == ("ok", False)
+
+
+def test_leader_errors_reach_followers():
+    flight = SingleFlight()
+
+    async def broken():
+        await asyncio.sleep(0.01)
+        raise ValueError("backend")
+
+    async def main():
+        tasks = [asyncio.ensure_future(flight.ado("k", broken)) for _ in range(3)]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in asyncio.run(main()))
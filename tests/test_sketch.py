@@ -0,0 +1,66 @@
+import math
+import random
+
+import pytest
+
+from metrics.sketch import QuantileSketch
+
+QS = (0.5, 0.9, 0.95, 0.99, 0.999)
+
+
+def _exact(ordered, q):
+    return ordered[int(math.floor(q * (len(ordered) - 1)))]
+
+
+@pytest.mark.parametrize("alpha", [0.01, 0.02, 0.05])
+def test_quantiles_stay_within_the_relative_error_bound(alpha):
+    rng = random.Random(1)
+    values = [rng.lognormvariate(4.0, 1.2) for _ in range(20_000)]
+    sketch = QuantileSketch(relative_accuracy=alpha)
+    for v in values:
+        sketch.add(v)
+    ordered = sorted(values)
+    for q, got in zip(QS, sketch.quantiles(QS)):
+        exact = _exact(ordered, q)
+        assert abs(got - exact) <= alpha * exact + 1e-9, (q, got, exact)
+
+
+def test_merge_equals_one_sketch_over_all_samples():
+    rng = random.Random(2)
+    parts = [[rng.expovariate(1 / 50.0) for _ in range(3000)] for _ in range(4)]
+    whole = QuantileSketch()
+    merged = QuantileSketch()
+    for part in parts:
+        shard = QuantileSketch()
+        for v in part:
+            shard.add(v)
+            whole.add(v)
+        merged.merge(shard)
+    assert merged.count == whole.count == 12_000
+    assert merged.quantiles(QS) == whole.quantiles(QS)
+
+
+def test_merge_counts_the_zero_bucket_once():
+    a, b = QuantileSketch(), QuantileSketch()
+    a.add(0.0)
+    b.add(0.0, 3)
+    b.add(10.0)
+    a.merge(b)
+    assert a.count == 5 and a.zero_count == 4
+
+
+def test_merge_rejects_a_different_accuracy():
+    with pytest.raises(ValueError):
+        QuantileSketch(relative_accuracy=0.01).merge(QuantileSketch(relative_accuracy=0.02))
+
+
+def test_subtract_undoes_a_merge():
+    base, extra = QuantileSketch(), QuantileSketch()
+    for v in range(1, 200):
+        base.add(float(v))
+        extra.add(float(v) * 10)
+    before = base.quantiles(QS)
+    base.merge(extra)
+    base.subtract(extra)
+    assert base.count == 199
+    assert base.quantiles(QS) == before
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+from runtime.streaming import AsyncTokenStream, TokenStream
+
+
+def _recorder(done: list):
+    def on_done(latency_ms, tokens_out, ttft_ms, itl_ms, error_type, truncated):
+        done.append((tokens_out, error_type, truncated))
+
+    return on_done
+
+
+def _stream(n: int, max_tokens, done: list) -> TokenStream:
+    return TokenStream(iter(range(n)), start=time.perf_counter(), max_tokens=max_tokens, on_done=_recorder(done))
+
+
+def test_source_ending_before_max_tokens_is_not_truncated():
+    done = []
+    assert list(_stream(5, 8, done)) == list(range(5))
+    assert done == [(5, None, False)]
+
+
+def test_finish_signal_at_max_tokens_is_not_truncated():
+    done = []
+    chunks = [{"text": "a"}, {"text": "b"}, {"text": "c", "finish_reason": "stop"}]
+    stream = TokenStream(iter(chunks), start=time.perf_counter(), max_tokens=3, on_done=_recorder(done))
+    assert list(stream) == chunks
+    assert done == [(3, None, False)]
+
+    done.clear()
+    chunks[-1]["finish_reason"] = "length"
+    list(TokenStream(iter(chunks), start=time.perf_counter(), max_tokens=3, on_done=_recorder(done)))
+    assert done == [(3, None, True)]
+
+
+def test_source_with_more_than_max_tokens_is_truncated():
+    done = []
+    closed = []
+    pulled = []
+
+    def source():
+        try:
+            for i in range(100):
+                pulled.append(i)
+                yield i
+        finally:
+            closed.append(True)
+
+    stream = TokenStream(source(), start=time.perf_counter(), max_tokens=8, on_done=_recorder(done))
+    assert [next(stream) for _ in range(8)] == list(range(8))
+    # Recorded and closed with the 8th chunk; chunk 9 is never pulled.
+    assert done == [(8, None, True)]
+    assert closed == [True]
+    assert pulled == list(range(8))
+    assert list(stream) == []
+
+
+def test_zero_max_tokens_pulls_nothing():
+    done = []
+    assert list(_stream(5, 0, done)) == []
+    assert done == [(0, None, True)]
+
+
+def test_async_stream_stops_at_the_cap():
+    pulled = []
+
+    async def source(n):
+        for i in range(n):
+            pulled.append(i)
+            yield i
+
+    async def drain(n):
+        done = []
+        stream = AsyncTokenStream(source(n), start=time.perf_counter(), max_tokens=4, on_done=_recorder(done))
+        chunks = [c async for c in stream]
+        return chunks, done
+
+    assert asyncio.run(drain(3)) == ([0, 1, 2], [(3, None, False)])
+    pulled.clear()
+    assert asyncio.run(drain(9)) == ([0, 1, 2, 3], [(4, None, True)])
+    assert pulled == [0, 1, 2, 3]
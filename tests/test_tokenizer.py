@@ -0,0 +1,37 @@
+import pytest
+
+from runtime.tokenizer import CachedTokenizer, CharRatioTokenizer, HeuristicTokenizer, Tokenizer
+
+TURN = "User: deploy failed, ERROR worker-7 timeout after 30000ms (retry 3/5)\nAssistant: check `QUEUE_URL`.\n"
+
+
+def test_incremental_count_matches_full_recount_on_a_growing_conversation():
+    tokenizer = CachedTokenizer(HeuristicTokenizer(), max_entries=1)
+    prefix, tokens = None, 0
+    for i in range(1, 20):
+        text = TURN * i
+        tokens = tokenizer.count_incremental(text, prefix, tokens)
+        prefix = text
+        assert tokens == HeuristicTokenizer().count(text)
+
+
+def test_cache_hits_and_bounds():
+    tokenizer = CachedTokenizer(CharRatioTokenizer(), max_entries=2)
+    for text in ("aaaa", "bbbbbbbb", "aaaa", "cccccccccccc"):
+        tokenizer.count(text)
+    assert (tokenizer.hits, tokenizer.misses, len(tokenizer)) == (1, 3, 2)
+
+
+def test_heuristic_handles_non_ascii_and_empty_text():
+    heuristic = HeuristicTokenizer()
+    assert heuristic.count("") == 0
+    assert heuristic.count("日本語") == 3
+    assert heuristic.count("naïve café") >= 2
+
+
+def test_tokenizer_without_count_fails_at_construction():
+    class Incomplete(Tokenizer):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,44 @@
+import pytest
+
+from demo import trace_replay
+
+
+@pytest.fixture
+def trace(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    trace_replay.write_synthetic_trace(path, 200)
+    return path
+
+
+@pytest.mark.parametrize("target", ["agent", "sdk"])
+def test_threaded_replay_counts_every_record(trace, target):
+    summary = trace_replay.replay(trace, target=target, speed=0, concurrency=4)
+    assert summary.requests == 200
+    assert summary.errors == 0
+    # "exfiltrate" is a blocked intent in the default config: denied, not shed.
+    assert 0 < summary.denied < 200
+    assert summary.shed == 0
+    assert summary.latency.count == 200 - summary.denied
+
+
+def test_target_exceptions_are_counted_not_dropped(trace, monkeypatch):
+    def flaky(concurrency=1):
+        def handle(record):
+            if record.trace_id.endswith("7"):
+                raise RuntimeError("backend down")
+            return 10.0, trace_replay.SERVED, 0.0
+
+        return handle
+
+    monkeypatch.setitem(trace_replay._TARGETS, "flaky", flaky)
+    summary = trace_replay.replay(trace, target="flaky", speed=0, concurrency=4)
+    assert summary.requests == 200
+    assert summary.errors == 20
+    assert summary.error_types == {"RuntimeError": 20}
+
+
+def test_sdk_latency_comes_from_the_simulated_backend(trace):
+    summary = trace_replay.replay(trace, target="sdk", speed=0)
+    # The simulator's batch overhead alone is 5 ms; wrapper time is microseconds.
+    assert summary.latency.quantile(0.5) > 5.0
+    assert summary.cost > 0.0